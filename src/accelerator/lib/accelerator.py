@@ -1,4 +1,5 @@
 import os
+import functools
 #from exsi import *
 from dtaf_core.lib.tklib.basic.log import logger
 from dtaf_core.lib.tklib.basic.testcase import Case
@@ -131,6 +132,119 @@ ESXI_VM_TOOL_PATH_V = sut_tool('ESXI_VM_TOOL_PATH_V')
 
 
 
+def invalidates_device_inventory(func):
+    """
+    Decorator for Accelerator methods which bind/unbind devices, install drivers or reboot the SUT:
+    the cached device inventory is dropped when the method returns or raises.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.invalidate_device_inventory()
+    return wrapper
+
+
+class AcceleratorDevice:
+    """
+    One accelerator PCI function (PF or VF) captured by the accelerator sysfs walk.
+    """
+
+    def __init__(self, bdf, kind, device_id, is_vf, driver, iommu_group, physfn, numa_node, work_queues):
+        self.bdf = bdf                      # '0000:6b:00.1'
+        self.kind = kind                    # 'qat', 'dlb', 'dsa' or 'iax'
+        self.device_id = device_id          # '4941'
+        self.is_vf = is_vf
+        self.driver = driver                # '' if no driver is bound
+        self.iommu_group = iommu_group      # '' if IOMMU is off
+        self.physfn = physfn                # PF bdf of a VF, '' for a PF
+        self.numa_node = numa_node
+        self.work_queues = work_queues      # {'wq0.0': 'enabled'} for DSA/IAX devices
+
+    @property
+    def bus(self):
+        return self.bdf.split(':')[1]
+
+    @property
+    def function(self):
+        return self.bdf.split('.')[-1]
+
+    def __repr__(self):
+        return f'AcceleratorDevice({self.kind} {self.bdf} {self.device_id} driver={self.driver or None})'
+
+
+class AcceleratorInventory:
+    """
+    Accelerator PFs/VFs of the SUT with their drivers, IOMMU groups and work queues, read with one command.
+
+    Usage:
+        inventory = AcceleratorInventory.from_sysfs_walk(out, {'4940': ('qat', False), '4941': ('qat', True)})
+        inventory.pfs('qat') --> [AcceleratorDevice(qat 0000:6b:00.0 4940 driver=4xxx), ...]
+    """
+    RECORD_PREFIX = 'ACCE|'
+    # one line per accelerator function: ACCE|bdf|device id|driver|iommu group|physfn|numa node|wq=state,...
+    SYSFS_WALK_CMD = (
+        'for d in /sys/bus/pci/devices/*; do '
+        '[ "$(cat $d/vendor)" = "0x8086" ] || continue; '
+        'id=$(cat $d/device); id=${{id#0x}}; '
+        'case " {device_ids} " in *" $id "*) ;; *) continue ;; esac; '
+        'drv=$([ -e $d/driver ] && basename $(readlink $d/driver)); '
+        'grp=$([ -e $d/iommu_group ] && basename $(readlink $d/iommu_group)); '
+        'pf=$([ -e $d/physfn ] && basename $(readlink $d/physfn)); '
+        'wqs=$(for w in $d/*/wq*; do [ -e $w/state ] && echo -n "$(basename $w)=$(cat $w/state),"; done); '
+        'echo "ACCE|$(basename $d)|$id|$drv|$grp|$pf|$(cat $d/numa_node)|$wqs"; '
+        'done')
+
+    def __init__(self, devices):
+        self.devices = sorted(devices, key=lambda device: device.bdf)
+
+    @classmethod
+    def get_sysfs_walk_cmd(cls, device_ids):
+        """
+              Purpose: Get the command listing all accelerator functions
+              Args:
+                  device_ids: PCI device IDs to capture, eg: ['4940', '4941']
+              Returns:
+                  Yes: shell command
+        """
+        return cls.SYSFS_WALK_CMD.format(device_ids=' '.join(device_ids))
+
+    @classmethod
+    def from_sysfs_walk(cls, out, device_kinds):
+        """
+              Purpose: Parse the sysfs walk output
+              Args:
+                  out: output of the get_sysfs_walk_cmd command
+                  device_kinds: {device id: (kind, is_vf)}, eg: {'4941': ('qat', True)}
+              Returns:
+                  Yes: AcceleratorInventory
+        """
+        devices = []
+        for line in out.strip().split('\n'):
+            if not line.startswith(cls.RECORD_PREFIX):
+                continue
+            _, bdf, device_id, driver, iommu_group, physfn, numa_node, wqs = line.strip().split('|', 7)
+            kind, is_vf = device_kinds[device_id]
+            work_queues = dict(wq.split('=', 1) for wq in wqs.split(',') if '=' in wq)
+            devices.append(AcceleratorDevice(bdf, kind, device_id, is_vf, driver, iommu_group, physfn,
+                                             numa_node, work_queues))
+        return cls(devices)
+
+    def get(self, bdf):
+        for device in self.devices:
+            if device.bdf == bdf:
+                return device
+        return None
+
+    def pfs(self, kind):
+        return [device for device in self.devices if device.kind == kind and not device.is_vf]
+
+    def vfs(self, kind, pf_bdf=None):
+        return [device for device in self.devices
+                if device.kind == kind and device.is_vf and (pf_bdf is None or device.physfn == pf_bdf)]
+
+
 class Accelerator:
     BKC_FILES_DIRECTORY = r'C:\Users\Administrator\Desktop\Accelerator\BKC_files\\'
     QAT_DEVICE_NUM = 4
@@ -188,6 +302,36 @@ class Accelerator:
         self.dlb_device_num = Accelerator.DLB_DEVICE_NUM
         self.dsa_device_num = Accelerator.DSA_DEVICE_NUM
         self.iax_device_num = Accelerator.IAX_DEVICE_NUM
+        self._device_inventory = None
+        self._cpu_num = None
+
+    def get_device_inventory(self, refresh=False):
+        """
+              Purpose: Get all accelerator PFs/VFs with drivers, IOMMU groups and work queues, the sysfs walk
+                       runs once and is cached until a bind/unbind, driver install or reboot invalidates it
+              Args:
+                  refresh: True to walk sysfs again
+              Returns:
+                  Yes: AcceleratorInventory
+              Example:
+                  Simplest usage: get the QAT PFs
+                        get_device_inventory().pfs('qat')
+        """
+        if self._device_inventory is None or refresh:
+            device_kinds = {self.qat_id: ('qat', False), self.qat_vf_id: ('qat', True),
+                            self.dlb_id: ('dlb', False), self.dlb_vf_id: ('dlb', True),
+                            self.dsa_id: ('dsa', False), self.iax_id: ('iax', False)}
+            _, out, err = self.sut.execute_shell_cmd(AcceleratorInventory.get_sysfs_walk_cmd(device_kinds),
+                                                     timeout=60)
+            self._device_inventory = AcceleratorInventory.from_sysfs_walk(out, device_kinds)
+            logger.info(f'accelerator inventory: {len(self._device_inventory.devices)} devices')
+        return self._device_inventory
+
+    def invalidate_device_inventory(self):
+        """
+              Purpose: Drop the cached accelerator inventory after the devices or their drivers changed
+        """
+        self._device_inventory = None
 
     # CentOS-APIs
 ###########################################################################################################
@@ -246,6 +390,7 @@ class Accelerator:
             else:
                 self.__check_random_device_wq(out, device_num, acce_ip)
 
+    @invalidates_device_inventory
     def accel_config_install(self):
         """
               Purpose: Install DSA SIOV accel_config
@@ -388,6 +533,7 @@ class Accelerator:
                 kvm.attached_device_list[vm_name] += [xml_path]
 
 
+    @invalidates_device_inventory
     def change_xmlcli_file(self):
         """
                 Purpose: To install DSA driver
@@ -426,46 +572,12 @@ class Accelerator:
                   Simplest usage: Check all QAT device
                         check_acce_device_status('qat')
         """
-        out = ''
         cpu_num = self.get_cpu_num()
-        if acce_ip == 'qat':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci |grep {self.qat_id}', timeout=60)
-            line_list = out.strip().split('\n')
-            device_num = 0
-            for line in line_list:
-                if f'{self.qat_id}' in line:
-                    device_num += 1
-            if device_num != cpu_num * self.qat_device_num:
-                logger.error('Not detect all device')
-                raise Exception('Not detect all device')
-        elif acce_ip == 'dlb':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci |grep {self.dlb_id}', timeout=60)
-            line_list = out.strip().split('\n')
-            device_num = 0
-            for line in line_list:
-                if f'{self.dlb_id}' in line:
-                    device_num += 1
-            if device_num != cpu_num * self.dlb_device_num:
-                logger.error('Not detect all device')
-                raise Exception('Not detect all device')
-        elif acce_ip == 'dsa':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci |grep {self.dsa_id}', timeout=60)
-            line_list = out.strip().split('\n')
-            device_num = 0
-            for line in line_list:
-                if f'{self.dsa_id}' in line:
-                    device_num += 1
-            if device_num != cpu_num * self.dsa_device_num:
-                logger.error('Not detect all device')
-                raise Exception('Not detect all device')
-        elif acce_ip == 'iax':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci |grep {self.iax_id }', timeout=60)
-            line_list = out.strip().split('\n')
-            device_num = 0
-            for line in line_list:
-                if f'{self.iax_id }' in line:
-                    device_num += 1
-            if device_num != cpu_num * self.iax_device_num:
+        device_num_per_cpu = {'qat': self.qat_device_num, 'dlb': self.dlb_device_num,
+                              'dsa': self.dsa_device_num, 'iax': self.iax_device_num}
+        if acce_ip in device_num_per_cpu:
+            device_num = len(self.get_device_inventory().pfs(acce_ip))
+            if device_num != cpu_num * device_num_per_cpu[acce_ip]:
                 logger.error('Not detect all device')
                 raise Exception('Not detect all device')
 
@@ -831,6 +943,7 @@ class Accelerator:
             logger.error('Not all dsa device are disabled')
             raise Exception('Not all dsa device are disabled')
 
+    @invalidates_device_inventory
     def dlb_install(self, ch_makefile):
         """
               Purpose: To install DLB driver
@@ -880,6 +993,7 @@ class Accelerator:
         self.sut.download_to_local(remotepath='/root/dlb.log', localpath=os.path.join(LOG_PATH, 'Logs'))
         self.delete_environment('end')
 
+    @invalidates_device_inventory
     def dlb_uninstall(self):
         """
              Purpose: to uninstall dlb driver
@@ -1076,13 +1190,15 @@ class Accelerator:
                   Simplest usage: Get current SUT CPU numbers
                         get_cpu_num()
         """
+        if self._cpu_num is not None:
+            return self._cpu_num
         _, out, err = self.sut.execute_shell_cmd('lscpu', timeout=60)
         line_list = out.strip().split('\n')
         for line in line_list:
             word_list = line.split()
             if word_list[0] == 'Socket(s):':
-                cpu_num = int(word_list[1])
-                return cpu_num
+                self._cpu_num = int(word_list[1])
+                return self._cpu_num
 
     def get_dev_id(self, ip, pf, vf):
         """
@@ -1102,16 +1218,8 @@ class Accelerator:
                         get_qat_dev_id('qat', 0, 0)
                         return --> '0000:6d:00.0'
         """
-        cpu_num = self.get_cpu_num()
-        out = ''
         if ip == 'qat':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci | grep {self.qat_id}', timeout=60)
-            line_list = out.strip().split('\n')
-            qat_device_list = []
-            for line in line_list:
-                str_list = line.split(' ')
-                word_list = str_list[0].split(':')  # ['6b','00.0']
-                qat_device_list.append(word_list[0])
+            qat_device_list = [device.bus for device in self.get_device_inventory().pfs('qat')]  # ['6b', ...]
             if pf > len(qat_device_list) or vf > 16:
                 logger.error('the number of given PF exceeds the maximum PF get number')
                 raise Exception('the number of given PF exceeds the maximum PF get number')
@@ -1120,16 +1228,7 @@ class Accelerator:
                 dev_id = f'0000:{qat_device_list[pf]}:0{quotient}.{remainder}'  # [' 0000:6b:00.0'] or  [' 0000:6b:00.03']
                 return dev_id
         elif ip == 'dsa':
-            _, out, err = self.sut.execute_shell_cmd(f'lspci | grep {self.dsa_id}', timeout=60)
-            line_list = out.strip().split('\n')
-            device_list = []
-            i = 0
-            if i < cpu_num * self.dsa_device_num:
-                for line in line_list:
-                    str_list = line.split()  # ['6a:01.0', 'System'... ]
-                    dev_id = '0000:' + str_list[i]   # '0000:6a:01.0'
-                    device_list.append(dev_id)   # ['0000:6a:01.0','0000:6f:01.0']
-                i += 1
+            device_list = [device.bdf for device in self.get_device_inventory().pfs('dsa')]  # ['0000:6a:01.0', ...]
             return device_list[pf]   # '0000:6a:01.0'
 
     def get_dlb_dev_id_list(self, pf, vf_num):
@@ -1147,17 +1246,9 @@ class Accelerator:
                         get_dlb_dev_id_list(0, 2)
                         return ['0000:6d:00.1','0000:6d:00.2']
         """
-        _, out, err = self.sut.execute_shell_cmd(f'lspci | grep {self.dlb_id}', timeout=60)
-        line_list = out.strip().split('\n')
-        dlb_list = []
+        dlb_list = [device.bus for device in self.get_device_inventory().pfs('dlb')
+                    if device.function == '0']  # ['6d', '72']
         dev_id_list = []
-        for line in line_list:
-            str_list = line.split()  # ['6d:00.0', 'Co-processor:'...]
-            words_list = str_list[0].split('.')  # ['6d:00', '0' , ....]
-            if words_list[1] == '0':
-                dlb_deviceid = '0000:' + str_list[0]  # '0000:6d:00.0''0000:72:00.0'
-                dlb_deviceid = dlb_deviceid.split(':')
-                dlb_list.append(dlb_deviceid[1])  # ['0000:6d:00.0','0000:72:00.0']
         quotient, remainder = divmod(vf_num, 8)
         if vf_num == 0:
             dev_id_list.append(f'0000:{dlb_list[pf]}:0{quotient}.{remainder}')   # ['0000:6d:00.0','0000:72:00.0']
@@ -1377,6 +1468,7 @@ class Accelerator:
             logger.error('Input correct config keyword')
             raise Exception('Input correct config keyword')
 
+    @invalidates_device_inventory
     def modify_kernel_grub(self, vm_function, add_or_remove=True):
         """
               Purpose: Modify kernel grub file
@@ -1641,6 +1733,7 @@ class Accelerator:
         _, out, err = self.sut.execute_shell_cmd('make distclean', timeout=60, cwd=f'{QAT_ENGINE_PATH_L}QAT_Engine-master/')
         self.__check_error(err)
 
+    @invalidates_device_inventory
     def qat_install(self, is_siov=False):
         """
               Purpose: To install QAT driver
@@ -1843,6 +1936,7 @@ class Accelerator:
         vm_file_dir = f'{MEGA_SCRIPT_PATH_L}{MEGA_SCRIPT_NAME}'
         qemu.upload_to_vm(vm_name, sut_file_dir, vm_file_dir)
 
+    @invalidates_device_inventory
     def qat_uninstall(self):
         """
               Purpose: To uninstall QAT driver
@@ -2632,6 +2726,7 @@ class Accelerator:
         else:
             return fio_list[0]
 
+    @invalidates_device_inventory
     def unbind_device(self, ip_pf_vf):   #begain is qat_0_1  dlb_0_0
         """
               Purpose: Unbind 'QAT', 'DLB', 'DSA' device
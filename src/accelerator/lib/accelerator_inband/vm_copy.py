@@ -5,7 +5,8 @@ from lnx_exec_with_check import lnx_exec_command
 import paramiko
 from scp import SCPClient
 from resource_config_login import port_gen
-import threading
+from vm_execute import get_ssh_session, get_port_list, MAX_PARALLEL_VMS
+from concurrent.futures import ThreadPoolExecutor
 
 def setup_argparse():
     args = sys.argv[1:]
@@ -52,31 +53,20 @@ def scp_local_to_remote(ssh_instance, src_path, dst_path):
 
 
 def vm_copy(src_path, des_path, hostport, username='root', password='password',ip='localhost'):
-    ssh_instance = paramiko.SSHClient()
-    ssh_instance.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh_instance.connect(ip, hostport, username, password)
+    ssh_instance = get_ssh_session(ip, hostport, username, password)
     scp_local_to_remote(ssh_instance, src_path, des_path)
 
 def vm_copy_parallel(src_path, des_path, portlist_str, portnum, user, password,ip='localhost'):
-    if portlist_str != '':
-        portlist = portlist_str.strip().split(',')
-    else:
-        if portnum!= '':
-            port_gen(int(portnum),False)
-        return_code, out, err = lnx_exec_command('cat /home/logs/port.log', timeout=60)
-        if return_code:
-            raise Exception('no port specify')
-        portlist = out.strip().split('\n')
-    ts = []
-    for port in portlist:
-        try:
-            t = threading.Thread(target=vm_copy, args=(src_path, des_path, port, user, password,))
-            t.start()
-            ts.append(t)
-        except:
-            print("Error: unable to start thread")
-    for t in ts:
-        t.join()
+    portlist = get_port_list(portlist_str, portnum)
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_VMS, len(portlist))) as executor:
+        futures = {port: executor.submit(vm_copy, src_path, des_path, port, user, password, ip) for port in portlist}
+    failed_ports = []
+    for port, future in futures.items():
+        if future.exception() is not None:
+            print('Copy {} to the machine {} failed: {}'.format(src_path, port, future.exception()))
+            failed_ports.append(port)
+    if failed_ports:
+        raise Exception(f'Copy of "{src_path}" to VM(s) {failed_ports} failed')
     return
 
 if __name__ == '__main__':
@@ -6,8 +6,9 @@ import time
 import paramiko
 from resource_config_login import port_gen
 import re
-import _thread
+import atexit
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 def setup_argparse():
     args = sys.argv[1:]
@@ -27,6 +28,111 @@ def setup_argparse():
     ret = parser.parse_args(args)
     return ret
 	
+# one ssh session per guest, reused by every command of this invocation
+SSH_SESSIONS = {}
+SSH_SESSIONS_LOCK = threading.Lock()
+# one lock per guest, so the guests connect in parallel and a guest connects only once
+SSH_SESSION_KEY_LOCKS = {}
+POWER_CMDS = ('reboot', 'shutdown now')
+CONNECTION_DROP_TIMEOUT = 120
+REBOOT_TIMEOUT = 600
+POLL_INTERVAL = 2
+MAX_PARALLEL_VMS = 32
+
+
+def get_ssh_session(remote_ip, remote_port, remote_un, remote_pwd):
+    """
+    Function to get the ssh session of a guest, connecting only if there is no active one
+    :return: connected paramiko.SSHClient
+    """
+    key = (remote_ip, str(remote_port), remote_un)
+    with SSH_SESSIONS_LOCK:
+        key_lock = SSH_SESSION_KEY_LOCKS.setdefault(key, threading.Lock())
+    with key_lock:
+        with SSH_SESSIONS_LOCK:
+            session = SSH_SESSIONS.get(key)
+        if session is not None and session.get_transport() is not None and session.get_transport().is_active():
+            return session
+        if session is not None:
+            session.close()
+        session = paramiko.SSHClient()
+        session.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        session.connect(remote_ip, int(remote_port), username=remote_un, password=remote_pwd)
+        with SSH_SESSIONS_LOCK:
+            SSH_SESSIONS[key] = session
+        return session
+
+
+def close_ssh_sessions():
+    with SSH_SESSIONS_LOCK:
+        for session in SSH_SESSIONS.values():
+            session.close()
+        SSH_SESSIONS.clear()
+
+
+atexit.register(close_ssh_sessions)
+
+
+def drop_ssh_session(remote_ip, remote_port, remote_un):
+    with SSH_SESSIONS_LOCK:
+        session = SSH_SESSIONS.pop((remote_ip, str(remote_port), remote_un), None)
+    if session is not None:
+        session.close()
+
+
+def wait_for_connection_drop(session, timeout=CONNECTION_DROP_TIMEOUT):
+    """
+    Function to wait until the guest closes the ssh connection, e.g. after reboot or shutdown
+    :return: True if the connection dropped within timeout
+    """
+    transport = session.get_transport()
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if transport is None or not transport.is_active():
+            return True
+        try:
+            transport.send_ignore()
+        except Exception:
+            return True
+        time.sleep(POLL_INTERVAL)
+    return False
+
+
+def wait_for_reconnect(remote_ip, remote_port, remote_un, remote_pwd, timeout=REBOOT_TIMEOUT):
+    """
+    Function to wait until the guest accepts ssh connections again
+    :return: True if connected within timeout
+    """
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        try:
+            get_ssh_session(remote_ip, remote_port, remote_un, remote_pwd)
+            return True
+        except Exception:
+            time.sleep(POLL_INTERVAL)
+    return False
+
+
+def remote_power_cmd(remote_port, remote_un, remote_pwd, cmd, remote_ip):
+    """
+    Function to reboot or shut down the guest, returns when the connection dropped and, for reboot,
+    when the guest accepts ssh connections again
+    :return: 0 on success, -1 otherwise
+    """
+    session = get_ssh_session(remote_ip, remote_port, remote_un, remote_pwd)
+    session.exec_command(cmd)
+    dropped = wait_for_connection_drop(session)
+    drop_ssh_session(remote_ip, remote_port, remote_un)
+    if not dropped:
+        print('The machine {} did not close the connection after {}'.format(remote_port, cmd))
+        return -1
+    if cmd == 'reboot' and not wait_for_reconnect(remote_ip, remote_port, remote_un, remote_pwd):
+        print('The machine {} did not come back after reboot'.format(remote_port))
+        return -1
+    print('{} of the machine {} completed'.format(cmd, remote_port))
+    return 0
+
+
 def remote_exec_cmd(remote_port, remote_un, remote_pwd, cmd, remote_ip, ignore_err='False'):
     """
     Function to execute the cmd in remote machine and returns the output
@@ -42,57 +148,40 @@ def remote_exec_cmd(remote_port, remote_un, remote_pwd, cmd, remote_ip, ignore_e
     :rtype:str if the cmd prints the output, else returns -1
     """
     try:
-        remote_obj = paramiko.SSHClient()
-        remote_obj.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        remote_obj.connect(remote_ip, remote_port,username=remote_un, password=remote_pwd)
+        if cmd in POWER_CMDS:
+            return remote_power_cmd(remote_port, remote_un, remote_pwd, cmd, remote_ip)
+        remote_obj = get_ssh_session(remote_ip, remote_port, remote_un, remote_pwd)
         stdin, stdout, stderr = remote_obj.exec_command(cmd)
-        if cmd == 'reboot' or cmd == 'shutdown now' or ignore_err != 'False':
-            time.sleep(20)
-            return 0
         out = stdout.read().decode('UTF-8')
+        exit_status = stdout.channel.recv_exit_status()
+        if ignore_err != 'False':
+            return 0
         print('execute in '+ str(remote_port), out)
-        if stdout.channel.recv_exit_status() !=0:
+        if exit_status != 0:
             print('Could not connect with the remote machine {} or could not execute the cmd {}'.format(remote_port, cmd))
             return -1
-    except:
+    except Exception:
+        if ignore_err != 'False':
+            return 0
         print('Could not connect with the remote machine {} or could not execute the cmd {}'.format(remote_port, cmd))
         return -1
 
     if out != '':
         print('Returning the output, after executing the cmd {}'.format(cmd))
         return out
+    print('The cmd {} executed successfully in the machine {}'.format(cmd, remote_port))
+    return 0
 
-    elif out == '':
-        print('Command execution returned nothing.. Checking for status of cmd execution..')
-        stdin, stdout, stderr = remote_obj.exec_command('echo $?')
-        null_out = int(stdout.read().decode('UTF-8'))
-
-        if null_out == 0:
-            print('The cmd {} executed successfully in the machine {}'.format(cmd, remote_ip))
-            return 0
-        else:
-            print('Could not execute the command {} in {}'.format(cmd, remote_ip))
-            return -1
-    return out
-
-
-class TaskThread(threading.Thread):
 
-    def __init__(self, func, args=()):
-        super(TaskThread, self).__init__()
-        self.func = func
-        self.args = args
-
-    def run(self):
-        print("start func {}".format(self.func.__name__))
-        self.result = self.func(*self.args)
-
-    def get_result(self):
-        try:
-            return self.result
-        except Exception as ex:
-            print(ex)
-            return "ERROR"
+def get_port_list(remote_portlist_str, remote_portnum):
+    if remote_portlist_str != '':
+        return remote_portlist_str.strip().split(',')
+    if remote_portnum != '':
+        port_gen(int(remote_portnum), False)
+    return_code, out, err = lnx_exec_command('cat /home/logs/port.log', timeout=60)
+    if return_code:
+        raise Exception('no port specify')
+    return out.strip().split('\n')
 
 
 def vm_exec_cmd_parallel(remote_portlist_str, remote_portnum, remote_un, remote_pwd, cmd, ignore_err='False', remote_ip='localhost'):
@@ -107,31 +196,14 @@ def vm_exec_cmd_parallel(remote_portlist_str, remote_portnum, remote_un, remote_
     :return: Output of the executed string
     :rtype:str if the cmd prints the output, else returns -1
     """
-    if remote_portlist_str != '':
-        remote_portlist = remote_portlist_str.strip().split(',')
-    else:
-        if remote_portnum!= '':
-            port_gen(int(remote_portnum),False)
-        _, out, err = lnx_exec_command('cat /home/logs/port.log', timeout=60)
-        return_code, out, err = lnx_exec_command('cat /home/logs/port.log', timeout=60)
-        if return_code:
-            raise Exception('no port specify')
-        remote_portlist = out.strip().split('\n')
-    ts = []
-    for remote_port in remote_portlist:
-        try:
-            t = TaskThread(remote_exec_cmd, args=(remote_port, remote_un, remote_pwd, cmd, remote_ip, ignore_err))
-            #t = threading.Thread(target=remote_exec_cmd, args=(remote_port, remote_un, remote_pwd, cmd, remote_ip, ignore_err,))
-            t.start()
-            ts.append(t)
-        except:
-            print("Error: unable to start thread")
-    for t in ts:
-        t.join()
-        if t.get_result() == -1:
-            raise Exception(f'Execution of "{cmd}" in VM(s) failed')
+    remote_portlist = get_port_list(remote_portlist_str, remote_portnum)
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_VMS, len(remote_portlist))) as executor:
+        results = list(executor.map(lambda remote_port: remote_exec_cmd(remote_port, remote_un, remote_pwd, cmd,
+                                                                         remote_ip, ignore_err), remote_portlist))
+    if -1 in results:
+        raise Exception(f'Execution of "{cmd}" in VM(s) failed')
     return
-	
+
 if __name__ == '__main__':
     args_parse = setup_argparse()
     vm_exec_cmd_parallel(args_parse.port, args_parse.num, args_parse.user, args_parse.password, args_parse.cmd,args_parse.ignore_err)
\ No newline at end of file
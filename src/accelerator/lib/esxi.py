@@ -1,6 +1,8 @@
 import os.path
 import re
 import time
+import functools
+import http.client
 import requests
 import atexit
 from pyVmomi import vim
@@ -10,6 +12,7 @@ from src.lib.toolkit.basic.config import os_web_port
 from src.lib.toolkit.basic.const import CMD_EXEC_WEIGHT
 from src.lib.toolkit.auto_api import *
 from src.accelerator.lib.accelerator import *
+from src.lib.vsphere_vm_cache import VsphereVmCache
 
 
 class VIRTUAL_MACHINE_OS:
@@ -896,14 +899,20 @@ def get_vm_credit(vm_os_type):
     return vim.vm.guest.NamePasswordAuthentication(username=user, password=pwd)
 
 
-def get_vm_obj(vm_name, service_instance):
-    esxi_content = service_instance.RetrieveContent()
+# errors of a dropped ESXi session, the operation is retried once on a new connection
+ESXI_RECONNECT_ERRORS = (vim.fault.NotAuthenticated, ConnectionError, http.client.HTTPException)
 
-    vm = get_obj(esxi_content, [vim.VirtualMachine], vm_name)
+
+def get_vm_obj(vm_name, service_instance, vm_cache=None):
+    if vm_cache is not None:
+        vm = vm_cache.get_vm(vm_name)
+        tools_status = vm_cache.get_property(vm_name, "guest.toolsStatus") if vm else None
+    else:
+        vm = get_obj(service_instance.RetrieveContent(), [vim.VirtualMachine], vm_name)
+        tools_status = vm.guest.toolsStatus
     if not vm:
         raise Exception(f"error: cannot locate the virtual machine {vm_name}")
 
-    tools_status = vm.guest.toolsStatus
     print(tools_status)
     if tools_status in ('toolsNotInstalled', 'toolsNotRunning'):
         raise Exception(f"error: VMwareTools is needed for execute command in virtual machine")
@@ -937,6 +946,9 @@ class ESXi(Hypervisor):
     def __init__(self, sut) -> None:
         super().__init__(sut)
         self.vm_list = []
+        self._service_instance = None
+        self._disconnect_at_exit = None
+        self._vm_cache = None
         self.CMD_CONNECT_TO_ESXI = f'Connect-VIServer -Server {self.sut.ssh_sutos._ip} ' + \
                                    f'-Protocol https -User {self.sut.ssh_sutos._user} ' + \
                                    f'-Password {self.sut.ssh_sutos._password} ' + \
@@ -1083,12 +1095,13 @@ class ESXi(Hypervisor):
     def download_from_vm(self, vm_name, host_path, vm_path):
         logger.info(f'download file from <{vm_name}>:{vm_path} to <{self.sut.cfg["defaults"]["name"]}>:{host_path}')
 
-        service_instance = self.get_esxi_connection()
-        vm = get_vm_obj(vm_name, service_instance)
-        creds = get_vm_credit(self.get_vm_os_type(vm_name))
-        fti = service_instance.RetrieveContent().guestOperationsManager.fileManager.InitiateFileTransferFromGuest(vm,
-                                                                                                                  creds,
-                                                                                                                  vm_path)
+        def initiate_transfer(service_instance):
+            vm = self.__get_vm_obj(vm_name, service_instance)
+            creds = get_vm_credit(self.get_vm_os_type(vm_name))
+            return service_instance.RetrieveContent().guestOperationsManager.fileManager.\
+                InitiateFileTransferFromGuest(vm, creds, vm_path)
+
+        fti = self.__with_esxi_connection(initiate_transfer)
         fti.url = fti.url.replace("*", self.sut.ssh_sutos._ip)
         fti.url = fti.url.replace(":443", f":{os_web_port}")
         requests.packages.urllib3.disable_warnings()
@@ -1124,19 +1137,21 @@ class ESXi(Hypervisor):
         return self.__execute_vm_cmd(vm_name, vm_cmd, cwd, timeout, powershell, True)
 
     def __execute_vm_cmd(self, vm_name, vm_cmd, cwd=".", timeout=30, powershell=False, is_async=False):
-        service_instance = self.get_esxi_connection()
-        vm = get_vm_obj(vm_name, service_instance)
-        creds = get_vm_credit(self.get_vm_os_type(vm_name))
-
-        profile_manager = service_instance.RetrieveContent().guestOperationsManager.processManager
-
         cmd, param = self.__get_program_and_param(vm_name, vm_cmd, cwd, is_async)
         program_spec = vim.vm.guest.ProcessManager.ProgramSpec(programPath=cmd, arguments=param)
 
-        res = profile_manager.StartProgramInGuest(vm, creds, program_spec)
+        def run_program(service_instance):
+            vm = self.__get_vm_obj(vm_name, service_instance)
+            creds = get_vm_credit(self.get_vm_os_type(vm_name))
+            profile_manager = service_instance.RetrieveContent().guestOperationsManager.processManager
+            res = profile_manager.StartProgramInGuest(vm, creds, program_spec)
+            if is_async:
+                return None
+            return wait_for_execute_vm_finish(vm, creds, res, profile_manager, timeout)
+
+        rcode = self.__with_esxi_connection(run_program)
         if is_async:
             return None, None, None
-        rcode = wait_for_execute_vm_finish(vm, creds, res, profile_manager, timeout)
         if vm_name == "Vsphere":
             return rcode, None, None
 
@@ -1166,6 +1181,9 @@ class ESXi(Hypervisor):
         return cmd, param
 
     def get_esxi_connection(self):
+        if self._service_instance is not None:
+            return self._service_instance
+
         os_cfg = self.sut.ssh_sutos
         try:
             service_instance = SmartConnectNoSSL(host=os_cfg._ip, user=os_cfg._user, pwd=os_cfg._password)
@@ -1174,8 +1192,61 @@ class ESXi(Hypervisor):
 
         if not service_instance:
             raise Exception("error: cannot connect to ESXi with supplied credentials, check sut.ini please")
+        self._disconnect_at_exit = functools.partial(Disconnect, service_instance)
+        atexit.register(self._disconnect_at_exit)
+        self._service_instance = service_instance
         return service_instance
 
+    def reset_esxi_connection(self):
+        """
+        Purpose: disconnect and drop the cached ESXi connection and VM cache, the next call connects again.
+                 Call it after the host was reset.
+        """
+        if self._vm_cache is not None:
+            try:
+                self._vm_cache.close()
+            except Exception as ex:
+                logger.debug(f'close the ESXi VM cache failed: {ex}')
+            self._vm_cache = None
+        if self._disconnect_at_exit is not None:
+            atexit.unregister(self._disconnect_at_exit)
+            try:
+                self._disconnect_at_exit()
+            except Exception as ex:
+                logger.debug(f'disconnect the ESXi session failed: {ex}')
+            self._disconnect_at_exit = None
+        self._service_instance = None
+
+    def __with_esxi_connection(self, operation):
+        """
+        Purpose: run operation(service_instance), once more on a new connection if the ESXi session was dropped
+        """
+        try:
+            return operation(self.get_esxi_connection())
+        except ESXI_RECONNECT_ERRORS as ex:
+            logger.info(f'ESXi session lost ({type(ex).__name__}), connect again')
+            self.reset_esxi_connection()
+            return operation(self.get_esxi_connection())
+
+    @property
+    def vm_cache(self):
+        """
+        VsphereVmCache of the ESXi connection, updated incrementally by every query
+        """
+        if self._vm_cache is None:
+            self._vm_cache = VsphereVmCache(self.get_esxi_connection(), log=logger)
+        return self._vm_cache
+
+    def __query_vm_cache(self, query, *args):
+        return self.__with_esxi_connection(lambda service_instance: query(self.vm_cache, *args))
+
+    def __get_vm_property(self, vm_name, path, default=None):
+        return self.__query_vm_cache(VsphereVmCache.get_property, vm_name, path, default)
+
+    def __get_vm_obj(self, vm_name, service_instance):
+        # only called inside __with_esxi_connection, which handles the reconnect
+        return get_vm_obj(vm_name, service_instance, self.vm_cache)
+
     def __get_vm_cmd_log(self, vm_name):
         log_path = "/root/" if "lin" in self.get_vm_os_type(vm_name) else "C:\\"
         self.download_from_vm(vm_name, host_path="C:\\BKCPkg\\stdout.log", vm_path=f"{log_path}stdout.log")
@@ -1198,24 +1269,19 @@ class ESXi(Hypervisor):
 
     def get_vm_list(self):
         logger.info(f'get the virtual machine list')
-
-        cmd = 'vim-cmd vmsvc/getallvms | awk \'' + '{' + 'print $2}\''
-        rcode, std_out, std_err = self.sut.execute_shell_cmd(cmd)
-        if rcode != 0:
-            raise Exception(std_err)
-
-        return std_out.strip().splitlines()[1:]
+        return self.__query_vm_cache(VsphereVmCache.get_vm_names)
 
     def get_vm_ip(self, vm_name):
-        vm_id = self.get_vm_id(vm_name)
-        cmd = f"vim-cmd vmsvc/get.summary {vm_id} | grep ipAddress | awk -F '[\\t\",]' '" + "{" + "print $2}'"
         for i in range(3):
-            _, std_out, _ = self.sut.execute_shell_cmd(cmd)
-            if std_out.strip() != "":
-                break
+            ip = self.__get_vm_property(vm_name, "guest.ipAddress")
+            if ip:
+                return ip
             logger.info(f'[{vm_name}] wait 30 try again get')
             time.sleep(30)
-        return std_out.strip()
+        return ""
+
+    def get_vm_memory(self, vm_name):
+        return self.__get_vm_property(vm_name, "config.hardware.memoryMB")
 
     def get_vm_ip_list(self, vm_name):
         cmd = "ifconfig | grep inet | grep -v inet6"
@@ -1244,12 +1310,8 @@ class ESXi(Hypervisor):
         raise Exception(f"error: cannot recognize the OS type of {vm_name}")
 
     def is_vm_running(self, vm_name):
-        vm_id = self.get_vm_id(vm_name)
-        cmd = f'vim-cmd vmsvc/power.getstate {vm_id}'
-        rcode, std_out, std_err = self.sut.execute_shell_cmd(cmd)
-        if rcode != 0:
-            raise Exception(std_err)
-        return 'off' not in std_out
+        # a suspended VM counts as running, as with 'vim-cmd vmsvc/power.getstate'
+        return self.__get_vm_property(vm_name, "runtime.powerState") != "poweredOff"
 
     def __modify_vmx_file_for_new_vm(self, vm_name, disk_dir):
         cmd = f"cat {disk_dir}/*.vmx | grep displayName"
@@ -1375,18 +1437,19 @@ class ESXi(Hypervisor):
     def upload_to_vm_from_host(self, vm_name, host_path, vm_path):
         logger.info(f'upload file from <{self.sut.cfg["defaults"]["name"]}>:{host_path} to <{vm_name}>:{vm_path}')
 
-        service_instance = self.get_esxi_connection()
-        vm = get_vm_obj(vm_name, service_instance)
-        creds = get_vm_credit(self.get_vm_os_type(vm_name))
-
         with open(host_path, "rb") as file:
             data_to_send = file.read()
 
-        file_attribute = vim.vm.guest.FileManager.FileAttributes()
-        url = service_instance.RetrieveContent().guestOperationsManager.fileManager. \
-            InitiateFileTransferToGuest(vm, creds, vm_path,
-                                        file_attribute,
-                                        len(data_to_send), True)
+        def initiate_transfer(service_instance):
+            vm = self.__get_vm_obj(vm_name, service_instance)
+            creds = get_vm_credit(self.get_vm_os_type(vm_name))
+            file_attribute = vim.vm.guest.FileManager.FileAttributes()
+            return service_instance.RetrieveContent().guestOperationsManager.fileManager. \
+                InitiateFileTransferToGuest(vm, creds, vm_path,
+                                            file_attribute,
+                                            len(data_to_send), True)
+
+        url = self.__with_esxi_connection(initiate_transfer)
         url = re.sub(r"^https://\*:", "https://" + self.sut.ssh_sutos._ip + ":", url)
         url = url.replace(":443", f":{os_web_port}")
         resp = requests.put(url, data=data_to_send, verify=False)
@@ -2120,6 +2183,8 @@ class ESXi_Rich(ESXi):
             i += 1
         if i != 0:
             self.acce.my_os.warm_reset_cycle_step(self.sut)
+            # the host reset ended the ESXi session
+            self.reset_esxi_connection()
 
     def dlb_instll_rich_vm(self, vm_list=[]):
         if vm_list == []:
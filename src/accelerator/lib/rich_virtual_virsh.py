@@ -1,16 +1,27 @@
+import math
 import time
 from threading import Thread
+from collections import OrderedDict
+from functools import partial
 from src.accelerator.lib.accelerator import *
+from src.lib.parallel_task_runner import ParallelTaskRunner
 # from src.virtualization.lib.const import sut_tool
 
 
 class KVM:
     CALLER_COMMAND_BASE = f"python {sut_tool('SRC_SCRIPT_PATH_L')}/src/caller.py --os-type LINUX "
+    # thin VM disk: writes go to the overlay, the template stays a shared read-only backing file
+    OVERLAY_DISK_CMD = 'qemu-img create -f qcow2 -F qcow2 -b {} {}'
+    PROTECT_TEMPLATE_CMD = 'chmod a-w {}'
+    DEFINE_VM_CMD = 'VIRTINSTALL_OSINFO_DISABLE_REQUIRE=1 virt-install --name {} --memory {} --vcpus {} ' \
+                    '--disk path={},format=qcow2,bus=virtio --network network=default,model={} ' \
+                    '--import --noautoconsole --print-xml | virsh define /dev/stdin'
 
     def __init__(self, sut):
         self.sut = sut
         self.attached_device_list = {}
         self.vm_list = []
+        self.provision_time = {}
         self.acce = Accelerator(sut)
 
 
@@ -125,7 +136,7 @@ class KVM:
 
         return f"{sut_tool('IMAGE_PATH_L')}/xml/{xml_filename}"
 
-    def create_vm_from_template(self, vm_name, template=f'{IMAGE_PATH_L}{CLEAN_IMAGE_NAME}', ram_mb=16384, cpu_num=4, disk_dir=f'{IMAGE_PATH_L}', vnic_type='virtio', timeout=600):
+    def create_vm_from_template(self, vm_name, template=f'{IMAGE_PATH_L}{CLEAN_IMAGE_NAME}', ram_mb=16384, cpu_num=4, disk_dir=f'{IMAGE_PATH_L}', vnic_type='virtio', timeout=600, thin=True):
         """
         Reference:
             None
@@ -138,6 +149,9 @@ class KVM:
             disk_dir: the directory that the virtual disk file of new VM going to be placed
             vnic_type: the virtual NIC type, virtio or e1000
             timeout: it will raise exception after timeout
+            thin: True to create the virtual disk as a qcow2 overlay on the template and define the VM with
+                  its cpu and memory sizing without booting it, False to copy the template and create the VM
+                  by the caller script
         Returns:
             None
         Raises:
@@ -147,6 +161,7 @@ class KVM:
             and put the virtual disk size to '/root/imgs'
                 create_vm_from_template('RHEL-NEW', '/home/imgs/RHEL0.qcow2', 2048, '/root/imgs')
         """
+        clock_start = time.time()
         if self.is_vm_exist(vm_name):
             if self.is_vm_exist(vm_name):
                 if self.is_vm_running(vm_name):
@@ -161,6 +176,12 @@ class KVM:
         logger.info(f"\tDiks Storage directory: {disk_dir}")
         logger.info("=======================================================")
 
+        if thin:
+            disk_path = self.create_overlay_disk(vm_name, template, disk_dir)
+            self.define_vm(vm_name, disk_path, ram_mb, cpu_num, vnic_type)
+            self.__vm_created(vm_name, template, clock_start)
+            return
+
         self.copy_template_to_disk(vm_name, template, disk_dir)
 
         cmd = self.CALLER_COMMAND_BASE
@@ -179,8 +200,12 @@ class KVM:
         self.shutdown_vm(vm_name, timeout)
         self.sut.execute_shell_cmd(f'virsh setvcpus {vm_name} --maximum {cpu_num} --config', timeout=120)
         self.sut.execute_shell_cmd(f'virsh setvcpus {vm_name} --count {cpu_num} --config', timeout=120)
+        self.__vm_created(vm_name, template, clock_start)
+
+    def __vm_created(self, vm_name, template, clock_start):
         self.vm_list.append(vm_name)
-        logger.info(f"create {vm_name} from {template} succeed")
+        self.provision_time[vm_name] = time.time() - clock_start
+        logger.info(f"create {vm_name} from {template} succeed in {self.provision_time[vm_name]:.1f}s")
 
     def copy_template_to_disk(self, vm_name, template, disk_dir):
         disk_path = f'{disk_dir}/{vm_name}.qcow2'
@@ -190,6 +215,47 @@ class KVM:
         if rcode != 0:
             raise Exception(std_err)
 
+    def create_overlay_disk(self, vm_name, template, disk_dir):
+        """
+        Purpose: to create the virtual disk of a VM as a thin qcow2 overlay backed by the template
+        Args:
+            vm_name: the name of VM
+            template: the path of template file, it is made read-only as it is shared by all overlays
+            disk_dir: the directory that the virtual disk file of VM going to be placed
+        Returns:
+            the path of the virtual disk file
+        Raises:
+            RuntimeError: If any errors
+        """
+        disk_path = f'{disk_dir}/{vm_name}.qcow2'
+        logger.info(f'create overlay {disk_path} backed by {template}')
+        rcode, _, std_err = self.sut.execute_shell_cmd(
+            f'{self.PROTECT_TEMPLATE_CMD.format(template)} && {self.OVERLAY_DISK_CMD.format(template, disk_path)}',
+            timeout=120)
+        if rcode != 0:
+            raise Exception(std_err)
+        return disk_path
+
+    def define_vm(self, vm_name, disk_path, ram_mb, cpu_num, vnic_type='virtio'):
+        """
+        Purpose: to define a VM on an existing virtual disk with its cpu and memory sizing, the VM is not started
+        Args:
+            vm_name: the name of VM
+            disk_path: the path of the virtual disk file
+            ram_mb: the memory going to be assigned to VM, in MB
+            cpu_num: the cpu going to be assigned to VM
+            vnic_type: the virtual NIC type, virtio or e1000
+        Returns:
+            None
+        Raises:
+            RuntimeError: If any errors
+        """
+        logger.info(f'define {vm_name} with {cpu_num} vcpus and {ram_mb}MB memory')
+        rcode, _, std_err = self.sut.execute_shell_cmd(
+            self.DEFINE_VM_CMD.format(vm_name, ram_mb, cpu_num, disk_path, vnic_type), timeout=120)
+        if rcode != 0:
+            raise Exception(std_err)
+
     def create_disk_file(self, disk_path, disk_size_gb):
         """
         Reference:
@@ -498,10 +564,6 @@ class KVM:
             info[key] = val.strip()
         return info
 
-    def __execute_vm_cmd_thread(self, exec_res, vm_name, cmd, timeout, cwd):
-        rcode, std_out, std_err = self.execute_vm_cmd(vm_name, cmd, timeout, cwd)
-        exec_res[vm_name] = [rcode, std_out, std_err]
-
     def __check_is_vm_in_os_by_log(self, vm_name):
         try:
             _, pre_log, std_err = self.__execute_vm_cmd(vm_name, "journalctl -n 1 --no-pager", timeout=10)
@@ -538,9 +600,20 @@ class KVM:
 
 class Rich_KVM(KVM):
 
-    def __init__(self, sut):
+    def __init__(self, sut, max_parallel_vms=None):
         super().__init__(sut)
         self.vm_group_prefix = 'rich_vm_'
+        # None runs the command in all the virtual machines at the same time
+        self.max_parallel_vms = max_parallel_vms
+        self.task_runner = ParallelTaskRunner(logger, max_parallel_vms)
+        self.last_parallel_report = None
+
+    def __get_task_runner(self, vm_num):
+        workers = self.max_parallel_vms or max(vm_num, 1)
+        if self.task_runner.max_workers < workers:
+            self.task_runner.shutdown()
+            self.task_runner = ParallelTaskRunner(logger, workers)
+        return self.task_runner
 
 
     def attach_acce_dev_to_vm_grouply(self, dev_list, dev_num_per_vm, BDF=True):
@@ -592,6 +665,11 @@ class Rich_KVM(KVM):
                 logger.error(e.args[0])
                 raise e
 
+        provision_time = [self.provision_time[vm] for vm in self.vm_list if vm in self.provision_time]
+        if provision_time:
+            logger.info(f'create {vm_num} virtual machine took {sum(provision_time):.1f}s, '
+                        f'{max(provision_time):.1f}s for the slowest one')
+
     def check_device_in_rich_vm(self, device_ip, vf_num, mdev=False):
         """
               Purpose: Check attached device in VM
@@ -684,24 +762,42 @@ class Rich_KVM(KVM):
                 f'download file from virtual machine {vm}  to <{self.sut.sut_name}>:{local_path}')
             self.put_to_sut(vm, local_path, remote_path)
 
-    def execute_rich_vm_cmd_parallel(self, cmd, timeout=60, cwd='/root', start_index=None, end_index=None):
+    def execute_rich_vm_cmd_parallel(self, cmd, timeout=60, cwd='/root', start_index=None, end_index=None,
+                                     deadline=None):
+        """
+        Purpose: to execute a command in the virtual machines start_index to end_index at the same time,
+                 at most max_parallel_vms of them at once if it is set
+        Args:
+            cmd: the command to execute
+            timeout: the timeout of the command in every virtual machine
+            cwd: the working directory of the command
+            start_index: index of the first virtual machine, the first one if None
+            end_index: index of the last virtual machine, the last one if None
+            deadline: overall timeout for all virtual machines, if None timeout + 60 for every wave of
+                      max_parallel_vms virtual machines
+        Returns:
+            {vm_name: [rcode, std_out, std_err]} of all the virtual machines,
+            the full report with exit codes, durations and timeouts is kept in last_parallel_report
+        Raises:
+            RuntimeError: If the command timed out or raised an exception in any virtual machine
+        """
         start_index = 0 if not start_index else start_index
         end_index = len(self.vm_list) if not end_index else end_index + 1
         logger.info(f'execute command [{cmd}] in virtual machine {start_index} to {end_index - 1}')
 
-        vm_list = self.vm_list
-        th_list = []
-        exec_res = {}
+        vm_list = list(self.vm_list)[start_index:end_index]
         logger.info(f'The virtual machine going to execute `{cmd}`: {vm_list}')
 
-        for i in range(len(vm_list)):
-            th = Thread(target=self.__execute_vm_cmd_thread, args=[exec_res, vm_list[i], cmd, timeout, cwd])
-            th_list.append(th)
-            th.start()
-            time.sleep(2)
-        for th in th_list:
-            th.join(timeout=timeout)
-
+        task_runner = self.__get_task_runner(len(vm_list))
+        if deadline is None:
+            deadline = math.ceil(len(vm_list) / task_runner.max_workers) * timeout + 60
+        tasks = OrderedDict((vm, partial(self.execute_vm_cmd, vm, cmd, timeout, cwd)) for vm in vm_list)
+        self.last_parallel_report = task_runner.run(tasks, deadline=deadline, exit_code=lambda res: res[0])
+        exec_res = dict((vm, list(res)) for vm, res in self.last_parallel_report.values().items())
+        missing_vms = [vm for vm in vm_list if vm not in exec_res]
+        if missing_vms:
+            raise RuntimeError(f'execute command [{cmd}] failed or timed out in virtual machine {missing_vms}: '
+                               f'{self.last_parallel_report.summary()}')
         return exec_res
 
     def execute_rich_vm_cmd_parallel_async(self, cmd, timeout=60, cwd='/root', start_index=None, end_index=None):
@@ -883,8 +979,3 @@ class Rich_KVM(KVM):
         vm_list = self.vm_list
         for vm in vm_list:
             self.get_from_sut(vm, local_path, remote_path)
-
-
-    def __execute_vm_cmd_thread(self, exec_res, vm_name, cmd, timeout, cwd):
-        rcode, std_out, std_err = self.execute_vm_cmd(vm_name, cmd, timeout, cwd)
-        exec_res[vm_name] = [rcode, std_out, std_err]
\ No newline at end of file
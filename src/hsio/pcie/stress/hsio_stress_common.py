@@ -251,6 +251,8 @@ class HsioStressCommon(ContentBaseTestCase):
                 False if initial link info does not match link info after test, indicating possible degrade in link.
         """
         self._log.info("Proceeding to check link status")
+        # one pcie topology capture for all the buses
+        self.pcie_provider.refresh_pcie_snapshot()
         if self._initial_link_info == {}:
             for bus in bus_list:
                 (speed, width) = self.get_link_info(f"{bus}:00.0")
@@ -487,7 +489,8 @@ class HsioStressCommon(ContentBaseTestCase):
 
     def get_link_info(self, bdf):
         """
-        Fetches link speed and width from OS. (with pcie_provider)
+        Fetches link speed and width from the pcie topology snapshot of the OS. (with pcie_provider)
+        Call pcie_provider.refresh_pcie_snapshot first to read the current link state.
         :returns <link speed>, <link width> or False, False if any of speed or width is not found.
         """
         try:
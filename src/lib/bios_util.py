@@ -191,67 +191,151 @@ class BiosUtil:
         """
         Method to verify the bios knobs.
         1. Parsing through the cfg file to get the sections and its options for verification.
-        2. Verifying the bios knobs against the cfg file option at the 0th index.
+        2. Verifying the bios knobs against the cfg file option at the 0th index, all knobs are read back at once.
 
         :param bios_config_file: Bios configuration file
         :return: None
         :raise: RuntimeError - if Failed to read the knob / Knob is not set correctly
         """
+        try:
+            self.verify_bios_knob_values(self.get_bios_knob_targets(bios_config_file))
+        except Exception as ex:
+            self._log.error("Error while reading the bios knob with exception = '{}'".format(ex))
+            raise RuntimeError("Error while reading the bios knob with exception = '{}'".format(ex))
+
+    def get_bios_knob_targets(self, bios_config_file=None):
+        """
+        Read the knobs of a bios config file and map them to the platform unique knob names.
+
+        :param bios_config_file: Bios configuration file, the file of this object if None
+        :return: OrderedDict {unique knob name: (config section, Target value)}
+        :raise: KeyError - if a section has no Name key
+        """
         cp = config_parser.ConfigParser()
-        if not bios_config_file:
-            bios_config_file = self.bios_config_file
-        cp.read(bios_config_file)
-        list_sections = cp.sections()
+        cp.read(bios_config_file or self.bios_config_file)
+        targets = OrderedDict()
+        for section in cp.sections():
+            if not cp.has_option(section, self._key_name):
+                raise KeyError("The config file '{}' does not have 'Name' key, please "
+                               "add 'Name' Key..".format(bios_config_file or self.bios_config_file))
+            name = cp.get(section, self._key_name)
+            # get platform unique name if one exists
+            unique_name = self._bios_mapper.get_bios_knob_name(name)
+            if unique_name == BiosMapper.NOT_APPLICABLE:
+                self._log.info("The bios knob name '{}' is not applicable for product "
+                               "family '{}'".format(name, self._product_family))
+                continue
+            targets[unique_name] = (section, cp.get(section, self._key_target))
+        return targets
 
-        try:
-            ret_val = True
-            for section in list_sections:
-                name = cp.get(section, self._key_name)
-                # get platform unique name if one exists
-                unique_name = self._bios_mapper.get_bios_knob_name(name)
-                if unique_name == BiosMapper.NOT_APPLICABLE:
-                    self._log.info("The bios knob name '{}' is not applicable for product "
-                                   "family '{}'".format(name, self._product_family))
-                    continue
+    @staticmethod
+    def get_expected_knob_value(knob_options):
+        """
+        Get the expected value of a knob from its Target option, the first one of a comma separated list.
 
-                ret_value = self._bios_obj.read_bios_knobs(str(unique_name), hexa=True)
+        :param knob_options: Target value from the bios config file
+        :return: expected knob value as int
+        :raise: ValueError - if the Target is not a number
+        """
+        expected_knob_value = str(knob_options).split(',')[0]
+        # remove any quotes if present
+        expected_knob_value = expected_knob_value.replace("\"", "").replace("\'", "")
+        return int(expected_knob_value, 0)
 
-                self._log.info("Verifying the knob '{}'..".format(section))
+    @staticmethod
+    def _get_knob_value_from_read_output(read_output):
+        """
+        :param read_output: read_bios_knobs output line of one knob
+        :return: knob value as int, None if the line has no hexadecimal value
+        """
+        list_of_numbers = re.findall(r'0x[0-9A-F]+', str(read_output), re.I)
+        if not list_of_numbers:
+            return None
+        return int(list_of_numbers[-1], 0)
 
-                if not ret_value[0]:
-                    error_log = "Failed to read knob '{}' value due to '{}'..".format(section, ret_value[1])
-                    self._log.error(error_log)
-                    ret_val = False
-                    continue
+    def read_bios_knob_values(self, names):
+        """
+        Read the current values of several bios knobs with one provider call.
 
-                list_of_numbers = re.findall(r'0x[0-9A-F]+', (' '.join(map(str, ret_value[1]))), re.I)
-                current_knob_value = ' '.join(map(str, list_of_numbers))
-                current_knob_value = int(current_knob_value,0)
-
-                knob_options = (cp.get(section, self._key_target))
-                list_knob_options = str(knob_options).split(',')
-                expected_knob_value = list_knob_options[0]
-                # remove any quotes if present
-                expected_knob_value = expected_knob_value.replace("\"", "")
-                expected_knob_value = expected_knob_value.replace("\'", "")
-                expected_knob_value = int(expected_knob_value,0)
-
-                if current_knob_value == expected_knob_value:
-                    self._log.info("The knob '{}' has been set with correct "
-                                   "value '{}'".format(section, expected_knob_value))
-                else:
-                    self._log.error("The knob '{}' has not been set with correct "
-                                    "value '{}'".format(section, expected_knob_value))
-                    ret_val = False
-
-            if not ret_val:
-                log_error = "One or more Bios knob values are not set as per test case specification..."
-                self._log.error(log_error)
-                raise RuntimeError(log_error)
+        :param names: unique knob names
+        :return: OrderedDict {knob name: current value as int, None if the knob could not be read}
+        """
+        names = list(names)
+        values = OrderedDict((name, None) for name in names)
+        if not names:
+            return values
+        ret_value = self._bios_obj.read_bios_knobs(*names, hexa=True)
+        if ret_value[0] and len(ret_value[1]) == len(names):
+            for name, read_output in zip(names, ret_value[1]):
+                values[name] = self._get_knob_value_from_read_output(read_output)
+            return values
+
+        # the provider did not answer one line per knob, fall back to one read per knob
+        self._log.debug("Reading bios knobs one by one, multi knob read returned '{}'".format(ret_value[1]))
+        for name in names:
+            ret_value = self._bios_obj.read_bios_knobs(str(name), hexa=True)
+            if not ret_value[0]:
+                self._log.error("Failed to read knob '{}' value due to '{}'..".format(name, ret_value[1]))
+                continue
+            values[name] = self._get_knob_value_from_read_output(' '.join(map(str, ret_value[1])))
+        return values
 
-        except Exception as ex:
-            self._log.error("Error while reading the bios knob with exception = '{}'".format(ex))
-            raise RuntimeError("Error while reading the bios knob with exception = '{}'".format(ex))
+    def verify_bios_knob_values(self, targets):
+        """
+        Verify bios knobs against their expected values from a single readback.
+
+        :param targets: OrderedDict {unique knob name: (config section, Target value)}
+        :return: None
+        :raise: RuntimeError - if a knob could not be read or is not set correctly
+        """
+        current_values = self.read_bios_knob_values(targets.keys())
+        ret_val = True
+        for unique_name, (section, knob_options) in targets.items():
+            self._log.info("Verifying the knob '{}'..".format(section))
+            current_knob_value = current_values[unique_name]
+            if current_knob_value is None:
+                self._log.error("Failed to read knob '{}' value..".format(section))
+                ret_val = False
+                continue
+
+            expected_knob_value = self.get_expected_knob_value(knob_options)
+            if current_knob_value == expected_knob_value:
+                self._log.info("The knob '{}' has been set with correct "
+                               "value '{}'".format(section, expected_knob_value))
+            else:
+                self._log.error("The knob '{}' has not been set with correct "
+                                "value '{}'".format(section, expected_knob_value))
+                ret_val = False
+
+        if not ret_val:
+            log_error = "One or more Bios knob values are not set as per test case specification..."
+            self._log.error(log_error)
+            raise RuntimeError(log_error)
+
+    def write_bios_knob_values(self, targets):
+        """
+        Write several bios knobs with one provider call.
+
+        :param targets: OrderedDict {unique knob name: (config section, Target value)}
+        :return: None
+        :raise: RuntimeError - if failed to set the bios knobs
+        """
+        list_args = []
+        for unique_name, (section, value_to_set) in targets.items():
+            list_args.append(unique_name)
+            try:
+                value = literal_eval(str(value_to_set))
+            except (ValueError, SyntaxError):
+                value = value_to_set
+            # a Target list is passed as separate values, the same way set_bios_knob does
+            list_args.extend(value if isinstance(value, tuple) else [value])
+
+        ret_value = self._bios_obj.set_bios_knobs(*list_args, overlap=True)
+        if not ret_value[0]:
+            error_log = "Failed to set the bios knobs due to error '{}'".format(ret_value[1])
+            self._log.error(error_log)
+            raise RuntimeError(error_log)
+        self._log.info("Bios knobs are set: {}".format(", ".join(section for section, _ in targets.values())))
 
     def load_bios_defaults(self):
         """
@@ -303,6 +387,98 @@ class BiosUtil:
         return value
 
 
+class BiosKnobTransaction(object):
+    """
+    Applies the knobs of one or more bios config files as one change: the knobs are compared with a single
+    readback of their current values, only the knobs which differ are written with one provider call, and
+    the SUT needs a reboot only when something was written.
+
+    Usage:
+        transaction = BiosKnobTransaction(bios_util, log, load_defaults=False)
+        transaction.add_config_file(bios_config_file)
+        if transaction.commit():
+            # reboot the SUT
+        transaction.verify()
+    """
+
+    def __init__(self, bios_util, log, load_defaults=False):
+        """
+        :param bios_util: BiosUtil object
+        :param log: log object
+        :param load_defaults: True to load the bios defaults before writing the knobs
+        """
+        self._bios_util = bios_util
+        self._log = log
+        self._load_defaults = load_defaults
+        self._targets = OrderedDict()
+
+    @property
+    def targets(self):
+        """OrderedDict {unique knob name: (config section, Target value)} of all knobs in the transaction"""
+        return self._targets
+
+    def add_config_file(self, bios_config_file):
+        """
+        Add the knobs of a bios config file, they replace the same knobs of files added before.
+
+        :param bios_config_file: Bios configuration file
+        :return: self
+        """
+        for unique_name, target in self._bios_util.get_bios_knob_targets(bios_config_file).items():
+            self._targets.pop(unique_name, None)
+            self._targets[unique_name] = target
+        return self
+
+    def get_pending_knobs(self):
+        """
+        Get the knobs whose current value differs from the expected one.
+
+        :return: OrderedDict {unique knob name: (config section, Target value)}
+        """
+        if self._load_defaults:
+            # the current values say nothing about the values after loading the defaults
+            return OrderedDict(self._targets)
+
+        current_values = self._bios_util.read_bios_knob_values(self._targets.keys())
+        pending = OrderedDict()
+        for unique_name, (section, knob_options) in self._targets.items():
+            try:
+                is_set = current_values[unique_name] == BiosUtil.get_expected_knob_value(knob_options)
+            except ValueError:
+                is_set = False
+            if is_set:
+                self._log.debug("The knob '{}' is already set to '{}'".format(section, knob_options))
+            else:
+                pending[unique_name] = (section, knob_options)
+        return pending
+
+    def commit(self):
+        """
+        Load the defaults if requested and write the knobs which are not set yet.
+
+        :return: True if bios settings were changed and the SUT has to be rebooted, False otherwise
+        :raise: RuntimeError - if failed to load the defaults or to set the knobs
+        """
+        if self._load_defaults:
+            self._bios_util.load_bios_defaults()
+        pending = self.get_pending_knobs()
+        if pending:
+            self._log.info("Setting {} of {} bios knobs".format(len(pending), len(self._targets)))
+            self._bios_util.write_bios_knob_values(pending)
+        elif self._targets:
+            self._log.info("All {} bios knobs are already set".format(len(self._targets)))
+        return self._load_defaults or bool(pending)
+
+    def verify(self):
+        """
+        Verify all knobs of the transaction from a single readback.
+
+        :return: None
+        :raise: RuntimeError - if a knob is not set correctly
+        """
+        self._bios_util.verify_bios_knob_values(self._targets)
+
+
 class PlatformConfigReader(object):
     """Parser for PlatformConfig.xml"""
     _FRONTPAGE_TAG = "FrontPage"
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import re
+import os
+import socket
+import time
+from collections import OrderedDict
+
+from dtaf_core.lib.dtaf_constants import OperatingSystems
+
+
+class BootPhases(object):
+    """
+    Boot phases reported by BootReadinessDetector, in boot order.
+    """
+    SERIAL_CONSOLE = "serial_console"
+    SSH_BANNER = "ssh_banner"
+    OS_ALIVE = "os_alive"
+    SERVICES = "services"
+
+
+class BootReadinessResult(object):
+    """
+    Time to ready of each boot phase, in seconds from the start of the wait.
+    """
+
+    def __init__(self):
+        self.phase_times = OrderedDict()
+        self.total_time = None
+        self.is_ready = False
+
+    def __str__(self):
+        phases = ", ".join("{}={:.1f}s".format(phase, seconds) for phase, seconds in self.phase_times.items())
+        return "ready={} in {} ({})".format(self.is_ready, "{:.1f}s".format(self.total_time)
+                                            if self.total_time is not None else "-", phases)
+
+
+class BootReadinessDetector(object):
+    """
+    Wait for the SUT to boot by probing the boot phases one after the other, with an exponential backoff between the
+    probes instead of fixed sleeps:
+
+    - serial console: the OS boot markers in the console log, recorded when seen but never waited for, the console
+      is not captured on every setup
+    - ssh banner: the SSH server of the SUT answers a TCP connection with its banner
+    - os alive: the OS provider can execute commands on the SUT
+    - services: systemd finished the boot on Linux, no service is start pending on Windows
+    """
+    SERIAL_CONSOLE_BOOT_MARKERS = [r"\blogin:", r"Reached target", r"Welcome to", r"Windows Boot Manager"]
+    SSH_CONFIG_PATH = "suts/sut/providers/sut_os/driver/ssh"
+    SSH_DEFAULT_PORT = 22
+    SSH_BANNER_PREFIX = b"SSH-"
+    LINUX_SERVICES_CMD = "systemctl is-system-running; systemctl is-active NetworkManager systemd-logind"
+    LINUX_SYSTEM_READY_STATES = ("running", "degraded")
+    WINDOWS_SERVICES_CMD = "powershell.exe -Command \"(Get-Service | Where-Object {$_.Status -like '*Pending'})" \
+                           ".Count; (Get-Service -Name Winmgmt).Status\""
+    PROBE_TIMEOUT = 5.0
+    INITIAL_BACKOFF = 0.5
+    MAX_BACKOFF = 10.0
+    BACKOFF_FACTOR = 2
+
+    def __init__(self, log, os_obj, cfg_opts=None, console_log_path=None):
+        """
+        :param log: Logger object to use for output messages
+        :param os_obj: OS object
+        :param cfg_opts: xml.etree.ElementTree.Element of configuration options, to get the SUT SSH address
+        :param console_log_path: serial console log file of the SUT, None if not captured
+        """
+        self._log = log
+        self._os = os_obj
+        self.console_log_path = console_log_path
+        self.sut_ip = None
+        self.ssh_port = self.SSH_DEFAULT_PORT
+        ssh_cfg = cfg_opts.find(self.SSH_CONFIG_PATH) if cfg_opts is not None else None
+        if ssh_cfg is not None:
+            if ssh_cfg.find("ipv4") is not None:
+                self.sut_ip = ssh_cfg.find("ipv4").text.strip()
+            if ssh_cfg.find("port") is not None:
+                self.ssh_port = int(ssh_cfg.find("port").text.strip())
+        self._console_offset = 0
+        self.last_result = None
+
+    def backoff_intervals(self):
+        """
+        Exponential backoff between the probes: 0.5, 1, 2, 4, 8, 10, 10, ... seconds
+        """
+        interval = self.INITIAL_BACKOFF
+        while True:
+            yield interval
+            interval = min(interval * self.BACKOFF_FACTOR, self.MAX_BACKOFF)
+
+    def _console_log_size(self):
+        try:
+            return os.path.getsize(self.console_log_path)
+        except (TypeError, OSError):
+            return 0
+
+    def is_serial_console_booted(self):
+        """
+        :return: True if a boot marker was logged on the serial console since the start of the wait
+        """
+        if not self.console_log_path or not os.path.isfile(self.console_log_path):
+            return False
+        with open(self.console_log_path, "rb") as console_log:
+            console_log.seek(self._console_offset)
+            console_data = console_log.read().decode("utf-8", "ignore")
+        # keep a partial marker at the end of the log to be matched with the next read
+        self._console_offset += max(len(console_data.encode("utf-8", "ignore")) - 64, 0)
+        return any(re.search(marker, console_data) for marker in self.SERIAL_CONSOLE_BOOT_MARKERS)
+
+    def is_ssh_banner_ready(self):
+        """
+        :return: True if the SSH server of the SUT sent its banner, always True if the SUT address is not configured
+        """
+        if not self.sut_ip:
+            return True
+        try:
+            with socket.create_connection((self.sut_ip, self.ssh_port), timeout=self.PROBE_TIMEOUT) as ssh_socket:
+                return ssh_socket.recv(len(self.SSH_BANNER_PREFIX)) == self.SSH_BANNER_PREFIX
+        except (socket.error, socket.timeout):
+            return False
+
+    def is_os_alive(self):
+        """
+        :return: True if the OS provider can reach the SUT
+        """
+        try:
+            return bool(self._os.is_alive())
+        except Exception as ex:
+            self._log.debug("Exception occurred when checking for OS is alive: {}".format(ex))
+            return False
+
+    def is_services_ready(self):
+        """
+        :return: True if the services of the OS are up, always True for the OS types without a services probe,
+                 e.g. ESXi or UEFI shell
+        """
+        try:
+            if self._os.os_type == OperatingSystems.LINUX:
+                states = self._os.execute(self.LINUX_SERVICES_CMD, self.PROBE_TIMEOUT).stdout.split()
+                if states and states[0] in self.LINUX_SYSTEM_READY_STATES:
+                    return True
+                # systemctl is-system-running stays "starting" if a unit hangs, the legacy services check is enough
+                return len(states) >= 3 and states[1:3] == ["active", "active"]
+            if self._os.os_type == OperatingSystems.WINDOWS:
+                output = self._os.execute(self.WINDOWS_SERVICES_CMD, self.PROBE_TIMEOUT * 3).stdout.split()
+                return len(output) >= 2 and output[0] == "0" and output[1] == "Running"
+        except Exception as ex:
+            self._log.debug("Exception occurred when checking the OS services: {}".format(ex))
+            return False
+        self._log.debug("Services probe is not implemented for OS '{}', the OS is ready when alive".format(
+            self._os.os_type))
+        return True
+
+    def wait(self, timeout, wait_for_services=True, skip_console_log=True):
+        """
+        Wait for the SUT to be ready and measure the time to ready of each boot phase.
+
+        :param timeout: maximum time to wait in seconds
+        :param wait_for_services: False to return as soon as the OS is alive
+        :param skip_console_log: True to only look for the boot markers logged after the start of the wait
+        :return: BootReadinessResult, is_ready is False if the SUT was not ready within the timeout
+        """
+        phases = [(BootPhases.SSH_BANNER, self.is_ssh_banner_ready), (BootPhases.OS_ALIVE, self.is_os_alive)]
+        if wait_for_services:
+            phases.append((BootPhases.SERVICES, self.is_services_ready))
+        self._console_offset = self._console_log_size() if skip_console_log else 0
+
+        result = BootReadinessResult()
+        start_time = time.time()
+        backoff = self.backoff_intervals()
+        while phases:
+            if BootPhases.SERIAL_CONSOLE not in result.phase_times and self.is_serial_console_booted():
+                result.phase_times[BootPhases.SERIAL_CONSOLE] = time.time() - start_time
+            phase, probe = phases[0]
+            if probe():
+                result.phase_times[phase] = time.time() - start_time
+                self._log.debug("Boot phase '{}' ready after {:.1f} sec".format(phase, result.phase_times[phase]))
+                phases.pop(0)
+                backoff = self.backoff_intervals()
+                continue
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                break
+            time.sleep(min(next(backoff), remaining))
+
+        result.is_ready = not phases
+        result.total_time = time.time() - start_time
+        self.last_result = result
+        self._log.info("SUT boot readiness: {}".format(result))
+        return result
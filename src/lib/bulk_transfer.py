@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+
+from dtaf_core.lib.dtaf_constants import OperatingSystems
+
+from src.lib import content_exceptions
+
+
+class TransferManifest(object):
+    """
+    Files moved by one bulk transfer, with their sizes in bytes.
+    """
+
+    def __init__(self, source, destination):
+        self.source = source
+        self.destination = destination
+        self.files = OrderedDict()
+        self.archive_size = 0
+        self.elapsed_time = 0.0
+
+    @property
+    def total_size(self):
+        return sum(self.files.values())
+
+    def to_dict(self):
+        return OrderedDict([("source", self.source), ("destination", self.destination),
+                            ("files", self.files), ("total_size", self.total_size),
+                            ("archive_size", self.archive_size), ("elapsed_time", self.elapsed_time)])
+
+    def write(self, manifest_path):
+        """
+        Save the manifest as json.
+
+        :param manifest_path: json file path
+        :return: manifest_path
+        """
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(self.to_dict(), manifest_file, indent=4)
+        return manifest_path
+
+    def __str__(self):
+        return "{} files, {} bytes ({} bytes archive) from '{}' to '{}' in {:.2f} sec".format(
+            len(self.files), self.total_size, self.archive_size, self.source, self.destination, self.elapsed_time)
+
+
+class BulkTransfer(object):
+    """
+    Move many files between the host and the SUT as one tar archive: one archive transfer and one command on the SUT
+    whatever the number of files, instead of one copy per file. The archive is extracted on arrival.
+    """
+    LINUX_TEMP_DIR = "/tmp"
+    WINDOWS_TEMP_DIR = "C:\\"
+    ARCHIVE_NAME = "bulk_transfer_{}.{}"
+    LINUX_PUSH_CMD = "rm -rf '{dest}' && mkdir -p '{dest}' && tar -x{z}f '{archive}' -C '{dest}' && rm -f '{archive}'"
+    LINUX_PUSH_KEEP_CMD = "mkdir -p '{dest}' && tar -x{z}f '{archive}' -C '{dest}' && rm -f '{archive}'"
+    LINUX_PULL_CMD = "tar -c{z}f '{archive}' {files}"
+    LINUX_REMOVE_CMD = "rm -f '{}'"
+    WINDOWS_PUSH_CMD = 'if not exist "{dest}" mkdir "{dest}" && tar -x{z}f "{archive}" -C "{dest}" && del /f /q "{archive}"'
+    WINDOWS_PULL_CMD = 'tar -c{z}f "{archive}" {files}'
+    WINDOWS_REMOVE_CMD = 'del /f /q "{}"'
+
+    def __init__(self, log, os_obj, command_timeout, compress=True):
+        """
+        :param log: Logger object to use for output messages
+        :param os_obj: OS object
+        :param command_timeout: timeout of the archive and extract commands in seconds
+        :param compress: True to gzip the archive, False for files which are already compressed
+        """
+        self._log = log
+        self._os = os_obj
+        self._command_timeout = command_timeout
+        self._compress = compress
+
+    @property
+    def _is_windows(self):
+        return self._os.os_type == OperatingSystems.WINDOWS
+
+    def _archive_name(self):
+        return self.ARCHIVE_NAME.format(uuid.uuid4().hex, "tgz" if self._compress else "tar")
+
+    def _sut_archive_path(self, archive_name):
+        if self._is_windows:
+            return self.WINDOWS_TEMP_DIR + archive_name
+        return self.LINUX_TEMP_DIR + "/" + archive_name
+
+    def push(self, host_paths, sut_dir, clean=False, permissions=None):
+        """
+        Copy host files and directories to a SUT directory.
+
+        :param host_paths: host file or directory path, or list of paths. Directories are copied with their content.
+        :param sut_dir: SUT directory to extract the files to, created if it does not exist
+        :param clean: True to delete the SUT directory before the extraction (Linux)
+        :param permissions: chmod mode applied recursively to sut_dir after the extraction (Linux), e.g. "777"
+        :return: TransferManifest
+        :raise: content_exceptions.TestError if the archive can not be extracted on the SUT
+        """
+        if not isinstance(host_paths, (list, tuple)):
+            host_paths = [host_paths]
+        manifest = TransferManifest(", ".join(host_paths), sut_dir)
+        start_time = time.time()
+        temp_dir = tempfile.mkdtemp()
+        try:
+            archive_name = self._archive_name()
+            host_archive_path = os.path.join(temp_dir, archive_name)
+            with tarfile.open(host_archive_path, "w:gz" if self._compress else "w") as archive:
+                for host_path in host_paths:
+                    if not os.path.exists(host_path):
+                        raise IOError("{} does not found".format(host_path))
+                    archive.add(host_path, arcname=os.path.basename(os.path.normpath(host_path)))
+                for member in archive.getmembers():
+                    if member.isfile():
+                        manifest.files[member.name] = member.size
+            manifest.archive_size = os.path.getsize(host_archive_path)
+            self.push_archive(host_archive_path, sut_dir, clean, permissions)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        manifest.elapsed_time = time.time() - start_time
+        self._log.info("Pushed {}".format(manifest))
+        return manifest
+
+    def push_archive(self, host_archive_path, sut_dir, clean=False, permissions=None):
+        """
+        Copy a tar archive built on the host to the SUT and extract it on arrival.
+
+        :param host_archive_path: host tar archive, gzipped if the BulkTransfer compresses
+        :param sut_dir: SUT directory to extract the files to, created if it does not exist
+        :param clean: True to delete the SUT directory before the extraction (Linux)
+        :param permissions: chmod mode applied recursively to sut_dir after the extraction (Linux), e.g. "777"
+        :raise: content_exceptions.TestError if the archive can not be extracted on the SUT
+        """
+        sut_archive_path = self._sut_archive_path(self._archive_name())
+        self._os.copy_local_file_to_sut(host_archive_path, sut_archive_path)
+
+        if self._is_windows:
+            extract_cmd = self.WINDOWS_PUSH_CMD
+        else:
+            extract_cmd = self.LINUX_PUSH_CMD if clean else self.LINUX_PUSH_KEEP_CMD
+        extract_cmd = extract_cmd.format(dest=sut_dir, archive=sut_archive_path, z="z" if self._compress else "")
+        if permissions and not self._is_windows:
+            extract_cmd += " && chmod -R {} '{}'".format(permissions, sut_dir)
+        result = self._os.execute(extract_cmd, self._command_timeout)
+        if result.cmd_failed():
+            raise content_exceptions.TestError("Failed to extract the archive in '{}' on SUT: {}".format(
+                sut_dir, result.stderr))
+
+    def pull(self, sut_dir, host_dir, patterns="*"):
+        """
+        Copy the SUT files matching the patterns to a host directory.
+
+        :param sut_dir: SUT directory of the files
+        :param host_dir: host directory to extract the files to, created if it does not exist
+        :param patterns: shell pattern or list of patterns of the files relative to sut_dir, e.g. "*.log"
+        :return: TransferManifest, with no files if no file matches the patterns
+        """
+        if not isinstance(patterns, (list, tuple)):
+            patterns = [patterns]
+        manifest = TransferManifest(sut_dir, host_dir)
+        start_time = time.time()
+        archive_name = self._archive_name()
+        sut_archive_path = self._sut_archive_path(archive_name)
+        archive_cmd = self.WINDOWS_PULL_CMD if self._is_windows else self.LINUX_PULL_CMD
+        result = self._os.execute(archive_cmd.format(archive=sut_archive_path, files=" ".join(patterns),
+                                                     z="z" if self._compress else ""),
+                                  self._command_timeout, cwd=sut_dir)
+        try:
+            if result.cmd_failed():
+                self._log.debug("No file archived from '{}' on SUT: {}".format(sut_dir, result.stderr))
+                return manifest
+
+            if not os.path.isdir(host_dir):
+                os.makedirs(host_dir)
+            temp_dir = tempfile.mkdtemp()
+            try:
+                host_archive_path = os.path.join(temp_dir, archive_name)
+                self._os.copy_file_from_sut_to_local(sut_archive_path, host_archive_path)
+                manifest.archive_size = os.path.getsize(host_archive_path)
+                with open(host_archive_path, "rb") as archive_file:
+                    # members are extracted while the archive is read, no second pass over the archive
+                    with tarfile.open(fileobj=archive_file, mode="r|*") as archive:
+                        for member in archive:
+                            if member.name.startswith(("/", "..")) or "/../" in member.name:
+                                raise content_exceptions.TestError("Unsafe path '{}' in the SUT archive".format(
+                                    member.name))
+                            archive.extract(member, host_dir)
+                            if member.isfile():
+                                manifest.files[member.name] = member.size
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        finally:
+            remove_cmd = self.WINDOWS_REMOVE_CMD if self._is_windows else self.LINUX_REMOVE_CMD
+            self._os.execute(remove_cmd.format(sut_archive_path), self._command_timeout)
+
+        manifest.elapsed_time = time.time() - start_time
+        self._log.info("Pulled {}".format(manifest))
+        return manifest
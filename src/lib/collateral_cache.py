@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import errno
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class CollateralCacheError(RuntimeError):
+    """Raised when an artifact can not be downloaded or fails the integrity check."""
+
+    def __init__(self, message, status_code=None):
+        super(CollateralCacheError, self).__init__(message)
+        self.status_code = status_code
+
+
+class CollateralCache(object):
+    """
+    Host side content addressed cache of the collaterals downloaded from Artifactory.
+
+    Artifacts are stored once under objects/<sha256> of the cache folder and copied to the requested destination,
+    so all the test runs on a controller share the downloaded data. Downloads are streamed to disk, resumed with an
+    http range request when a previous download was interrupted and verified against the sha256 checksum
+    published by Artifactory (X-Checksum-Sha256) before they are added to the cache.
+    """
+    CHECKSUM_HEADER = "X-Checksum-Sha256"
+    CHUNK_SIZE = 64 * 1024
+    LOCK_POLL_INTERVAL = 1
+    STALE_LOCK_TIMEOUT = 30 * 60
+    LOCK_REFRESH_INTERVAL = 60
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_TIMEOUT = 60
+    MAX_RETRIES = 3
+
+    def __init__(self, log, cache_dir, auth=None, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT):
+        """
+        :param log: logger object
+        :param cache_dir: folder of the cache, shared by all the test runs on the host
+        :param auth: (user, password) tuple for the http requests
+        :param max_workers: number of concurrent downloads of fetch_many
+        :param timeout: connect/read timeout of the http requests in seconds
+        """
+        self._log = log
+        self._cache_dir = cache_dir
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._index_dir = os.path.join(cache_dir, "index")
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._local = threading.local()
+        self._auth = auth
+        for folder in (self._objects_dir, self._index_dir):
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+    @property
+    def _session(self):
+        """
+        requests session of the calling thread, keeps the connection to Artifactory alive between downloads
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.auth = self._auth
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _sha256_of_file(file_path, hash_obj=None):
+        hash_obj = hash_obj or hashlib.sha256()
+        with open(file_path, "rb") as file_obj:
+            for chunk in iter(lambda: file_obj.read(CollateralCache.CHUNK_SIZE), b""):
+                hash_obj.update(chunk)
+        return hash_obj
+
+    def _object_path(self, sha256):
+        return os.path.join(self._objects_dir, sha256)
+
+    def _index_path(self, url):
+        return os.path.join(self._index_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_index(self, url):
+        try:
+            with open(self._index_path(url)) as index_file:
+                return json.load(index_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write_index(self, url, entry):
+        tmp_path = "{}.{}.tmp".format(self._index_path(url), os.getpid())
+        with open(tmp_path, "w") as index_file:
+            json.dump(entry, index_file)
+        os.replace(tmp_path, self._index_path(url))
+
+    def _acquire_lock(self, lock_path):
+        """
+        Inter process lock so that only one test run downloads the same artifact at a time. The owner keeps the
+        lock mtime fresh with _refresh_lock, a lock older than STALE_LOCK_TIMEOUT is left over by a dead process.
+
+        :return: token of the lock owner, written in the lock file
+        """
+        token = "{}:{}".format(os.getpid(), uuid.uuid4().hex)
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, token.encode())
+                os.close(fd)
+                return token
+            except OSError as ex:
+                if ex.errno != errno.EEXIST:
+                    raise
+            try:
+                if time.time() - os.path.getmtime(lock_path) > self.STALE_LOCK_TIMEOUT:
+                    self._log.warning("Removing stale cache lock {}".format(lock_path))
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(self.LOCK_POLL_INTERVAL)
+
+    @staticmethod
+    def _is_lock_owner(lock_path, token):
+        try:
+            with open(lock_path) as lock_file:
+                return lock_file.read() == token
+        except (IOError, OSError):
+            return False
+
+    def _refresh_lock(self, lock_path, token):
+        """
+        Update the lock mtime so that other processes do not take the lock over during a long download.
+
+        :raise CollateralCacheError: if the lock was taken over by another process
+        """
+        if not self._is_lock_owner(lock_path, token):
+            raise CollateralCacheError("Lost the cache lock {}".format(lock_path))
+        os.utime(lock_path, None)
+
+    def _release_lock(self, lock_path, token):
+        if self._is_lock_owner(lock_path, token):
+            os.remove(lock_path)
+        else:
+            self._log.warning("Cache lock {} was taken over by another process, not removing it".format(lock_path))
+
+    @staticmethod
+    def _content_size(response, offset):
+        """
+        :return: size of the complete artifact according to the response headers, None if unknown
+        """
+        if response.headers.get("Content-Encoding", "identity") != "identity":
+            # the length is the one of the encoded stream, iter_content returns the decoded data
+            return None
+        if response.status_code == 206:
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            return int(total) if total.isdigit() else None
+        length = response.headers.get("Content-Length")
+        return int(length) + offset if length and length.isdigit() else None
+
+    def _remote_info(self, url):
+        """
+        :return: (sha256, etag) of the artifact, sha256 is None if the server does not publish it
+        """
+        response = self._session.head(url, timeout=self._timeout, allow_redirects=True)
+        if response.status_code != 200:
+            raise CollateralCacheError("Failed to get '{}', response code: {}".format(url, response.status_code),
+                                       response.status_code)
+        sha256 = response.headers.get(self.CHECKSUM_HEADER)
+        return (sha256.lower() if sha256 else None), response.headers.get("ETag")
+
+    def _download(self, url, part_path, keep_alive=None):
+        """
+        Stream the artifact into part_path, resume from the size of an existing part file.
+
+        :param keep_alive: called every LOCK_REFRESH_INTERVAL seconds while the download is running
+        :return: sha256 hex digest of the complete file
+        """
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+            headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+            try:
+                with self._session.get(url, headers=headers, stream=True, timeout=self._timeout) as response:
+                    if response.status_code == 416:
+                        # part file already holds the complete artifact
+                        return self._sha256_of_file(part_path).hexdigest()
+                    if response.status_code not in (200, 206):
+                        raise CollateralCacheError("Failed to download '{}', response code: {}".format(
+                            url, response.status_code), response.status_code)
+                    if response.status_code == 200 or not offset:
+                        offset = 0
+                        hash_obj = hashlib.sha256()
+                        mode = "wb"
+                    else:
+                        self._log.info("Resuming download of '{}' from byte {}".format(url, offset))
+                        hash_obj = self._sha256_of_file(part_path)
+                        mode = "ab"
+                    expected_size = self._content_size(response, offset)
+                    last_keep_alive = time.time()
+                    with open(part_path, mode) as part_file:
+                        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                            part_file.write(chunk)
+                            hash_obj.update(chunk)
+                            if keep_alive and time.time() - last_keep_alive >= self.LOCK_REFRESH_INTERVAL:
+                                keep_alive()
+                                last_keep_alive = time.time()
+                    size = os.path.getsize(part_path)
+                    if expected_size is not None and size != expected_size:
+                        # the server closed the stream early, resume from the part file
+                        raise requests.RequestException("Got {} of {} bytes".format(size, expected_size))
+                    return hash_obj.hexdigest()
+            except requests.RequestException as ex:
+                self._log.warning("Download of '{}' interrupted (attempt {}/{}): {}".format(
+                    url, attempt, self.MAX_RETRIES, ex))
+                if attempt == self.MAX_RETRIES:
+                    raise CollateralCacheError("Failed to download '{}': {}".format(url, ex))
+
+    def get(self, url):
+        """
+        Return the cache path of the artifact, download it into the cache if it is not cached yet.
+
+        :param url: url of the artifact
+        :return: path of the verified artifact inside of the cache
+        """
+        expected_sha256, etag = self._remote_info(url)
+        index = self._read_index(url)
+        if expected_sha256 is None and etag and index.get("etag") == etag:
+            expected_sha256 = index.get("sha256")
+        if expected_sha256 and os.path.isfile(self._object_path(expected_sha256)):
+            self._log.info("Cache hit for '{}' ({})".format(url, expected_sha256))
+            return self._object_path(expected_sha256)
+
+        # partial downloads are keyed by the artifact version so that a resume never mixes two versions
+        part_key = expected_sha256 or hashlib.sha1("{}{}".format(url, etag).encode("utf-8")).hexdigest()
+        part_path = os.path.join(self._objects_dir, part_key + ".part")
+        lock_path = part_path + ".lock"
+        token = self._acquire_lock(lock_path)
+        try:
+            if expected_sha256 and os.path.isfile(self._object_path(expected_sha256)):
+                return self._object_path(expected_sha256)
+            self._log.info("Downloading '{}' into the collateral cache".format(url))
+            sha256 = self._download(url, part_path, keep_alive=lambda: self._refresh_lock(lock_path, token))
+            if expected_sha256 and sha256 != expected_sha256:
+                os.remove(part_path)
+                raise CollateralCacheError("Checksum mismatch for '{}': expected {}, got {}".format(
+                    url, expected_sha256, sha256))
+            os.replace(part_path, self._object_path(sha256))
+            self._write_index(url, {"sha256": sha256, "etag": etag})
+            return self._object_path(sha256)
+        finally:
+            self._release_lock(lock_path, token)
+
+    def fetch(self, url, dest_path):
+        """
+        Download the artifact through the cache and copy it to dest_path.
+
+        :param url: url of the artifact
+        :param dest_path: destination file path on the host
+        :return: dest_path
+        """
+        object_path = self.get(url)
+        dest_folder = os.path.dirname(dest_path)
+        if dest_folder and not os.path.isdir(dest_folder):
+            os.makedirs(dest_folder)
+        tmp_path = "{}.{}.tmp".format(dest_path, threading.current_thread().ident)
+        shutil.copyfile(object_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+
+    def fetch_many(self, url_dest_list):
+        """
+        Download several artifacts concurrently.
+
+        :param url_dest_list: list of (url, dest_path) tuples
+        :return: list of dest_path in the order of url_dest_list
+        :raise CollateralCacheError: first failure after all downloads have finished
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [executor.submit(self.fetch, url, dest_path) for url, dest_path in url_dest_list]
+        return [future.result() for future in futures]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import hashlib
+import io
+import os
+import posixpath
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
+
+class CollateralManifest(object):
+    """
+    sha256 checksums and sizes of the files of a collateral, keyed by their path relative to the SUT folder the
+    collateral is extracted to. The manifest is kept on the SUT in the sha256sum format, so the SUT can verify its
+    copy with "sha256sum -c" and only the missing or changed files need to be transferred.
+
+    Symbolic links and directories of archives are recorded with "symlink:<target>" and "directory" in place of
+    the checksum. sha256sum skips these lines, the SUT checks them with readlink and test -d.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    TAR_EXTENSIONS = (".tar", ".tgz", ".tar.gz", ".tar.xz", ".txz")
+    FILE = "file"
+    SYMLINK = "symlink"
+    DIRECTORY = "directory"
+    SYMLINK_PREFIX = SYMLINK + ":"
+
+    # host manifests by (path, prefix, mtime, size), the collaterals are hashed once per process
+    _host_manifests = {}
+    _lock = threading.Lock()
+
+    def __init__(self, entries=None):
+        """
+        :param entries: OrderedDict {relative path: (sha256, size)}
+        """
+        self.entries = entries if entries is not None else OrderedDict()
+
+    @property
+    def total_size(self):
+        return sum(size for _, size in self.entries.values())
+
+    @classmethod
+    def _hash_stream(cls, stream):
+        sha256 = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: stream.read(cls.CHUNK_SIZE), b""):
+            sha256.update(chunk)
+            size += len(chunk)
+        return sha256.hexdigest(), size
+
+    @classmethod
+    def from_host_path(cls, host_path, prefix="", extract=True):
+        """
+        Manifest of the files of a zip or tar archive, or of a single file.
+
+        :param host_path: host archive or file path
+        :param prefix: relative SUT path of a single file, or the folder the archive members are extracted to
+        :param extract: False to handle an archive as a single file
+        :return: CollateralManifest
+        """
+        stat = os.stat(host_path)
+        key = (os.path.abspath(host_path), prefix, extract, stat.st_mtime, stat.st_size)
+        with cls._lock:
+            entries = cls._host_manifests.get(key)
+        if entries is None:
+            entries = OrderedDict()
+            for name, member_type, open_member, _, link_target, _ in cls._iter_source_files(host_path, prefix, extract):
+                if member_type == cls.SYMLINK:
+                    entries[name] = (cls.SYMLINK_PREFIX + link_target, 0)
+                elif member_type == cls.DIRECTORY:
+                    entries[name] = (cls.DIRECTORY, 0)
+                else:
+                    with open_member() as member:
+                        entries[name] = cls._hash_stream(member)
+            with cls._lock:
+                cls._host_manifests[key] = entries
+        return cls(OrderedDict(entries))
+
+    @classmethod
+    def _iter_source_files(cls, host_path, prefix, extract=True):
+        """
+        Yield (relative path, member type, callable opening the file content, mode, symbolic link target,
+        modification time) of the regular files, symbolic links and directories of the source. Hard links are handled
+        as regular files.
+        """
+        if extract and zipfile.is_zipfile(host_path):
+            with zipfile.ZipFile(host_path) as archive:
+                for info in archive.infolist():
+                    name = posixpath.join(prefix, info.filename.rstrip("/"))
+                    mode = info.external_attr >> 16
+                    # zip keeps the local time of the member
+                    mtime = time.mktime(info.date_time + (0, 0, -1))
+                    if info.filename.endswith("/"):
+                        yield name, cls.DIRECTORY, None, stat.S_IMODE(mode) or 0o755, None, mtime
+                    elif stat.S_ISLNK(mode):
+                        # zip keeps the target of a symbolic link as its content
+                        yield name, cls.SYMLINK, None, 0o777, archive.read(info).decode("utf-8"), mtime
+                    else:
+                        yield (name, cls.FILE, lambda info=info: archive.open(info), stat.S_IMODE(mode) or 0o644, None,
+                               mtime)
+        elif extract and host_path.lower().endswith(cls.TAR_EXTENSIONS):
+            with tarfile.open(host_path, "r:*") as archive:
+                for info in archive.getmembers():
+                    name = posixpath.join(prefix, info.name)
+                    if info.issym():
+                        yield name, cls.SYMLINK, None, info.mode, info.linkname, info.mtime
+                    elif info.isdir():
+                        yield name, cls.DIRECTORY, None, info.mode, None, info.mtime
+                    elif info.isfile() or info.islnk():
+                        yield name, cls.FILE, lambda info=info: archive.extractfile(info), info.mode, None, info.mtime
+        else:
+            yield (prefix or os.path.basename(host_path), cls.FILE, lambda: open(host_path, "rb"), 0o644, None,
+                   os.path.getmtime(host_path))
+
+    @classmethod
+    def parse(cls, manifest_text):
+        """
+        :param manifest_text: manifest in the sha256sum format, as written by dumps
+        :return: CollateralManifest, sizes are not part of the sha256sum format and are 0
+        """
+        entries = OrderedDict()
+        for line in manifest_text.splitlines():
+            checksum, _, name = line.strip().partition("  ")
+            if name and (len(checksum) == 64 or checksum == cls.DIRECTORY or checksum.startswith(cls.SYMLINK_PREFIX)):
+                entries[name] = (checksum, 0)
+        return cls(entries)
+
+    def dumps(self):
+        return "".join("{}  {}\n".format(checksum, name) for name, (checksum, _) in self.entries.items())
+
+    def changed_files(self, sut_manifest, failed_files=()):
+        """
+        :param sut_manifest: CollateralManifest of the files recorded on the SUT
+        :param failed_files: files of the SUT manifest which failed the SUT checksum verification
+        :return: relative paths of the files to transfer, missing or changed on the SUT
+        """
+        return [name for name, (checksum, _) in self.entries.items()
+                if name in failed_files or sut_manifest.entries.get(name, (None, 0))[0] != checksum]
+
+    def stale_files(self, sut_manifest):
+        """
+        :return: relative paths of the files, symbolic links and directories recorded on the SUT which are no more
+                 part of the collateral
+        """
+        return [name for name in sut_manifest.entries if name not in self.entries]
+
+    def is_directory(self, name):
+        return self.entries.get(name, (None, 0))[0] == self.DIRECTORY
+
+    def write_delta_archive(self, host_path, prefix, file_names, tar_path, manifest_name, compress=True,
+                            extract=True):
+        """
+        Write a tar archive with the given files, symbolic links and directories of the source and this manifest, to be extracted on the SUT
+        in the folder the manifest paths are relative to.
+
+        :param host_path: host archive or file path the manifest was built from
+        :param prefix: same prefix as given to from_host_path
+        :param file_names: relative paths of the files to put in the archive
+        :param tar_path: tar archive to write
+        :param manifest_name: relative path of the manifest file in the archive
+        :param compress: True to gzip the archive
+        :param extract: same extract as given to from_host_path
+        :return: tar_path
+        """
+        file_names = set(file_names)
+        mode = "w:gz" if compress else "w"
+        with tarfile.open(tar_path, mode, **({"compresslevel": 1} if compress else {})) as delta_archive:
+            for name, member_type, open_member, mode, link_target, mtime in self._iter_source_files(host_path, prefix,
+                                                                                                     extract):
+                if name not in file_names:
+                    continue
+                info = tarfile.TarInfo(name)
+                info.mode = mode
+                # keep the source dates, make based builds on the SUT compare them with their outputs
+                info.mtime = mtime
+                if member_type == self.SYMLINK:
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = link_target
+                    delta_archive.addfile(info)
+                elif member_type == self.DIRECTORY:
+                    info.type = tarfile.DIRTYPE
+                    delta_archive.addfile(info)
+                else:
+                    info.size = self.entries[name][1]
+                    with open_member() as member:
+                        delta_archive.addfile(info, member)
+            manifest_data = self.dumps().encode("utf-8")
+            info = tarfile.TarInfo(manifest_name)
+            info.size = len(manifest_data)
+            info.mode = 0o644
+            info.mtime = time.time()
+            delta_archive.addfile(info, io.BytesIO(manifest_data))
+        return tar_path
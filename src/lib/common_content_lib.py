@@ -59,6 +59,8 @@ from dtaf_core.providers.silicon_reg_provider import SiliconRegProvider
 
 from src.lib.content_configuration import ContentConfiguration
 from src.lib.windows_event_log import WindowsEventLog
+from src.lib.boot_readiness import BootReadinessDetector
+from src.lib.bulk_transfer import BulkTransfer
 from src.lib.dtaf_content_constants import BootScriptConstants
 from src.lib.dtaf_content_constants import ProviderXmlConfigs
 from src.lib.dtaf_content_constants import NumberFormats
@@ -142,6 +144,9 @@ class CommonContentLib(object):
         if cfg_opts is not None:
             self.product = self.get_platform_family()
         self._windows_event_log_obj = None
+        # serial console log of the SUT, used by the boot readiness detector when the test captures it
+        self.console_log_path = None
+        self._boot_readiness = None
         if self._os.os_type == OperatingSystems.WINDOWS:
             self._windows_event_log_obj = WindowsEventLog(self._log, self._os)
         if self._common_content_configuration.is_container_env():
@@ -835,6 +840,13 @@ class CommonContentLib(object):
             os.mkdir(host_testcase_path)
             self._log.info("Folder '% s' has been created to store the logs..." % host_testcase_path)
 
+        # all the log files in one archive, the per file copy below is kept for a SUT without tar
+        manifest = BulkTransfer(self._log, self._os, self._command_timeout).pull(
+            sut_log_files_path, host_testcase_path, "*{}".format(extension))
+        if manifest.files:
+            self._log.info("Log files have been copied from SUT to local was successful...")
+            return host_testcase_path
+
         logs_names = None
 
         if OperatingSystems.WINDOWS in self._os.os_type:
@@ -1321,26 +1333,11 @@ class CommonContentLib(object):
             raise IOError("{} does not found".format(host_zip_file_path))
 
         if dont_delete is None:
-            self.execute_sut_cmd("rm -rf {}".format(sut_folder_name), "To delete a "
-                                                                  "folder",
-                                 self._command_timeout, self.ROOT_PATH)
-
-            self.execute_sut_cmd("mkdir -p {}".format(sut_folder_name), "To Create a "
-                                                                        "folder",
-                                 self._command_timeout, self.ROOT_PATH)
+            self.execute_sut_cmd("rm -rf {0} && mkdir -p {0}".format(sut_folder_name),
+                                 "To delete and create a folder", self._command_timeout, self.ROOT_PATH)
         else:
-            sut_folder_name_find = self.execute_sut_cmd_no_exception("find / -type d -samefile {}".
-                                                                                  format(sut_folder_name),
-                                                                                  "find the sut folder path",
-                                                                                  self._command_timeout,
-                                                                                  cmd_path=self.ROOT_PATH,
-                                                                                  ignore_result="ignore")
-            self._log.debug("find sut folder path {} result {}".format(sut_folder_name, sut_folder_name_find))
-            if sut_folder_name_find == "" or \
-                    len(re.findall(r'.*No such file or directory.*', sut_folder_name_find, re.IGNORECASE)) > 0:
-                self.execute_sut_cmd("mkdir -p '{}'".format(sut_folder_name), "To Create a "
-                                                                            "folder",
-                                     self._command_timeout, self.ROOT_PATH)
+            self.execute_sut_cmd("mkdir -p '{}'".format(sut_folder_name), "To Create a folder",
+                                 self._command_timeout, self.ROOT_PATH)
 
         sut_folder_path = Path(os.path.join(self.ROOT_PATH, sut_folder_name)).as_posix()
 
@@ -1437,25 +1434,14 @@ class CommonContentLib(object):
         if LinuxDistributions.Cnos.lower() in self._os.os_subtype.lower():
             self.execute_sut_cmd("zypper --non-interactive install unzip", "install unzip", self._command_timeout,
                                  sut_folder_path)
-        self.execute_sut_cmd(unzip_command, "unzip the folder",
-                             self._command_timeout, sut_folder_path)
-
-        #self.execute_sut_cmd("unzip {}".format(zip_file), "unzip the folder", self._command_timeout,
-        #                    sut_folder_path)
-
         tool_path_sut = Path(os.path.join(self.ROOT_PATH, folder_name)).as_posix()
 
-        # copying file to Linux SUT in root from host
-
-        self._log.debug("The file '{}' has been unzipped successfully "
-                       "..".format(zip_file))
-        # Remove the zip file after decompressing
-        command_extract_tar_file = self.REMOVE_FILE.format(tool_path_sut + "/" + zip_file)
-        self.execute_sut_cmd(command_extract_tar_file, "remove zip file", self._command_timeout)
-        self._log.debug("The zip file after decompressing is removed "
-                        "successfully")
-        self._os.execute("chmod -R 777 %s" % tool_path_sut,
-                         self._command_timeout)
+        # extract, remove the zip file after decompressing and set the permissions in one command
+        self.execute_sut_cmd("{} && {} && chmod -R 777 {}".format(
+            unzip_command, self.REMOVE_FILE.format(tool_path_sut + "/" + zip_file), tool_path_sut),
+            "unzip the folder", self._command_timeout, sut_folder_path)
+        self._log.debug("The file '{}' has been unzipped successfully and removed after decompressing "
+                        "..".format(zip_file))
 
         return tool_path_sut
 
@@ -1770,19 +1756,8 @@ class CommonContentLib(object):
         :param local_path: Local host path
         :param remote_path: Remote directory
         """
-        directory = os.path.split(local_path)[-1].strip()
-        files = [os.path.join(local_path, file) for file in
-                 os.listdir(local_path)]
-        remote_path = remote_path + "/" + directory
-        self._log.info("Remote path: %s", remote_path)
-        if not self._os.check_if_path_exists(remote_path, directory=True):
-            sut_cmd = self._os.execute("mkdir -p %s" % remote_path,
-                                       self._command_timeout)
-            self._log.debug(sut_cmd.stdout)
-            self._log.error(sut_cmd.stderr)
-        for file in files:
-            self._log.debug("Copying %s to %s", file, remote_path)
-            self._os.copy_local_file_to_sut(file, remote_path)
+        self._log.info("Remote path: %s", remote_path + "/" + os.path.split(local_path)[-1].strip())
+        BulkTransfer(self._log, self._os, self._command_timeout).push(local_path, remote_path)
 
     def get_cpu_physical_chop_info(self, csp, sdp, log_file_path):
         """
@@ -2565,24 +2540,24 @@ class CommonContentLib(object):
         else:
             pass
 
+    @property
+    def boot_readiness(self):
+        """
+        Boot readiness detector of the SUT, its last_result has the time to ready of each boot phase of the last wait.
+
+        :return: BootReadinessDetector
+        """
+        if self._boot_readiness is None:
+            self._boot_readiness = BootReadinessDetector(self._log, self._os, self._cfg, self.console_log_path)
+        self._boot_readiness.console_log_path = self.console_log_path
+        return self._boot_readiness
+
     def is_linux_fully_booted(self):
-        try:
-            return_status = False
-            cmd_to_be_executed = "service NetworkManager status | grep \"Active: active\""
-            os_cmd_response = self._os.execute(cmd_to_be_executed, 1.0)
-            if "Active: active" not in os_cmd_response.stdout:
-                self._log.info("Linux is not fully booted - networkmanager service is not up...")
-            else:
-                self._log.info("Linux - NetworkManager service is up")
-            cmd_to_be_executed = "service systemd-logind status | grep \"Active: active\""
-            os_cmd_response = self._os.execute(cmd_to_be_executed, 1.0)
-            if "Active: active" not in os_cmd_response.stdout:
-                self._log.info("Linux is not fully booted - logind service is not up")
-            else:
-                self._log.info("Linux is fully loaded....")
-                return_status = True
-        except Exception as e:
-            self._log.error("Exception in is_linux_fully_loaded(): %s"%e)
+        return_status = self.boot_readiness.is_services_ready()
+        if return_status:
+            self._log.info("Linux is fully loaded....")
+        else:
+            self._log.info("Linux is not fully booted - services are not up...")
         return return_status
 
     def wait_for_sut_to_boot_fully(self):
@@ -2597,13 +2572,17 @@ class CommonContentLib(object):
             raise content_exceptions.TestFail("wait_for_sut_to_boot_fully() is not implemented for OS type- {}".format(
                 self._os.os_type))
 
-    def wait_for_linux_to_boot_fully(self):
-        time_start = 0
-        while not self.is_linux_fully_booted() and time_start <= 300:
-            self._log.info("Waiting for linux to fully come up..., time elapsed = %d sec"%time_start)
-            time.sleep(5)
-            time_start += 5
-            continue
+    def wait_for_linux_to_boot_fully(self, timeout=300):
+        """
+        This method is to wait till the linux services are up.
+
+        :param timeout: maximum time to wait in seconds
+        :return: BootReadinessResult
+        """
+        result = self.boot_readiness.wait(timeout)
+        if not result.is_ready:
+            self._log.error("Linux did not fully come up within {} sec".format(timeout))
+        return result
 
     def is_windows_fully_booted(self):
         """
@@ -2611,32 +2590,37 @@ class CommonContentLib(object):
 
         :return True/False
         """
-        # TODO: Need to implement to check SUT fully booted
-        time.sleep(15)
-        self._log.info("Windows is fully loaded....")
-        return_status = True
+        return_status = self.boot_readiness.is_services_ready()
+        if return_status:
+            self._log.info("Windows is fully loaded....")
+        else:
+            self._log.info("Windows is not fully booted - services are still starting...")
         return return_status
 
-    def wait_for_windows_to_boot_fully(self):
+    def wait_for_windows_to_boot_fully(self, timeout=300):
         """
         This method is to wait till SUT boot to OS.
+
+        :param timeout: maximum time to wait in seconds
+        :return: BootReadinessResult
         """
-        time_start = 0
-        while not self.is_windows_fully_booted() and time_start <= 300:
-            self._log.info("Waiting for Windows to fully come up..., time elapsed = %d sec" % time_start)
-            time.sleep(5)
-            time_start += 5
-            continue
+        result = self.boot_readiness.wait(timeout)
+        if not result.is_ready:
+            self._log.error("Windows did not fully come up within {} sec".format(timeout))
+        return result
 
     def wait_for_os(self, reboot_timeout):
-        start_time = time.time()
-        is_booted = False
-        while time.time() - start_time <= reboot_timeout:
-            if self.check_os_alive():
-                is_booted = True
-                break
-        if not is_booted:
+        """
+        This method is to wait till the OS of the SUT is alive.
+
+        :param reboot_timeout: maximum time to wait in seconds
+        :return: BootReadinessResult with the time to ready of each boot phase
+        :raise: content_exceptions.TestFail if the OS is not alive within reboot_timeout
+        """
+        result = self.boot_readiness.wait(reboot_timeout, wait_for_services=False)
+        if not result.is_ready:
             raise content_exceptions.TestFail("failed to boot within %d seconds" % reboot_timeout)
+        return result
 
     def collect_axon_logs(self, post_code, cycle_num, analyzers, sdp, sv):
         try:
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import re
+import time
+
+
+class StreamPatternMatcher(object):
+    """
+    Incremental matcher of several patterns against a stream of console data.
+
+    All patterns are compiled into one alternation which is searched only over the newly received chunk plus a
+    bounded look-behind window of the previous data, so the cost of each feed depends on the chunk size and not on
+    the length of the whole log. Matches must not be longer than the look-behind window.
+    """
+    DEFAULT_WINDOW_SIZE = 4096
+    MIN_POLL_INTERVAL = 0.01
+    MAX_POLL_INTERVAL = 0.5
+
+    def __init__(self, patterns, window_size=DEFAULT_WINDOW_SIZE, flags=0):
+        """
+        :param patterns: pattern or list of patterns or dict of {name: pattern}, list and string patterns are named
+        by the pattern itself.
+        :param window_size: number of characters kept from previous feeds to match patterns across chunk boundaries.
+        :param flags: re flags for all the patterns.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if not isinstance(patterns, dict):
+            patterns = dict((pattern, pattern) for pattern in patterns)
+        if not patterns:
+            raise ValueError("At least one pattern is required")
+
+        self._names = list(patterns.keys())
+        self._patterns = dict((name, re.compile(pattern, flags)) for name, pattern in patterns.items())
+        self._combined = re.compile("|".join("(?P<p{}>{})".format(index, self._patterns[name].pattern)
+                                             for index, name in enumerate(self._names)), flags)
+        self._window_size = window_size
+        self._window = ""
+        self.total_size = 0
+
+    def reset(self):
+        """
+        Forget the look-behind window, e.g. before waiting for the next prompt.
+        """
+        self._window = ""
+
+    def feed(self, data):
+        """
+        Search the new data for any of the patterns.
+
+        :param data: newly received data, bytes are decoded as utf-8.
+        :return: tuple of (name, match object) of the first match in the stream, None if nothing matched. The
+        stream is consumed up to the end of the match so that the next feed finds the following occurrence.
+        """
+        if not data:
+            return None
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="ignore")
+        self.total_size += len(data)
+        buffer = self._window + data
+        match = self._combined.search(buffer)
+        if match is None:
+            self._window = buffer[-self._window_size:]
+            return None
+
+        name = self._names[int(match.lastgroup[1:])]
+        result = self._patterns[name].match(buffer, match.start())
+        self._window = buffer[match.end():][-self._window_size:]
+        return name, result
+
+    def expect(self, read_func, timeout, poll_interval=MIN_POLL_INTERVAL):
+        """
+        Read chunks with read_func and feed them until any of the patterns matches or timeout.
+
+        :param read_func: non blocking function returning the newly received data, empty if nothing arrived.
+        :param timeout: timeout in seconds.
+        :param poll_interval: initial sleep when no data arrived, doubled up to MAX_POLL_INTERVAL while idle.
+        :return: tuple of (name, match object) or None on timeout.
+        """
+        end_time = time.time() + timeout
+        interval = poll_interval
+        while time.time() < end_time:
+            data = read_func()
+            if data:
+                interval = poll_interval
+                result = self.feed(data)
+                if result:
+                    return result
+            else:
+                time.sleep(min(interval, max(end_time - time.time(), 0)))
+                interval = min(interval * 2, self.MAX_POLL_INTERVAL)
+        return None
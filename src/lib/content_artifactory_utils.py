@@ -28,7 +28,8 @@ import requests
 import six
 import platform
 
-from src.lib.tools_constants import Artifactory, ArtifactoryFolderNames
+from src.lib.tools_constants import Artifactory, ArtifactoryFolderNames, SysUser
+from src.lib.collateral_cache import CollateralCache, CollateralCacheError
 
 if six.PY2:
     from pathlib import Path
@@ -55,7 +56,18 @@ class ContentArtifactoryUtils(object):
         self._common_content_configuration = ContentConfiguration(test_log)
         self._log = test_log
         self._cfg = cfg_opts
-        pass
+        self._collateral_cache = None
+
+    @property
+    def collateral_cache(self):
+        """
+        Host side collateral cache shared by all the test runs on this host, created on first use.
+        """
+        if self._collateral_cache is None:
+            self._collateral_cache = CollateralCache(self._log, Artifactory.Host_Cache_Path[platform.system()],
+                                                     auth=(SysUser.USER, SysUser.PWD),
+                                                     max_workers=Artifactory.CACHE_MAX_PARALLEL_DOWNLOADS)
+        return self._collateral_cache
 
     def artifactory_download_tool_to_host(self, artifactory_tool_path, host_tool_path, host_tool_folder_path):
         """
@@ -66,19 +78,16 @@ class ContentArtifactoryUtils(object):
         :param host_tool_folder_path
         """
         self._log.info("Downloading the Tools from Artifactory...")
-        full_command = Artifactory.DOWNLOADING_CMD.format(artifactory_tool_path, host_tool_path)
-        self._log.info("Curl Command to copy Tools to Host- {}".format(full_command))
         try:
-            std_out = self._execute_cmd_on_host(cmd_line=full_command)
-        except Exception as exception:
-            if self.FILE_NOT_FOUND_ERROR in str(exception):
+            self.collateral_cache.fetch(Artifactory.ARTIFACTORY_URL.format(artifactory_tool_path), host_tool_path)
+        except CollateralCacheError as exception:
+            if exception.status_code == 404:
                 log_error = "Please Upload the Tools in Artifactory Under Path- '{}'".format(artifactory_tool_path)
                 self._log.error(log_error)
                 raise content_exceptions.TestSetupError(log_error)
             else:
                 raise content_exceptions.TestSetupError(exception)
 
-        self._log.info("Downloading output - {}".format(std_out))
         self._log.info("Tools got Downloaded from Artifactory to the Host path- {}".format(host_tool_folder_path))
 
     def download_tool_to_automation_tool_folder(self, tool_name, exec_env=None):
@@ -89,6 +98,52 @@ class ContentArtifactoryUtils(object):
         :param exec_env
         :return tool path
         """
+        artifactory_tool_path, host_tool_path, host_tool_folder_path = self._get_tool_paths(tool_name, exec_env)
+
+        if not os.path.isfile(host_tool_path):
+            self.artifactory_download_tool_to_host(artifactory_tool_path, host_tool_path, host_tool_folder_path)
+        else:
+            if self._common_content_configuration.artifactory_tool_overwrite():
+                self.artifactory_download_tool_to_host(artifactory_tool_path, host_tool_path, host_tool_folder_path)
+            else:
+                self._log.info("Tools Already available under the Host Folder- {}".format(host_tool_folder_path))
+        self._log.info(host_tool_path)
+        return host_tool_path.strip()
+
+    def download_tools_to_automation_tool_folder(self, tool_names, exec_env=None):
+        """
+        This method is to Download several tools from artifactory to C:\Automation\Tool concurrently.
+
+        :param tool_names: list of tool names
+        :param exec_env
+        :return list of tool paths in the order of tool_names
+        """
+        overwrite = self._common_content_configuration.artifactory_tool_overwrite()
+        host_tool_path_list = []
+        download_list = []
+        for tool_name in tool_names:
+            artifactory_tool_path, host_tool_path, host_tool_folder_path = self._get_tool_paths(tool_name, exec_env)
+            host_tool_path_list.append(host_tool_path.strip())
+            if not os.path.isfile(host_tool_path) or overwrite:
+                download_list.append((Artifactory.ARTIFACTORY_URL.format(artifactory_tool_path), host_tool_path))
+            else:
+                self._log.info("Tools Already available under the Host Folder- {}".format(host_tool_folder_path))
+
+        self._log.info("Downloading {} Tools from Artifactory...".format(len(download_list)))
+        try:
+            self.collateral_cache.fetch_many(download_list)
+        except CollateralCacheError as exception:
+            raise content_exceptions.TestSetupError(exception)
+        return host_tool_path_list
+
+    def _get_tool_paths(self, tool_name, exec_env=None):
+        """
+        This method is to get the artifactory path and the host path of the tool.
+
+        :param tool_name
+        :param exec_env
+        :return artifactory tool path, host tool path, host tool folder path
+        """
         exec_os = platform.system()
 
         try:
@@ -135,16 +190,7 @@ class ContentArtifactoryUtils(object):
             raise NotImplementedError("Not Implemented for os type- {}".format(exec_os))
 
         self._log.info("Host Tools Path to Copy {} Tools at {}".format(tool_name, host_tool_path))
-
-        if not os.path.isfile(host_tool_path):
-            self.artifactory_download_tool_to_host(artifactory_tool_path, host_tool_path, host_tool_folder_path)
-        else:
-            if self._common_content_configuration.artifactory_tool_overwrite():
-                self.artifactory_download_tool_to_host(artifactory_tool_path, host_tool_path, host_tool_folder_path)
-            else:
-                self._log.info("Tools Already available under the Host Folder- {}".format(host_tool_folder_path))
-        self._log.info(host_tool_path)
-        return host_tool_path.strip()
+        return artifactory_tool_path, host_tool_path, host_tool_folder_path
 
     def _execute_cmd_on_host(self, cmd_line, cwd=None):
         """
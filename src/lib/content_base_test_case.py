@@ -23,6 +23,8 @@
 import os
 import time
 import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from xml.etree import ElementTree
 
 from dtaf_core.lib.base_test_case import BaseTestCase
@@ -39,7 +41,7 @@ from dtaf_core.providers.silicon_reg_provider import SiliconRegProvider
 from dtaf_core.providers.silicon_debug_provider import SiliconDebugProvider
 
 
-from src.lib.bios_util import BiosUtil
+from src.lib.bios_util import BiosUtil, BiosKnobTransaction
 from src.lib.content_configuration import ContentConfiguration
 from src.lib.common_content_lib import CommonContentLib
 from src.lib import content_exceptions
@@ -60,6 +62,10 @@ class ContentBaseTestCase(BaseTestCase):
     _SERIAL_LOG_FILE = "serial_log.log"
     SV = None
     SDP = None
+    # providers created on first use, see the bios, bios_util and bios_util_pretest properties
+    _lazy_bios = None
+    _lazy_bios_util = None
+    _lazy_bios_util_pretest = None
 
     def __init__(self, test_log, arguments, cfg_opts,
                  bios_config_file_path=None):
@@ -79,11 +85,27 @@ class ContentBaseTestCase(BaseTestCase):
             self.reset_def = False if arguments.reset_defaults == "False" else True
         except AttributeError:
             self.reset_def = True
+        self._cfg_opts = cfg_opts
+        self.startup_timings = OrderedDict()
         self.sut_os_cfg = cfg_opts.find(SutOsProvider.DEFAULT_CONFIG_PATH)
-        self.os = ProviderFactory.create(self.sut_os_cfg, test_log)  # type: SutOsProvider
-
         ac_cfg = cfg_opts.find(AcPowerControlProvider.DEFAULT_CONFIG_PATH)
-        self.ac_power = ProviderFactory.create(ac_cfg, test_log)  # type: AcPowerControlProvider
+        self.cng_cfg = cfg_opts.find(ConsoleLogProvider.DEFAULT_CONFIG_PATH)
+        # initialize PHY provider for SXSTATE, USBSWITCH and CMOS clear
+        self.sut = ConfigurationHelper.get_sut_config(cfg_opts)
+
+        # the providers do not depend on each other, most of them block on the network to the BMC or the SUT
+        providers = self._create_providers_concurrently(OrderedDict([
+            ("os", lambda: ProviderFactory.create(self.sut_os_cfg, test_log)),
+            ("ac_power", lambda: ProviderFactory.create(ac_cfg, test_log)),
+            ("phy", self._create_sx_state_phy_provider),
+            ("pc_phy", self._create_post_code_phy_provider),
+            ("cng_log", lambda: ProviderFactory.create(self.cng_cfg, self._log))]))
+        self.os = providers["os"]  # type: SutOsProvider
+        self.ac_power = providers["ac_power"]  # type: AcPowerControlProvider
+        self.phy = providers["phy"]  # type: PhysicalControlProvider
+        self.pc_phy = providers["pc_phy"]  # type: PhysicalControlProvider
+        self.cng_log = providers["cng_log"]  # type: ConsoleLogProvider
+
         self._common_content_lib = CommonContentLib(self._log, self.os, cfg_opts)
         self._common_content_configuration = ContentConfiguration(self._log)
         self._artifactory_obj = ContentArtifactoryUtils(test_log, self.os, self._common_content_lib, cfg_opts)
@@ -113,36 +135,6 @@ class ContentBaseTestCase(BaseTestCase):
             self._log.error("System is not alive")
             raise content_exceptions.TestFail("System is not alive")
 
-        bios_cfg = cfg_opts.find(BiosProvider.DEFAULT_CONFIG_PATH)
-        self.bios = ProviderFactory.create(bios_cfg, test_log)  # type: BiosProvider
-
-        # initialize PHY provider for SXSTATE, USBSWITCH and CMOS clear
-        self.sut = ConfigurationHelper.get_sut_config(cfg_opts)
-
-        try:
-            id_value = '{}'.format(PhysicalProviderConstants.PHY_SX_STATE)
-            phy_cfg = ConfigurationHelper.filter_provider_config(sut=self.sut,
-                                                                 provider_name=r"physical_control",
-                                                                 attrib=dict(id=id_value))
-            phy_cfg1 = phy_cfg[0]
-            self.phy = ProviderFactory.create(phy_cfg1, test_log)  # type: PhysicalControlProvider
-        except Exception as e:
-            self._log.error("Looks like physical control provider (CMOS, SX_State) not "
-                            "supported. Error: %s", str(e))
-
-        # initialize PHY provider for POSTCODE
-        try:
-            id_value = '{}'.format(PhysicalProviderConstants.PHY_POST_CODE)
-            phy_cfg = ConfigurationHelper.filter_provider_config(sut=self.sut,
-                                                                provider_name=r"physical_control",
-                                                                attrib=dict(id=id_value))
-            phy_cfg2 = phy_cfg[0]
-            self.pc_phy = ProviderFactory.create(phy_cfg2, test_log)  # type: PhysicalControlProvider
-        except Exception as e:
-            self.pc_phy = None
-            self._log.error("Looks like physical control provider not (postcode)"
-                            "supported. Error: %s", str(e))
-
         self.log_dir = self._common_content_lib.get_log_file_dir()
 
         self._command_timeout = \
@@ -153,25 +145,13 @@ class ContentBaseTestCase(BaseTestCase):
 
         self._pretest_bios_knobs_file_path = self._common_content_configuration.get_pretest_bios_knobs_file_path()
 
-        self.bios_util = BiosUtil(cfg_opts,
-                                  bios_config_file=self.bios_config_file_path,
-                                  bios_obj=self.bios, common_content_lib=self._common_content_lib,
-                                  log=self._log)
-
-        self.bios_util_pretest = BiosUtil(cfg_opts,
-                                          bios_config_file=self._pretest_bios_knobs_file_path,
-                                          bios_obj=self.bios, common_content_lib=self._common_content_lib,
-                                          log=self._log)
-
-        self.cng_cfg = cfg_opts.find(ConsoleLogProvider.DEFAULT_CONFIG_PATH)
-        self.cng_log = ProviderFactory.create(self.cng_cfg, self._log)
-
         self.serial_log_dir = os.path.join(self.log_dir, "serial_logs")
         if not os.path.exists(self.serial_log_dir):
             os.makedirs(self.serial_log_dir)
         self.serial_log_path = os.path.join(self.serial_log_dir,
                                             self._SERIAL_LOG_FILE)
         self.cng_log.redirect(self.serial_log_path)
+        self._common_content_lib.console_log_path = self.serial_log_path
         if arguments is not None:
             self._cc_log_path = arguments.outputpath
         self._platform_type = self._common_content_lib.get_platform_type()
@@ -191,6 +171,99 @@ class ContentBaseTestCase(BaseTestCase):
                 except RuntimeError:
                     pass
 
+        self._log.info("Startup timing: {}".format(", ".join(
+            "{}={:.2f}s".format(name, seconds) for name, seconds in self.startup_timings.items())))
+
+    def _timed_startup(self, name, create):
+        """
+        Run a startup step and record its duration in startup_timings.
+
+        :param name: provider or step name
+        :param create: callable doing the step
+        :return: the result of create
+        """
+        start_time = time.time()
+        try:
+            return create()
+        finally:
+            self.startup_timings[name] = time.time() - start_time
+
+    def _create_providers_concurrently(self, creators):
+        """
+        Create independent providers in parallel threads.
+
+        :param creators: OrderedDict {provider name: callable creating the provider}
+        :return: dict {provider name: provider}
+        :raise: the exception of the first provider which failed, in the creators order
+        """
+        with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+            futures = OrderedDict((name, executor.submit(self._timed_startup, name, create))
+                                  for name, create in creators.items())
+        return dict((name, future.result()) for name, future in futures.items())
+
+    def _create_sx_state_phy_provider(self):
+        try:
+            id_value = '{}'.format(PhysicalProviderConstants.PHY_SX_STATE)
+            phy_cfg = ConfigurationHelper.filter_provider_config(sut=self.sut,
+                                                                 provider_name=r"physical_control",
+                                                                 attrib=dict(id=id_value))
+            return ProviderFactory.create(phy_cfg[0], self._log)  # type: PhysicalControlProvider
+        except Exception as e:
+            self._log.error("Looks like physical control provider (CMOS, SX_State) not "
+                            "supported. Error: %s", str(e))
+        return None
+
+    def _create_post_code_phy_provider(self):
+        try:
+            id_value = '{}'.format(PhysicalProviderConstants.PHY_POST_CODE)
+            phy_cfg = ConfigurationHelper.filter_provider_config(sut=self.sut,
+                                                                provider_name=r"physical_control",
+                                                                attrib=dict(id=id_value))
+            return ProviderFactory.create(phy_cfg[0], self._log)  # type: PhysicalControlProvider
+        except Exception as e:
+            self._log.error("Looks like physical control provider not (postcode)"
+                            "supported. Error: %s", str(e))
+        return None
+
+    @property
+    def bios(self):
+        """BIOS provider, created on first use"""
+        if self._lazy_bios is None:
+            bios_cfg = self._cfg_opts.find(BiosProvider.DEFAULT_CONFIG_PATH)
+            self._lazy_bios = self._timed_startup("bios", lambda: ProviderFactory.create(bios_cfg, self._log))
+            self._log.debug("BIOS provider created in {:.2f}s".format(self.startup_timings["bios"]))
+        return self._lazy_bios  # type: BiosProvider
+
+    @bios.setter
+    def bios(self, bios_obj):
+        self._lazy_bios = bios_obj
+
+    @property
+    def bios_util(self):
+        """BiosUtil of the test bios config file, created on first use"""
+        if self._lazy_bios_util is None:
+            self._lazy_bios_util = self._timed_startup("bios_util", lambda: BiosUtil(
+                self._cfg_opts, bios_config_file=self.bios_config_file_path, bios_obj=self.bios,
+                common_content_lib=self._common_content_lib, log=self._log))
+        return self._lazy_bios_util
+
+    @bios_util.setter
+    def bios_util(self, bios_util):
+        self._lazy_bios_util = bios_util
+
+    @property
+    def bios_util_pretest(self):
+        """BiosUtil of the pretest bios knobs file, created on first use"""
+        if self._lazy_bios_util_pretest is None:
+            self._lazy_bios_util_pretest = self._timed_startup("bios_util_pretest", lambda: BiosUtil(
+                self._cfg_opts, bios_config_file=self._pretest_bios_knobs_file_path, bios_obj=self.bios,
+                common_content_lib=self._common_content_lib, log=self._log))
+        return self._lazy_bios_util_pretest
+
+    @bios_util_pretest.setter
+    def bios_util_pretest(self, bios_util):
+        self._lazy_bios_util_pretest = bios_util
+
     def perform_graceful_g3(self):
         """Performs graceful shutdown"""
         self._log.info("Performs shutdown and boot the SUT")
@@ -216,12 +289,13 @@ class ContentBaseTestCase(BaseTestCase):
             except RuntimeError as e:
                 self._log.error("failed to clear the logs, error is %s", str(e))
 
+            boot_entry_changed = False
             if self.os.os_type.lower() == OperatingSystems.LINUX.lower():
                 self.os.execute("rm -rf /var/log/*", self._command_timeout)
                 self.os.execute("touch /var/log/messages", self._command_timeout)
                 if not self._common_content_configuration.is_container_env():
                     # To change the kernel to +server in CentOS
-                    self._grub_obj.set_default_boot_cent_os_server_kernel()
+                    boot_entry_changed = self._grub_obj.set_default_boot_cent_os_server_kernel()
 
             if self._common_content_configuration.get_telemetry_collector() and hasattr(self.telemetry_obj, "tc"):
                 today_date = datetime.date.today()
@@ -234,20 +308,21 @@ class ContentBaseTestCase(BaseTestCase):
             # bios knobs changes will be supported only for intel reference RVP platform
             if self._platform_type == PlatformType.REFERENCE:
                 # reset_def=True load bios defaults, inband cscripts is not capable of writing-only reading bios knobs
-                if self.reset_def and cscripts_debugger_interface_type != DebuggerInterfaceTypes.INBAND:
-                    if self._pretest_bios_knobs_file_path:
+                if cscripts_debugger_interface_type != DebuggerInterfaceTypes.INBAND:
+                    load_defaults = bool(self.reset_def)
+                    bios_transaction = BiosKnobTransaction(self.bios_util, self._log, load_defaults=load_defaults)
+                    if load_defaults and self._pretest_bios_knobs_file_path:
                         self._log.info("Loading bios defaults and setting pretest bios settings from {}"
                                        .format(self._pretest_bios_knobs_file_path))
-                        self.bios_util_pretest.load_bios_defaults()
-                        self.bios_util_pretest.set_bios_knob()
-                    else:
-                        self.bios_util.load_bios_defaults()
-
-                if cscripts_debugger_interface_type != DebuggerInterfaceTypes.INBAND:
+                        bios_transaction.add_config_file(self._pretest_bios_knobs_file_path)
                     if self.bios_config_file_path:
                         self._log.info("Setting required bios settings")
-                        self.bios_util.set_bios_knob()
-                    if self._platform_environment == PlatformEnvironment.SIMICS:
+                        bios_transaction.add_config_file(self.bios_config_file_path)
+
+                    bios_changed = bios_transaction.commit()
+                    if not bios_changed and not boot_entry_changed:
+                        self._log.info("Bios settings and boot entry are unchanged, skipping the reboot")
+                    elif self._platform_environment == PlatformEnvironment.SIMICS:
                         self._common_content_lib.perform_os_reboot(self.reboot_timeout)
                     else:
                         self.perform_graceful_g3()
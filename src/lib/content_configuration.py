@@ -22,6 +22,7 @@
 import os
 import platform
 import re
+import threading
 import six
 
 if six.PY2:
@@ -37,6 +38,96 @@ from src.lib import content_exceptions
 from src.lib.dtaf_content_constants import PcieSlotAttribute, RasIoConstant, PassThroughAttribute, TimeConstants
 
 
+class _ContentConfigCache(object):
+    """
+    Process wide cache of the content configuration xml files.
+
+    The src tree is walked only once per process to locate the framework configuration files, and every xml file is
+    parsed only once into a path indexed lookup which is re-used until the modification time of the file changes.
+    """
+    CONFIG_FILE_PREFIX = "content_configuration"
+
+    _lock = threading.RLock()
+    _src_config_files = None
+    _parsed_configs = {}
+
+    @classmethod
+    def find_src_config_file(cls, name_prefix, name_suffix):
+        """
+        Look up the content configuration file inside of the framework src tree.
+
+        :param name_prefix: start of the configuration file name.
+        :param name_suffix: end of the configuration file name.
+        :return: path of the last matching file in walk order, None if no file matches.
+        """
+        with cls._lock:
+            if cls._src_config_files is None:
+                src_config_files = []
+                src_path = Path(os.path.dirname(os.path.realpath(__file__))).parent
+                for root, dirs, files in os.walk(str(src_path)):
+                    for name in files:
+                        if name.startswith(cls.CONFIG_FILE_PREFIX) and name.endswith(".xml"):
+                            src_config_files.append((name, os.path.join(root, name)))
+                cls._src_config_files = src_config_files
+
+        config_file_src_path = None
+        for name, path in cls._src_config_files:
+            if name.startswith(name_prefix) and name.endswith(name_suffix):
+                config_file_src_path = path
+        return config_file_src_path
+
+    @classmethod
+    def _get_entry(cls, config_file):
+        """
+        Return the cached entry of the configuration file, parse it again if it was modified since the last parse.
+
+        :param config_file: path of the xml configuration file.
+        :return: dictionary with the mtime, xml root and the attribute lookup of the file.
+        """
+        mtime = os.path.getmtime(config_file)
+        with cls._lock:
+            entry = cls._parsed_configs.get(config_file)
+            if entry is None or entry["mtime"] != mtime:
+                tree = ElementTree.ElementTree()
+                tree.parse(config_file)
+                entry = {"mtime": mtime, "root": tree.getroot(), "lookup": {}}
+                cls._parsed_configs[config_file] = entry
+            return entry
+
+    @classmethod
+    def get_root(cls, config_file):
+        """
+        :param config_file: path of the xml configuration file.
+        :return: root element of the parsed configuration file.
+        """
+        return cls._get_entry(config_file)["root"]
+
+    @classmethod
+    def find(cls, config_file, attrib):
+        """
+        Find the element of the attribute path in the configuration file, the result is indexed by the attribute path
+        so that each attribute is searched only once per parse of the file.
+
+        :param config_file: path of the xml configuration file.
+        :param attrib: attribute path, e.g. tools/xmlcli_tool_name.
+        :return: matching element or None.
+        """
+        entry = cls._get_entry(config_file)
+        lookup = entry["lookup"]
+        if attrib not in lookup:
+            lookup[attrib] = entry["root"].find(r".//{}".format(attrib))
+        return lookup[attrib]
+
+    @classmethod
+    def clear(cls):
+        """
+        Drop the located and parsed configuration files, the next lookup walks the src tree and parses again.
+        """
+        with cls._lock:
+            cls._src_config_files = None
+            cls._parsed_configs = {}
+
+
 class ContentConfiguration(object):
     """
     To fetch the domain based configurations accordingly to the test case from the xml file to be used on
@@ -72,13 +163,8 @@ class ContentConfiguration(object):
         # Get the Automation folder config file path based on OS.
         cfg_file_automation_path = cfg_file_default[exec_os] + domain_config_name
 
-        config_file_src_path = None
-        tree = ElementTree.ElementTree()
-        config_file_path = Path(os.path.dirname(os.path.realpath(__file__))).parent
-        for root, dirs, files in os.walk(str(config_file_path)):
-            for name in files:
-                if name.startswith(domain_config_name.split(".")[0]) and name.endswith(config_end_string_check):
-                    config_file_src_path = os.path.join(root, name)
+        config_file_src_path = _ContentConfigCache.find_src_config_file(domain_config_name.split(".")[0],
+                                                                        config_end_string_check)
 
         if domain is not None:
             err_log = "Domain configuration file does not exists under C:/Automation directory or inside of " \
@@ -95,16 +181,24 @@ class ContentConfiguration(object):
             raise IOError(err_log)
         elif os.path.isfile(cfg_file_automation_path):
             self._log.info(config_found.format(cfg_file_automation_path, attrib))
-            tree.parse(cfg_file_automation_path)
-        elif config_file_src_path is None:
+            config_file = cfg_file_automation_path
+        elif config_file_src_path is None or not os.path.isfile(config_file_src_path):
             self._log.error(err_log)
             raise IOError(err_log)
-        elif os.path.isfile(config_file_src_path):
+        else:
             self._log.info(config_found.format(config_file_src_path, attrib))
-            tree.parse(config_file_src_path)
+            config_file = config_file_src_path
 
-        root = tree.getroot()
-        return root.find(r".//{}".format(attrib)).text.strip()
+        return _ContentConfigCache.find(config_file, attrib).text.strip()
+
+    @staticmethod
+    def clear_cache():
+        """
+        Function to drop the process wide cache of the parsed configuration files, configuration files are parsed
+        again on the next lookup. Modified files are re-parsed automatically, so this is only needed when new
+        configuration files are added to the src tree at run time.
+        """
+        _ContentConfigCache.clear()
 
     def get_profile0_params(self):
         """
@@ -442,27 +536,20 @@ class ContentConfiguration(object):
         # Get the Automation folder config file path based on OS.
         cfg_file_automation_path = cfg_file_default[exec_os] + "content_configuration.xml"
 
-        config_file_src_path = None
-        tree = ElementTree.ElementTree()
-        config_file_path = Path(os.path.dirname(os.path.realpath(__file__))).parent
-        for root, dirs, files in os.walk(str(config_file_path)):
-            for name in files:
-                if name.startswith("content_configuration") and name.endswith(".xml"):
-                    config_file_src_path = os.path.join(root, name)
+        config_file_src_path = _ContentConfigCache.find_src_config_file("content_configuration", ".xml")
 
         # First check whether the config file exists in C:\Automation folder else it goes to src configuration.
 
         if os.path.isfile(cfg_file_automation_path):
-            tree.parse(cfg_file_automation_path)
-        elif os.path.isfile(config_file_src_path):
-            tree.parse(config_file_src_path)
+            config_file = cfg_file_automation_path
+        elif config_file_src_path is not None and os.path.isfile(config_file_src_path):
+            config_file = config_file_src_path
         else:
             err_log = "Configuration file does not exists, please check.."
             self._log.error(err_log)
             raise IOError(err_log)
 
-        root = tree.getroot()
-        return root
+        return _ContentConfigCache.get_root(config_file)
 
     def get_dsa_device_count(self):
         """
@@ -53,17 +53,26 @@ class DmiDecodeParser(object):
         dmi_path = os.path.join(log_path_to_parse, "dmi.txt")
         if os.path.isfile(dmi_path):
             with open(dmi_path, "r") as dmi_file:
-                self.dmi_output = dmi_file.read()
-            verify_dmi = ""
-
-            instance_dmiparse = DMIParse(verify_dmi)
-            dmi_decode_from_cmd_line = instance_dmiparse.dmidecode_parse((self.dmi_output.replace("<", ""))
-                                                                         .replace(">", ""))
-            self._log.info("OS provided SMBIOS dmidecode informaton.. \n {}".format(dmi_decode_from_cmd_line))
-
-            return dmi_decode_from_cmd_line
+                return self.parse_dmidecode_output(dmi_file.read())
         else:
             err_log = "Dmi decode file '{}' does not exists, please populate the file and " \
                       "run test again..".format(dmi_path)
             self._log.error(err_log)
             raise IOError(err_log)
+
+    def parse_dmidecode_output(self, dmi_output):
+        """
+        Function to convert the dmidecode command output to a dict in memory, without the dmi.txt file round trip.
+
+        :param dmi_output: dmidecode command output
+        :return: dmidecode output as dict.
+        """
+        self.dmi_output = dmi_output.replace("\r\n", "\n")
+        verify_dmi = ""
+
+        instance_dmiparse = DMIParse(verify_dmi)
+        dmi_decode_from_cmd_line = instance_dmiparse.dmidecode_parse((self.dmi_output.replace("<", ""))
+                                                                     .replace(">", ""))
+        self._log.info("OS provided SMBIOS dmidecode informaton.. \n {}".format(dmi_decode_from_cmd_line))
+
+        return dmi_decode_from_cmd_line
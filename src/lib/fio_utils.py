@@ -20,6 +20,8 @@
 # and approved by Intel in writing.
 #################################################################################
 import re
+import json
+from collections import OrderedDict
 
 from pathlib import Path
 
@@ -325,3 +327,181 @@ class FIOCommonLib(object):
         self._common_content_lib.execute_sut_cmd(linux_fio_cmd.format(cpunodebind, membind, name, rw, filename, iodepth,bs,size,numjobs,
                                                       runtime, output), "Executing FIO Command- for {}".format(name),
                                                  self._command_timeout)
+
+
+class FioJobEngine(object):
+    """
+    Runs one fio job per device in a single fio invocation and returns structured per device results.
+
+    The job file is generated for all devices at once and fed to fio on stdin, fio reports with
+    --output-format=json+ so bandwidth, IOPS and completion latency percentiles are read from the json
+    instead of scraping the text output. In null ioengine mode no device is touched, which exercises the
+    job generation, the run and the parsing on any SUT.
+    """
+    FIO_JSON_CMD = "fio --output-format=json+ -"
+    JOB_FILE_END_MARKER = "FIO_JOB_FILE_END"
+    LSBLK_CMD = "lsblk -J -p -o NAME,TYPE,MOUNTPOINT"
+    NULL_IOENGINE = "null"
+    DEFAULT_NULL_SIZE = "1g"
+    # json sections reported per data direction
+    DIRECTIONS = ("read", "write", "trim")
+    REPORTED_PERCENTILES = ("50.000000", "90.000000", "99.000000", "99.900000", "99.990000")
+
+    def __init__(self, log, os_obj, command_timeout, common_content_lib=None):
+        """
+        :param log: log object
+        :param os_obj: sut os object
+        :param command_timeout: timeout in seconds added to the fio runtime
+        :param common_content_lib: CommonContentLib object, created if None
+        """
+        self._log = log
+        self._os = os_obj
+        self._command_timeout = command_timeout
+        self._common_content_lib = common_content_lib or CommonContentLib(self._log, self._os, None)
+
+    @staticmethod
+    def get_job_name(device):
+        """
+        :param device: device path, e.g. /dev/nvme0n1
+        :return: fio job name of the device
+        """
+        return re.sub(r"[^0-9A-Za-z_]", "_", device.strip("/"))
+
+    @classmethod
+    def build_job_file(cls, devices, rw="randrw", bs="4k", iodepth=16, numjobs=1, runtime=60, size=None,
+                       ioengine="libaio", null_ioengine=False, extra_options=None):
+        """
+        Build a fio job file with one job section per device, every section is its own reporting group.
+
+        :param devices: device or file paths
+        :param rw: fio rw mode
+        :param bs: block size
+        :param iodepth: io depth per job
+        :param numjobs: number of jobs per device
+        :param runtime: runtime in seconds, fio runs time based
+        :param size: size per job, the whole device if None
+        :param ioengine: fio ioengine
+        :param null_ioengine: True to run with the null ioengine, the devices are not accessed
+        :param extra_options: dict of additional global fio options
+        :return: job file content
+        """
+        global_options = OrderedDict([("rw", rw), ("bs", bs), ("iodepth", iodepth), ("numjobs", numjobs),
+                                      ("runtime", runtime), ("time_based", None), ("group_reporting", None)])
+        if null_ioengine:
+            global_options["ioengine"] = cls.NULL_IOENGINE
+            global_options["size"] = size or cls.DEFAULT_NULL_SIZE
+        else:
+            global_options["ioengine"] = ioengine
+            global_options["direct"] = 1
+            if size:
+                global_options["size"] = size
+        global_options.update(extra_options or {})
+
+        lines = ["[global]"]
+        lines.extend(name if value is None else "{}={}".format(name, value) for name, value in global_options.items())
+        for device in devices:
+            lines.append("")
+            lines.append("[{}]".format(cls.get_job_name(device)))
+            lines.append("new_group")
+            if not null_ioengine:
+                lines.append("filename={}".format(device))
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def parse_json_results(cls, json_output, devices):
+        """
+        Parse the fio json or json+ output into per device results.
+
+        :param json_output: fio output, text printed before the json (e.g. warnings) is skipped
+        :param devices: device paths the jobs were generated for
+        :return: OrderedDict {device: {direction: {"bw_kib": KiB/s, "iops": IOPS, "io_kib": KiB,
+                 "lat_mean_us": mean completion latency, "clat_percentiles_us": {percentile: latency}}}}
+        :raise: content_exceptions.TestFail - if the output has no fio json or a device has no job result
+        """
+        json_start = json_output.find("{")
+        if json_start < 0:
+            raise content_exceptions.TestFail("fio did not report json results: {}".format(json_output[-500:]))
+        jobs = dict((job["jobname"], job) for job in json.loads(json_output[json_start:])["jobs"])
+
+        results = OrderedDict()
+        for device in devices:
+            job = jobs.get(cls.get_job_name(device))
+            if job is None:
+                raise content_exceptions.TestFail("fio reported no result for the device {}".format(device))
+            if job.get("error"):
+                raise content_exceptions.TestFail("fio job on the device {} failed with error {}".format(
+                    device, job["error"]))
+            device_result = OrderedDict()
+            for direction in cls.DIRECTIONS:
+                stats = job.get(direction)
+                if not stats or not stats.get("io_kbytes"):
+                    continue
+                clat = stats.get("clat_ns", {})
+                percentiles = clat.get("percentile", {})
+                device_result[direction] = {
+                    "bw_kib": stats["bw"],
+                    "iops": stats["iops"],
+                    "io_kib": stats["io_kbytes"],
+                    "lat_mean_us": stats.get("lat_ns", clat).get("mean", 0) / 1000.0,
+                    "clat_percentiles_us": OrderedDict((percentile, percentiles[percentile] / 1000.0)
+                                                       for percentile in cls.REPORTED_PERCENTILES
+                                                       if percentile in percentiles)}
+            results[device] = device_result
+        return results
+
+    def run(self, devices, log_path=None, null_ioengine=False, **job_options):
+        """
+        Run fio on all devices at once.
+
+        :param devices: device or file paths on the SUT
+        :param log_path: host path to save the raw fio json output, not saved if None
+        :param null_ioengine: True to run with the null ioengine, the devices are not accessed
+        :param job_options: build_job_file options
+        :return: parse_json_results dictionary
+        :raise: content_exceptions.TestNotImplementedError - if the SUT OS is not Linux
+        """
+        if self._os.os_type != OperatingSystems.LINUX:
+            raise content_exceptions.TestNotImplementedError("fio job engine is not implemented for OS '{}'"
+                                                             .format(self._os.os_type))
+        devices = list(devices)
+        job_file = self.build_job_file(devices, null_ioengine=null_ioengine, **job_options)
+        self._log.debug("fio job file:\n{}".format(job_file))
+        cmd = "{} << '{}'\n{}{}".format(self.FIO_JSON_CMD, self.JOB_FILE_END_MARKER, job_file,
+                                        self.JOB_FILE_END_MARKER)
+        runtime = int(job_options.get("runtime", 60))
+        self._log.info("Running fio on {} device(s): {}".format(len(devices), ", ".join(devices)))
+        json_output = self._common_content_lib.execute_sut_cmd(cmd, "fio on {} devices".format(len(devices)),
+                                                               self._command_timeout + runtime)
+        if log_path:
+            with open(log_path, "w") as log_file:
+                log_file.write(json_output)
+
+        results = self.parse_json_results(json_output, devices)
+        for device, device_result in results.items():
+            self._log.info("fio {}: {}".format(device, ", ".join(
+                "{} {:.0f} KiB/s {:.0f} IOPS".format(direction, stats["bw_kib"], stats["iops"])
+                for direction, stats in device_result.items())))
+        return results
+
+    def get_free_disks(self):
+        """
+        Get the disks without partitions and mount points with one lsblk call.
+
+        :return: list of disk paths
+        """
+        lsblk_output = self._common_content_lib.execute_sut_cmd(self.LSBLK_CMD, "list block devices",
+                                                                 self._command_timeout)
+        return self.parse_free_disks(lsblk_output)
+
+    @staticmethod
+    def parse_free_disks(lsblk_json):
+        """
+        :param lsblk_json: lsblk -J -p -o NAME,TYPE,MOUNTPOINT output
+        :return: list of disk paths without partitions and mount points
+        """
+        free_disks = []
+        for device in json.loads(lsblk_json)["blockdevices"]:
+            if device.get("type") != "disk" or device.get("mountpoint") or device.get("children"):
+                continue
+            free_disks.append(device["name"])
+        return free_disks
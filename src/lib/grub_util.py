@@ -168,6 +168,8 @@ class GrubUtil(object):
     def set_default_boot_cent_os_server_kernel(self):
         """
         This function is used to set the +server kernel in Cent OS.
+
+        :return: True if the grub default boot entry was changed, a reboot is needed to boot it
         """
         linux_flavour = self._common_content_lib.get_linux_flavour()
         self._log.info("Linux Flavour is : {}".format(linux_flavour))
@@ -212,8 +214,10 @@ class GrubUtil(object):
                                                             "in OS.")
                 self._log.info("Kernel index :{}".format(index))
                 self.set_grub_boot_index(index)
+                return True
         else:
             self._log.info("Kernel change not required for OS : {}".format(linux_flavour))
+        return False
 
     def get_linux_name(self):
         """
@@ -21,9 +21,11 @@
 #################################################################################
 
 import os
+import posixpath
 import subprocess
 import sys
 import six
+import tempfile
 import time
 import threading
 import re
@@ -40,6 +42,8 @@ from dtaf_core.lib.dtaf_constants import Framework
 from dtaf_core.lib.dtaf_constants import ProductFamilies
 from dtaf_core.lib.os_lib import LinuxDistributions
 
+from src.lib.bulk_transfer import BulkTransfer
+from src.lib.collateral_manifest import CollateralManifest
 from src.lib.common_content_lib import CommonContentLib
 from src.lib.content_artifactory_utils import ContentArtifactoryUtils
 from src.lib.content_configuration import ContentConfiguration
@@ -257,6 +261,20 @@ class InstallCollateral(object):
     CXL_CV_CLI_FOLDER_PATH = "cxl_cv-0.1.0-Linux"
     CXL_CV_CLI_FILE_NAME = "CXL_CV_APP_07.tar.gz"
     WINDOWS_SYSTEM32 = "%SystemRoot%\system32"
+    # checksum manifest of the collateral deployed on the SUT, relative to the SUT home path
+    COLLATERAL_MANIFEST_FILE = ".{}.collateral.sha256"
+    COLLATERAL_MANIFEST_SEPARATOR = "----collateral manifest check----"
+    # sha256sum skips the symbolic link and directory lines of the manifest, they are checked by the loop
+    LINUX_VERIFY_COLLATERAL_CMD = "cat {0} 2>/dev/null; echo '" + COLLATERAL_MANIFEST_SEPARATOR + "'; " \
+                                  "[ -f {0} ] && sha256sum -c --quiet {0} 2>/dev/null; " \
+                                  "[ -f {0} ] && awk '{{ i = index($0, \"  \"); t = substr($0, 1, i - 1); " \
+                                  "if (i && length(t) != 64) print t \"\\t\" substr($0, i + 2) }}' {0} | " \
+                                  "while IFS=\"$(printf '\\t')\" read -r t f; do " \
+                                  "if [ \"$t\" = directory ]; then [ -d \"$f\" ] && [ ! -L \"$f\" ]; " \
+                                  "else [ -L \"$f\" ] && [ \"symlink:$(readlink \"$f\")\" = \"$t\" ]; fi " \
+                                  "|| echo \"$f: FAILED\"; done"
+    WINDOWS_VERIFY_COLLATERAL_CMD = 'if exist "{1}" type "{0}"'
+    COLLATERAL_FAILED_REGEX = r"^(.*): FAILED"
 
     def __init__(self, log, os_obj, cfg_opts):
         self._log = log
@@ -3705,31 +3723,56 @@ class InstallCollateral(object):
         sut_home_path = self._common_content_lib.get_sut_home_path()
         sut_collateral_path = Path(os.path.join(sut_home_path, collateral_name)).as_posix()
 
-        # delete the folder if already exists
-        cmd_line = "rm -rf {}".format(sut_collateral_path)
-        self._os.execute(cmd_line, self._command_timeout)
-
         archive_type = dict_collateral[CollateralConstants.TYPE]
         archive_name = dict_collateral[CollateralConstants.FILE_NAME]
-        if archive_type in dict_archive_extract_cmd:
-            # extract the folder in SUT if it is archive
-            extract_cmd = dict_archive_extract_cmd[archive_type]
-            sut_archive_file_path = Path(os.path.join(sut_home_path, archive_name)).as_posix()
-            # copy collateral to SUT
-            self._log.info("Copying from host '{}' to SUT '{}".format(host_collateral_path, sut_archive_file_path))
-            self._os.copy_local_file_to_sut(host_collateral_path, sut_archive_file_path)
-            cmd_line = extract_cmd.format(sut_archive_file_path)
-            self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout)
-            # delete the archive file, as we extracted already
-            cmd_line = "rm -f {}".format(sut_archive_file_path)
-            self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout)
-        else:
-            # nothing to extract, just create the folder and copy the file
-            cmd_line = "mkdir {}".format(sut_collateral_path)
-            self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout)
-            # copy collateral to SUT
-            sut_collateral_file_path = os.path.join(sut_collateral_path, archive_name)
-            self._os.copy_local_file_to_sut(host_collateral_path, sut_collateral_file_path)
+        # archives are extracted in the home path, other collaterals are copied in the collateral folder
+        extract = archive_type in dict_archive_extract_cmd
+        prefix = "" if extract else posixpath.join(collateral_name, archive_name)
+        host_manifest = CollateralManifest.from_host_path(host_collateral_path, prefix, extract)
+        manifest_name = self.COLLATERAL_MANIFEST_FILE.format(collateral_name)
+
+        # verify the files of the previous deployment against the manifest kept on the SUT
+        verify_output = self._os.execute(self.LINUX_VERIFY_COLLATERAL_CMD.format(manifest_name),
+                                         self._command_timeout, cwd=sut_home_path).stdout
+        sut_manifest_text, _, verify_result = verify_output.partition(self.COLLATERAL_MANIFEST_SEPARATOR)
+        sut_manifest = CollateralManifest.parse(sut_manifest_text)
+        failed_files = set(re.findall(self.COLLATERAL_FAILED_REGEX, verify_result, re.MULTILINE))
+        changed_files = host_manifest.changed_files(sut_manifest, failed_files)
+        stale_files = host_manifest.stale_files(sut_manifest)
+        changed_size = sum(host_manifest.entries[name][1] for name in changed_files)
+        saved_size = host_manifest.total_size - changed_size
+
+        if not changed_files and not stale_files:
+            self._log.info("Collateral '{}' is up to date on SUT, skipped the copy of {} files ({} bytes "
+                           "saved)".format(collateral_name, len(host_manifest.entries), saved_size))
+            return sut_collateral_path
+
+        if stale_files:
+            self._log.debug("Removing the files no more part of the collateral '{}': {}".format(collateral_name,
+                                                                                             stale_files))
+            # stale directories are removed after their files and only if empty, deepest first
+            stale_dirs = sorted((name for name in stale_files if sut_manifest.is_directory(name)), reverse=True)
+            cmd_line = "rm -f {}".format(" ".join("'{}'".format(name) for name in stale_files
+                                                  if name not in stale_dirs))
+            if stale_dirs:
+                cmd_line += "; rmdir --ignore-fail-on-non-empty {}".format(" ".join("'{}'".format(name)
+                                                                                   for name in stale_dirs))
+            self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout, sut_home_path)
+
+        self._log.info("Copying {} of {} files ({} bytes) of the collateral '{}' from host '{}' to SUT, {} unchanged "
+                       "files skipped ({} bytes saved)".format(len(changed_files), len(host_manifest.entries),
+                                                               changed_size, collateral_name, host_collateral_path,
+                                                               len(host_manifest.entries) - len(changed_files),
+                                                               saved_size))
+        temp_dir = tempfile.mkdtemp()
+        try:
+            # the changed files and the new manifest are extracted in the home path in one transfer
+            delta_archive_path = host_manifest.write_delta_archive(
+                host_collateral_path, prefix, changed_files, os.path.join(temp_dir, collateral_name + ".tgz"),
+                manifest_name, extract=extract)
+            BulkTransfer(self._log, self._os, self._command_timeout).push_archive(delta_archive_path, sut_home_path)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
         # check if copied folder exists
         cmd_line = "ls -l {}".format(sut_collateral_path)
@@ -3755,6 +3798,17 @@ class InstallCollateral(object):
         sut_home_path = self._common_content_lib.get_sut_home_path()
         sut_collateral_path = os.path.join(sut_home_path, collateral_name)
 
+        # the collateral is deployed as a whole on Windows, skipped if the SUT has the same collateral checksum
+        host_manifest = CollateralManifest.from_host_path(host_collateral_path, extract=False)
+        sut_manifest_path = os.path.join(sut_home_path, self.COLLATERAL_MANIFEST_FILE.format(collateral_name))
+        sut_manifest = CollateralManifest.parse(self._os.execute(
+            self.WINDOWS_VERIFY_COLLATERAL_CMD.format(sut_manifest_path, sut_collateral_path),
+            self._command_timeout).stdout)
+        if sut_manifest.entries and not host_manifest.changed_files(sut_manifest):
+            self._log.info("Collateral '{}' is up to date on SUT, skipped the copy ({} bytes saved)".format(
+                collateral_name, host_manifest.total_size))
+            return sut_collateral_path
+
         # delete the folder if already exists
         cmd_line = "rmdir /S /Q  {}".format(sut_collateral_path)
         self._os.execute(cmd_line, self._command_timeout)
@@ -3784,6 +3838,9 @@ class InstallCollateral(object):
         cmd_line = "dir /s {}".format(sut_collateral_path)
         self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout)
 
+        cmd_line = 'echo {}> "{}"'.format(host_manifest.dumps().strip(), sut_manifest_path)
+        self._common_content_lib.execute_sut_cmd(cmd_line, cmd_line, self._command_timeout)
+
         return sut_collateral_path
 
     def copy_collateral_to_sut(self, collateral_name):
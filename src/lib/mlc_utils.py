@@ -23,6 +23,7 @@
 import os
 import re
 import six
+from collections import OrderedDict
 
 if six.PY2:
     from pathlib import Path
@@ -30,6 +31,178 @@ if six.PY3:
     from pathlib2 import Path
 
 
+class MlcMatrix(object):
+    """
+    Node to node matrix of an MLC section, e.g. idle latency or memory bandwidth between numa nodes.
+    """
+
+    def __init__(self, title, columns):
+        """
+        :param title: title of the matrix inside of its MLC section
+        :param columns: node ids of the matrix columns
+        """
+        self.title = title
+        self.columns = columns
+        self.rows = OrderedDict()
+
+    def value(self, from_node, to_node):
+        """
+        :return: value of the from_node row and the to_node column, None for not measured ('-') values
+        """
+        return self.rows[from_node][self.columns.index(to_node)]
+
+    def __repr__(self):
+        return "MlcMatrix({!r}, {} x {})".format(self.title, len(self.rows), len(self.columns))
+
+
+class MlcLoadedLatency(object):
+    """
+    One injection delay point of the MLC loaded latency section.
+    """
+
+    def __init__(self, delay, latency, bandwidth):
+        self.delay = delay
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def __repr__(self):
+        return "MlcLoadedLatency(delay={}, latency={}, bandwidth={})".format(self.delay, self.latency,
+                                                                          self.bandwidth)
+
+
+class MlcResult(object):
+    """
+    Typed results of an MLC log, all sections and matrices for any number of numa nodes.
+    """
+    IDLE_LATENCY = "Measuring idle latencies"
+    PEAK_BANDWIDTH = "Measuring Peak Injection Memory Bandwidths"
+    MEMORY_BANDWIDTH = "Measuring Memory Bandwidths"
+    LOADED_LATENCY = "Measuring Loaded Latencies"
+    CACHE_TO_CACHE = "Measuring cache-to-cache"
+
+    def __init__(self):
+        # {section title: [MlcMatrix]} of every matrix section in the log
+        self.sections = OrderedDict()
+        self.peak_bandwidth = OrderedDict()
+        self.loaded_latency = []
+        self.hit_latency = None
+        self.hitm_latency = None
+
+    def _first_matrix(self, section_start):
+        for title, matrices in self.sections.items():
+            if title.startswith(section_start) and matrices:
+                return matrices[0]
+        return None
+
+    @property
+    def idle_latency(self):
+        return self._first_matrix(self.IDLE_LATENCY)
+
+    @property
+    def memory_bandwidth(self):
+        return self._first_matrix(self.MEMORY_BANDWIDTH)
+
+    @property
+    def cache_to_cache(self):
+        """
+        :return: remote HIT/HITM matrices of the cache-to-cache section
+        """
+        for title, matrices in self.sections.items():
+            if title.startswith(self.CACHE_TO_CACHE):
+                return matrices
+        return []
+
+
+class MlcLogParser(object):
+    """
+    Single pass parser of MLC output, reads the log line by line so that the cost is linear in the log size.
+    """
+    PEAK_BANDWIDTH_REGEX = re.compile(r"\A(ALL Reads|\d+:\d+ Reads-Writes|Stream-triad like)\s*:\s*(\S+)")
+    HIT_REGEX = re.compile(r"\ALocal Socket L2->L2 HIT\s+latency\s+(\S+)")
+    HITM_REGEX = re.compile(r"\ALocal Socket L2->L2 HITM\s+latency\s+(\S+)")
+    MATRIX_HEADER_REGEX = re.compile(r"\A\s*(Numa node|Writer Numa Node)((\s+\d+)+)\s*\Z")
+    MATRIX_ROW_REGEX = re.compile(r"\A\s*(\d+)((\s+(-|[\d.]+))+)\s*\Z")
+
+    @staticmethod
+    def _to_float(value):
+        return None if value == "-" else float(value)
+
+    def parse_lines(self, lines):
+        """
+        :param lines: iterable of MLC output lines, e.g. an open log file
+        :return: MlcResult
+        """
+        result = MlcResult()
+        section = None
+        section_kind = None
+        matrix = None
+        title = None
+        loaded_latency_data = False
+        loaded_latency = result.loaded_latency
+        for line in lines:
+            if line.startswith("Measuring"):
+                section = line.strip()
+                # the section kind is resolved once, not for every line of the section
+                section_kind = next((kind for kind in (MlcResult.PEAK_BANDWIDTH, MlcResult.LOADED_LATENCY,
+                                                       MlcResult.CACHE_TO_CACHE) if section.startswith(kind)), None)
+                result.sections[section] = []
+                matrix = None
+                title = None
+                loaded_latency_data = False
+                continue
+            if section is None:
+                continue
+
+            if loaded_latency_data:
+                # most of a log are the loaded latency points, they take the shortest path
+                fields = line.split()
+                if len(fields) == 3 and fields[0].isdigit():
+                    try:
+                        loaded_latency.append(MlcLoadedLatency(int(fields[0]), float(fields[1]), float(fields[2])))
+                        continue
+                    except ValueError:
+                        pass
+
+            header = self.MATRIX_HEADER_REGEX.match(line) if "Numa" in line else None
+            if header:
+                matrix = MlcMatrix(title or section, [int(node) for node in header.group(2).split()])
+                result.sections[section].append(matrix)
+                continue
+            if matrix is not None:
+                row = self.MATRIX_ROW_REGEX.match(line)
+                if row:
+                    matrix.rows[int(row.group(1))] = [self._to_float(value) for value in row.group(2).split()]
+                    continue
+                matrix = None
+
+            if section_kind == MlcResult.PEAK_BANDWIDTH:
+                match = self.PEAK_BANDWIDTH_REGEX.match(line)
+                if match:
+                    result.peak_bandwidth[match.group(1)] = float(match.group(2))
+            elif section_kind == MlcResult.LOADED_LATENCY:
+                if "====" in line:
+                    loaded_latency_data = True
+            elif section_kind == MlcResult.CACHE_TO_CACHE:
+                hit = self.HIT_REGEX.match(line)
+                hitm = self.HITM_REGEX.match(line)
+                if hit:
+                    result.hit_latency = float(hit.group(1))
+                elif hitm:
+                    result.hitm_latency = float(hitm.group(1))
+                elif line.strip() and not line[0].isspace():
+                    title = line.strip()
+        return result
+
+    def parse(self, log_path, encoding_type='utf-8'):
+        """
+        :param log_path: path of the MLC log file
+        :param encoding_type: encoding of the log file
+        :return: MlcResult
+        """
+        with open(log_path, 'r', encoding=encoding_type) as fp:
+            return self.parse_lines(fp)
+
+
 class MlcUtils(object):
     """
         This class contains MLC tool's utility functions which can be used across all test cases.
@@ -39,6 +212,25 @@ class MlcUtils(object):
     def __init__(self, log):
         self._log = log
 
+    def parse_mlc_log(self, log_path, encoding_type='utf-8'):
+        """
+        Parse the MLC log file in a single pass into typed results.
+
+        :param: log path, encoding type(optional param)
+        :return: MlcResult with all numa nodes and every MLC matrix section
+        """
+        return MlcLogParser().parse(log_path, encoding_type)
+
+    @staticmethod
+    def _get_node_data_set(matrix):
+        """
+        Convert the matrix to the {'Node <n>': [values]} data set, not measured values are set to 0.
+        """
+        if matrix is None:
+            return None
+        return OrderedDict(("Node {}".format(node), [0 if value is None else value for value in values])
+                           for node, values in matrix.rows.items())
+
     def generate_mlc_log_data_set(self, log_path, encoding_type='utf-8'):
         """
         Parse the MLC data log file and create data sets.
@@ -47,96 +239,18 @@ class MlcUtils(object):
         :return: Dictionaries of five filtered data set
         :raise: Exception if it occurs .
         """
-        idle_latencies_data_set = None
-        peak_memory_bw_data_set = None
-        memory_bw_between_node_data_set = None
-        loaded_latency_data_set = None
-        cache_to_cache_data_set = None
-        index_list = []
-        flag = False
         try:
-            with open(log_path, 'r', encoding=encoding_type) as fp:
-                mlc_out_list = fp.readlines()
-                # get the line indexes from the file to filter out the Data
-                for line in mlc_out_list:
-                    if re.findall("Measuring idle latencies", line):
-                        index_list.append(int(mlc_out_list.index(line)))
-                    if re.findall("Measuring Peak Injection Memory Bandwidths", line):
-                        index_list.append(int(mlc_out_list.index(line)))
-                    if re.findall("Measuring Memory Bandwidths", line):
-                        index_list.append(int(mlc_out_list.index(line)))
-                    if re.findall("Measuring Loaded Latencies", line):
-                        index_list.append(int(mlc_out_list.index(line)))
-                    if re.findall("Measuring cache-to-cache", line):
-                        index_list.append(int(mlc_out_list.index(line)))
-
-                all_reads_data = None
-                three_one_data = None
-                two_one_data = None
-                one_one_data = None
-                stream_triad_data = None
-                hit_latency = None
-                hitm_latency = None
-                latency_list = []
-                for index, line in enumerate(mlc_out_list):
-                    if index_list[0] <= index <= index_list[1]:
-                        #  Get the Idle Latency Data
-                        if self.get_numa_node_data_set(mlc_out_list, line, index):
-                            idle_latencies_data_set = self.get_numa_node_data_set(mlc_out_list, line, index)
-
-                    if index_list[1] <= index <= index_list[2]:
-                        #  Get the Peak Memory BW Data
-                        all_reads_data_match = re.findall(r"\AALL Reads.*", line)
-                        if all_reads_data_match:
-                            all_reads_data = float(all_reads_data_match[0].split(":")[1].strip("\t"))
-                        three_one_data_match = re.findall(r"\A3:1 Reads-Writes.*", line)
-                        if three_one_data_match:
-                            three_one_data = three_one_data_match[0].split(":")[2].strip("\t")
-                        two_one_data_match = re.findall(r"\A2:1 Reads-Writes.*", line)
-                        if two_one_data_match:
-                            two_one_data = float(two_one_data_match[0].split(":")[2].strip("\t"))
-                        one_one_data_match = re.findall(r"\A1:1 Reads-Writes.*", line)
-                        if one_one_data_match:
-                            one_one_data = float(one_one_data_match[0].split(":")[2].strip("\t"))
-                        stream_triad_data_match = re.findall(r"\AStream-triad like.*", line)
-                        if stream_triad_data_match:
-                            stream_triad_data = float(stream_triad_data_match[0].split(":")[1].strip("\t"))
-
-                    #  Write all the Peak Memory BW Data to the below Dictionary
-                    peak_memory_bw_data_set = {"ALL Reads": all_reads_data, "3:1 Reads-Writes": three_one_data,
-                                               "2:1 Reads-Writes": two_one_data, "1:1 Reads-Writes": one_one_data,
-                                               "Stream-triad like": stream_triad_data}
-
-                    if index_list[2] <= index <= index_list[3]:
-                        #  Get the Memory BW between nodes Data
-                        if self.get_numa_node_data_set(mlc_out_list, line, index):
-                            memory_bw_between_node_data_set = self.get_numa_node_data_set(mlc_out_list, line, index)
-
-                    if index_list[3] < index < index_list[4] - 1:
-                        #  Get the Loaded Latencies Data
-                        if flag:
-                            value = float(mlc_out_list[index].split("\t")[1])
-                            latency_list.append(value)
-                        if "====" in line:
-                            flag = True
-
-                    #  Write all the Loaded Latencies Data to the below Dictionary
-                    loaded_latency_data_set = {'Latency': latency_list}
-
-                    if index_list[4] < index:
-                        #  Get the Cache-to-cache transfer latency Data Set
-                        hit_match = re.findall(r"\ALocal Socket L2->L2 HIT\s.*", line)
-                        if hit_match:
-                            hit_latency = float(hit_match[0].split("\t")[1])
-                        hitm_match = re.findall(r"\ALocal Socket L2->L2 HITM.*", line)
-                        if hitm_match:
-                            hitm_latency = float(hitm_match[0].split("\t")[1])
-
-                    #  Write all the Loaded Latencies Data to the below Dictionary
-                    cache_to_cache_data_set = {'HIT latency': hit_latency, 'HITM latency': hitm_latency}
-
-                return idle_latencies_data_set, peak_memory_bw_data_set, memory_bw_between_node_data_set, \
-                    loaded_latency_data_set, cache_to_cache_data_set
+            mlc_result = self.parse_mlc_log(log_path, encoding_type)
+            idle_latencies_data_set = self._get_node_data_set(mlc_result.idle_latency)
+            peak_memory_bw_data_set = {key: mlc_result.peak_bandwidth.get(key) for key in
+                                       ("ALL Reads", "3:1 Reads-Writes", "2:1 Reads-Writes", "1:1 Reads-Writes",
+                                        "Stream-triad like")}
+            memory_bw_between_node_data_set = self._get_node_data_set(mlc_result.memory_bandwidth)
+            loaded_latency_data_set = {'Latency': [point.latency for point in mlc_result.loaded_latency]}
+            cache_to_cache_data_set = {'HIT latency': mlc_result.hit_latency, 'HITM latency': mlc_result.hitm_latency}
+
+            return idle_latencies_data_set, peak_memory_bw_data_set, memory_bw_between_node_data_set, \
+                loaded_latency_data_set, cache_to_cache_data_set
 
         except Exception as ex:
             self._log.error("Exception occurred while running the 'generate_mlc_log_data_set' function")
@@ -147,18 +261,16 @@ class MlcUtils(object):
         Change the node data to float values from str.
 
         :param: out data list, line , index
-        :return: idle_latencies_data_set
+        :return: idle_latencies_data_set of all the nodes of the matrix starting at index
         :raise: ex
         """
         idle_latencies_data_set = None
         try:
             numa_node_match = re.findall(r"\ANuma node", line)
             if numa_node_match:
-                node_zero_data = out_data_list[index + 1].split("\t")[1:-3]
-                node_one_data = out_data_list[index + 2].split("\t")[1:-3]
-                node_zero_data = self.get_node_data(node_zero_data)
-                node_one_data = self.get_node_data(node_one_data)
-                idle_latencies_data_set = {'Node 0': node_zero_data, 'Node 1': node_one_data}
+                mlc_result = MlcLogParser().parse_lines(["Measuring\n"] + out_data_list[index:])
+                matrices = list(mlc_result.sections.values())[0]
+                idle_latencies_data_set = self._get_node_data_set(matrices[0] if matrices else None)
 
             return idle_latencies_data_set
         except Exception as ex:
@@ -205,25 +317,14 @@ class MlcUtils(object):
                 current_loaded_latency_data, current_cache_to_cache_latency_data = self.generate_mlc_log_data_set(
                     log_file_path, encoding_type)
 
-            # Verify the Current Data set with the Template Data
-            if not self.verify_each_data(template_idle_latency_data, current_idle_latency_data, 'Node 0') and \
-                    self.verify_each_data(template_idle_latency_data, current_idle_latency_data, 'Node 1') and \
-                    self.verify_each_data(template_peak_memory_bw_data, current_peak_memory_bw_data, 'ALL Reads') and \
-                    self.verify_each_data(template_peak_memory_bw_data, current_peak_memory_bw_data,
-                                          '3:1 Reads-Writes') and \
-                    self.verify_each_data(template_peak_memory_bw_data, current_peak_memory_bw_data,
-                                          '2:1 Reads-Writes') and \
-                    self.verify_each_data(template_peak_memory_bw_data, current_peak_memory_bw_data,
-                                          '1:1 Reads-Writes') and \
-                    self.verify_each_data(template_peak_memory_bw_data, current_peak_memory_bw_data,
-                                          'Stream-triad like') and \
-                    self.verify_each_data(template_memory_bw_data, current_memory_bw_data, 'Node 0') and \
-                    self.verify_each_data(template_memory_bw_data, current_memory_bw_data, 'Node 1') and \
-                    self.verify_each_data(template_loaded_latency_data, current_loaded_latency_data, 'Latency') and \
-                    self.verify_each_data(template_cache_to_cache_latency_data, current_cache_to_cache_latency_data,
-                                          'HIT latency') and \
-                    self.verify_each_data(template_cache_to_cache_latency_data, current_cache_to_cache_latency_data,
-                                          'HITM latency'):
+            # Verify the Current Data set with the Template Data, for all the numa nodes of the template
+            data_to_verify = [(template_idle_latency_data, current_idle_latency_data),
+                              (template_peak_memory_bw_data, current_peak_memory_bw_data),
+                              (template_memory_bw_data, current_memory_bw_data),
+                              (template_loaded_latency_data, current_loaded_latency_data),
+                              (template_cache_to_cache_latency_data, current_cache_to_cache_latency_data)]
+            if not all([self.verify_each_data(template_data, current_data, key)
+                        for template_data, current_data in data_to_verify for key in template_data]):
                 self._log.error("Current MLC log Data is not matching with the Template Data")
                 raise RuntimeError("Current MLC log Data is not matching with the Template Data")
 
@@ -241,12 +342,13 @@ class MlcUtils(object):
         :return: True in Success else False
         """
         ret_val = True
+        template_values = template_data[key] if isinstance(template_data[key], list) else [template_data[key]]
+        current_values = current_data[key] if isinstance(current_data[key], list) else [current_data[key]]
         #  Making the Template Data 50% less to match the TC condition
-        template_data_list = [element * 0.5 for element in template_data[key]]
+        template_data_list = [element * 0.5 for element in template_values]
         for index in range(0, len(template_data_list)):
             #  Checking current data with the 50% of the Template Data
-            template_data_list = [element * 0.5 for element in template_data[key]]
-            if not (template_data_list[index]) <= current_data[key][index]:
+            if not (template_data_list[index]) <= current_values[index]:
                 self._log.error("Current Data is not matching with the template ")
                 ret_val = False
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class ParallelTaskResult(object):
+    """
+    Outcome of one task run by ParallelTaskRunner.
+    """
+
+    def __init__(self, name):
+        """
+        :param name: task name, e.g. the VM name
+        """
+        self.name = name
+        self.value = None
+        self.error = None
+        self.exit_code = None
+        self.start_time = None
+        self.duration = None
+        self.timed_out = False
+        self.future = None
+
+    @property
+    def ok(self):
+        """True if the task finished in time without exception and with exit code 0 if it has one"""
+        return self.duration is not None and not self.timed_out and self.error is None and not self.exit_code
+
+    def to_record(self):
+        """
+        :return: dict with the name, exit code, duration, timeout flag and error of the task
+        """
+        return OrderedDict([("name", self.name), ("exit_code", self.exit_code), ("duration", self.duration),
+                            ("timed_out", self.timed_out), ("error", None if self.error is None else str(self.error))])
+
+
+class ParallelTaskReport(object):
+    """
+    Results of a group of tasks waited for by ParallelTaskRunner, keyed by task name in submission order.
+    """
+
+    def __init__(self, results, duration):
+        """
+        :param results: list of ParallelTaskResult
+        :param duration: seconds spent waiting for the group
+        """
+        self.results = OrderedDict((result.name, result) for result in results)
+        self.duration = duration
+
+    def __getitem__(self, name):
+        return self.results[name]
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def succeeded(self):
+        """names of the tasks which finished successfully"""
+        return [name for name, result in self.results.items() if result.ok]
+
+    @property
+    def failed(self):
+        """names of the tasks which finished with an exception or a non zero exit code"""
+        return [name for name, result in self.results.items() if not result.ok and not result.timed_out]
+
+    @property
+    def timed_out(self):
+        """names of the tasks which did not finish before the deadline"""
+        return [name for name, result in self.results.items() if result.timed_out]
+
+    def values(self):
+        """
+        :return: OrderedDict {task name: return value} of the tasks which finished before the deadline
+        """
+        return OrderedDict((name, result.value) for name, result in self.results.items()
+                           if not result.timed_out and result.error is None)
+
+    def to_records(self):
+        """
+        :return: list of ParallelTaskResult.to_record dicts
+        """
+        return [result.to_record() for result in self.results.values()]
+
+    def summary(self):
+        """
+        :return: one line summary of the group
+        """
+        return "{} tasks in {:.1f}s: {} succeeded, {} failed {}, {} timed out {}".format(
+            len(self.results), self.duration, len(self.succeeded), len(self.failed), self.failed,
+            len(self.timed_out), self.timed_out)
+
+
+class ParallelTaskRunner(object):
+    """
+    Runs tasks on a bounded thread pool and waits for a group of them with one overall deadline.
+
+    Usage:
+        runner = ParallelTaskRunner(log, max_workers=8)
+        report = runner.run(OrderedDict((vm, partial(execute, vm)) for vm in vm_list), deadline=120,
+                            exit_code=lambda value: value[0])
+        report.timed_out, report["vm_1"].duration
+    """
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, log, max_workers=None):
+        """
+        :param log: log object
+        :param max_workers: number of tasks running at the same time, DEFAULT_MAX_WORKERS if None
+        """
+        self._log = log
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self._executor = None
+
+    @staticmethod
+    def _run_task(result, func, args, kwargs, exit_code):
+        result.start_time = time.time()
+        try:
+            result.value = func(*args, **kwargs)
+            if exit_code is not None:
+                result.exit_code = exit_code(result.value)
+        except Exception as ex:
+            result.error = ex
+        finally:
+            result.duration = time.time() - result.start_time
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        Queue a task, it starts as soon as a worker is free.
+
+        :param name: task name
+        :param func: callable to run
+        :param args: positional arguments of func
+        :param kwargs: keyword arguments of func, exit_code=callable(return value) sets the task exit code
+        :return: ParallelTaskResult of the task, filled in when the task is done
+        """
+        exit_code = kwargs.pop("exit_code", None)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        result = ParallelTaskResult(name)
+        result.future = self._executor.submit(self._run_task, result, func, args, kwargs, exit_code)
+        return result
+
+    def wait(self, results, deadline=None):
+        """
+        Wait for submitted tasks until all are done or the deadline expires. Tasks not started by then are
+        cancelled, running ones are reported as timed out and left to finish in the background.
+
+        :param results: ParallelTaskResult objects returned by submit
+        :param deadline: overall timeout in seconds, no limit if None
+        :return: ParallelTaskReport
+        """
+        results = list(results)
+        start_time = time.time()
+        _, not_done = wait([result.future for result in results], timeout=deadline)
+        for result in results:
+            if result.future in not_done:
+                result.future.cancel()
+                result.timed_out = True
+                if result.start_time is not None:
+                    result.duration = time.time() - result.start_time
+
+        report = ParallelTaskReport(results, time.time() - start_time)
+        for result in results:
+            if result.timed_out:
+                self._log.error("Task {} did not finish within {}s".format(result.name, deadline))
+            elif result.error is not None:
+                self._log.error("Task {} failed: {}".format(result.name, result.error))
+        self._log.info(report.summary())
+        return report
+
+    def run(self, tasks, deadline=None, exit_code=None):
+        """
+        Run a group of tasks and wait for them.
+
+        :param tasks: OrderedDict {task name: callable without arguments}
+        :param deadline: overall timeout in seconds, no limit if None
+        :param exit_code: callable(return value) giving the exit code of a task, no exit code if None
+        :return: ParallelTaskReport
+        """
+        return self.wait([self.submit(name, func, exit_code=exit_code) for name, func in tasks.items()],
+                         deadline)
+
+    def shutdown(self):
+        """
+        Stop the worker threads once the running tasks are done, a later submit starts a new pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import atexit
+import base64
+import json
+import subprocess
+import threading
+import time
+
+from six.moves import queue
+
+from src.lib import content_exceptions
+
+
+class PowerCliResult(object):
+    """
+    Result of one command executed by the PowerCLI worker.
+    """
+
+    def __init__(self, command, output, error, success):
+        self.command = command
+        self.output = output
+        self.error = error
+        self.success = success
+
+    def __repr__(self):
+        return "PowerCliResult(success={}, command={!r})".format(self.success, self.command)
+
+
+class PowerCliWorker(object):
+    """
+    Long lived PowerShell process which connects to the vCenter/ESXi server once and then executes the PowerCLI
+    commands it receives over its stdin.
+
+    Every request is one json line {"id": <n>, "commands": [<cmd>, ...]} and is answered with one line
+    REPLY_MARKER + {"id": <n>, "results": [{"output": .., "error": .., "success": ..}, ...]}, so several VM
+    operations can be sent in one round trip. All the commands run in the same PowerShell scope, variables
+    assigned by one command are visible to the following ones. Anything else the worker prints is only logged.
+
+    Workers are shared per server and credentials, use PowerCliWorker.get() instead of the constructor.
+    """
+    REPLY_MARKER = "##POWERCLI_WORKER##"
+    POWERSHELL_EXE = "C:\\WINDOWS\\system32\\WindowsPowerShell\\v1.0\\powershell.exe"
+    STARTUP_TIMEOUT = 300
+    WORKER_SCRIPT = r"""
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+function Send-PcwReply($PcwReply) {
+    [Console]::Out.WriteLine('##MARKER##' + ($PcwReply | ConvertTo-Json -Compress -Depth 4))
+    [Console]::Out.Flush()
+}
+$PcwReady = @{id = 0; results = @()}
+try {
+    Set-PowerCLIConfiguration -InvalidCertificateAction Ignore -Confirm:$false -WarningAction 0 2>$null | Out-Null
+    $Conn = Connect-VIServer -Server ##SERVER## -Protocol https -User ##USER## -Password ##PASSWORD## -Force -WarningAction 0 -ErrorAction Stop
+    $PcwReady.results = @(@{output = ''; error = ''; success = $true})
+} catch {
+    $PcwReady.results = @(@{output = ''; error = $_.Exception.Message; success = $false})
+}
+Send-PcwReply $PcwReady
+while ($null -ne ($PcwLine = [Console]::In.ReadLine())) {
+    $PcwRequest = $PcwLine | ConvertFrom-Json
+    $PcwResults = @()
+    foreach ($PcwCommand in $PcwRequest.commands) {
+        $Error.Clear()
+        try {
+            $PcwOutput = Invoke-Expression $PcwCommand | Out-String
+            $PcwErrors = ($Error | ForEach-Object { $_.ToString() }) -join "`n"
+            $PcwResults += @{output = $PcwOutput; error = $PcwErrors; success = ($Error.Count -eq 0)}
+        } catch {
+            $PcwResults += @{output = ''; error = $_.Exception.Message; success = $false}
+        }
+    }
+    Send-PcwReply @{id = $PcwRequest.id; results = $PcwResults}
+}
+Disconnect-VIServer -Server * -Force -Confirm:$false 2>$null | Out-Null
+"""
+
+    _lock = threading.Lock()
+    _workers = {}
+
+    def __init__(self, log, server, user, password, worker_cmd=None):
+        """
+        :param log: logger object
+        :param server: vCenter/ESXi server ip or host name
+        :param user: server user name
+        :param password: server password
+        :param worker_cmd: optional command line list of the worker process, by default PowerShell running
+                           WORKER_SCRIPT. Any process speaking the same line protocol can be used.
+        """
+        self._log = log
+        self.server = server
+        self.user = user
+        self._password = password
+        self._worker_cmd = worker_cmd
+        self._process = None
+        self._replies = None
+        self._request_id = 0
+        self._request_lock = threading.Lock()
+
+    @staticmethod
+    def _quote(value):
+        return "'{}'".format(str(value).replace("'", "''"))
+
+    def _get_worker_cmd(self):
+        if self._worker_cmd is not None:
+            return self._worker_cmd
+        script = self.WORKER_SCRIPT.replace("##MARKER##", self.REPLY_MARKER)
+        script = script.replace("##SERVER##", self._quote(self.server)).replace("##USER##", self._quote(self.user))
+        script = script.replace("##PASSWORD##", self._quote(self._password))
+        encoded_script = base64.b64encode(script.encode("utf-16-le")).decode()
+        return [self.POWERSHELL_EXE, "-NoLogo", "-NoProfile", "-NonInteractive", "-EncodedCommand", encoded_script]
+
+    def _read_replies(self, process, replies):
+        """
+        Reader thread, puts the reply lines of the worker into the replies queue and None once the worker exits.
+        """
+        for line in iter(process.stdout.readline, b""):
+            line = line.decode("utf-8", "replace").strip()
+            index = line.find(self.REPLY_MARKER)
+            if index == -1:
+                if line:
+                    self._log.debug("PowerCLI worker <{}>: {}".format(self.server, line))
+                continue
+            replies.put(line[index + len(self.REPLY_MARKER):])
+        replies.put(None)
+
+    def _get_reply(self, request_id, timeout):
+        end_time = time.time() + timeout
+        while True:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                self.close(force=True)
+                raise content_exceptions.TestError("PowerCLI worker of {} did not reply within {} seconds".format(
+                    self.server, timeout))
+            try:
+                line = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                self.close(force=True)
+                raise content_exceptions.TestError("PowerCLI worker of {} exited unexpectedly".format(self.server))
+            reply = json.loads(line)
+            if reply.get("id") == request_id:
+                return reply["results"]
+            # late reply of a request which timed out earlier
+            self._log.debug("Ignoring PowerCLI worker reply {}".format(reply.get("id")))
+
+    @property
+    def is_running(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """
+        Start the worker process and wait until it is connected to the server.
+
+        :raise: content_exceptions.TestSetupError if the worker could not connect to the server
+        """
+        with self._request_lock:
+            if self.is_running:
+                return
+            self._log.info("Starting PowerCLI worker for {}".format(self.server))
+            start_time = time.time()
+            self._process = subprocess.Popen(self._get_worker_cmd(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.STDOUT)
+            self._replies = queue.Queue()
+            reader = threading.Thread(target=self._read_replies, args=(self._process, self._replies))
+            reader.daemon = True
+            reader.start()
+            self._request_id = 0
+            ready = self._get_reply(0, self.STARTUP_TIMEOUT)[0]
+            if not ready["success"]:
+                self.close()
+                raise content_exceptions.TestSetupError("PowerCLI worker failed to connect to {}: {}".format(
+                    self.server, ready["error"]))
+            self._log.info("PowerCLI worker connected to {} in {:.1f} seconds".format(self.server,
+                                                                                     time.time() - start_time))
+
+    def execute_batch(self, commands, timeout=60):
+        """
+        Execute several PowerCLI commands in one round trip, the commands run one after the other in the
+        same PowerShell scope.
+
+        :param commands: list of PowerCLI command strings
+        :param timeout: time out in seconds of the whole batch, the worker is restarted on time out
+        :return: list of PowerCliResult, one per command
+        :raise: content_exceptions.TestError on time out or if the worker exited
+        """
+        if not self.is_running:
+            self.start()
+        with self._request_lock:
+            self._request_id += 1
+            request = json.dumps({"id": self._request_id, "commands": list(commands)})
+            try:
+                self._process.stdin.write((request + "\n").encode())
+                self._process.stdin.flush()
+            except (IOError, OSError) as ex:
+                self.close()
+                raise content_exceptions.TestError("Failed to send the commands to the PowerCLI worker of {}: "
+                                                   "{}".format(self.server, ex))
+            results = self._get_reply(self._request_id, timeout)
+        return [PowerCliResult(command, result.get("output") or "", result.get("error") or "",
+                               result.get("success", False)) for command, result in zip(commands, results)]
+
+    def execute(self, command, timeout=60):
+        """
+        Execute one PowerCLI command.
+
+        :param command: PowerCLI command string, may contain several statements separated by ';'
+        :param timeout: time out in seconds
+        :return: PowerCliResult
+        """
+        return self.execute_batch([command], timeout)[0]
+
+    def close(self, force=False):
+        """
+        Stop the worker process, the next command starts a new one.
+
+        :param force: kill the worker instead of letting it disconnect from the server, e.g. if it hangs
+        """
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if not force and process.poll() is None:
+                process.stdin.close()
+                process.wait(timeout=10)
+        except Exception:
+            pass
+        if process.poll() is None:
+            process.kill()
+
+    @classmethod
+    def get(cls, log, server, user, password, worker_cmd=None):
+        """
+        Return the worker shared by all the callers of the server and credentials, the worker process is started
+        by the first command.
+        """
+        key = (server, user, password)
+        with cls._lock:
+            worker = cls._workers.get(key)
+            if worker is None:
+                worker = cls(log, server, user, password, worker_cmd)
+                cls._workers[key] = worker
+            return worker
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            workers = list(cls._workers.values())
+            cls._workers.clear()
+        for worker in workers:
+            worker.close()
+
+
+atexit.register(PowerCliWorker.close_all)
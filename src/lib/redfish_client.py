@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import atexit
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from src.lib import content_exceptions
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class RedfishClient(object):
+    """
+    In process Redfish client of one BMC.
+
+    All the requests go through one requests session with a keep alive connection pool. Requests use basic
+    authentication. With use_session the client logs in to the Redfish session service once instead and sends
+    the X-Auth-Token with every request, BMCs without session service are still accessed with basic authentication.
+    Sessions save the credential check of every request and are meant for callers issuing many requests. Requests
+    failing with connection errors, and GET requests answered with a 5xx status, are retried with exponential
+    backoff. get_many() fetches several resources concurrently, bounded by max_workers.
+
+    Clients are shared per BMC and credentials, use RedfishClient.shared() to get one.
+    """
+    SESSIONS_URL = "/redfish/v1/SessionService/Sessions"
+    AUTH_TOKEN_HEADER = "X-Auth-Token"
+    RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+    _lock = threading.Lock()
+    _clients = {}
+
+    def __init__(self, log, bmc_ip, user, password, max_workers=4, retries=5, backoff=0.5, timeout=30,
+                 use_session=False):
+        """
+        :param log: logger object
+        :param bmc_ip: ip address or host name of the BMC
+        :param user: BMC user name
+        :param password: BMC password
+        :param max_workers: maximum number of concurrent requests, also the size of the connection pool
+        :param retries: number of retries of a failing request
+        :param backoff: initial backoff in seconds between the retries, doubled after every retry
+        :param timeout: connect/read timeout of the requests in seconds
+        :param use_session: log in to the Redfish session service instead of basic authentication
+        """
+        self._log = log
+        self.base_url = bmc_ip if "://" in str(bmc_ip) else "https://{}".format(bmc_ip)
+        self._user = user
+        self._password = password
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._use_session = use_session
+        self._session_url = None
+        self._login_lock = threading.Lock()
+
+        self._http = requests.Session()
+        self._http.verify = False
+        self._http.auth = (user, password)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+
+    @staticmethod
+    def build_path(path, expand=None, select=None):
+        """
+        Add the $expand and $select query parameters to the path. They are not url encoded, not all the BMCs
+        accept %24 for '$'.
+
+        :param path: Redfish resource path, e.g. /redfish/v1/Systems/system
+        :param expand: $expand value, e.g. '.' or '*($levels=1)'
+        :param select: list of the properties to select
+        :return: path with the query
+        """
+        query = []
+        if expand:
+            query.append("$expand={}".format(expand))
+        if select:
+            query.append("$select={}".format(",".join(select)))
+        if not query:
+            return path
+        return "{}{}{}".format(path, "&" if "?" in path else "?", "&".join(query))
+
+    @staticmethod
+    def load_body(body):
+        """
+        :param body: json string, also in the shell escaped form used with curl, e.g. {\\"ResetType\\": \\"On\\"}
+        :return: json object
+        """
+        try:
+            return json.loads(body)
+        except ValueError:
+            return json.loads(body.replace('\\"', '"'))
+
+    def _login(self):
+        """
+        Create a Redfish session, falls back to basic authentication if the BMC has no session service.
+        """
+        with self._login_lock:
+            if not self._use_session or self.AUTH_TOKEN_HEADER in self._http.headers:
+                return
+            try:
+                response = self._http.post(self.base_url + self.SESSIONS_URL, auth=None, timeout=self.timeout,
+                                           json={"UserName": self._user, "Password": self._password})
+            except requests.RequestException as ex:
+                self._log.debug("Redfish session login to {} failed: {}".format(self.base_url, ex))
+                return
+            token = response.headers.get(self.AUTH_TOKEN_HEADER)
+            if response.status_code not in (200, 201) or not token:
+                self._log.info("Redfish session service of {} not available (status {}), using basic "
+                               "authentication".format(self.base_url, response.status_code))
+                self._use_session = False
+                return
+            self._http.headers[self.AUTH_TOKEN_HEADER] = token
+            self._http.auth = None
+            location = response.headers.get("Location") or response.json().get("@odata.id")
+            if location:
+                self._session_url = location if "://" in location else self.base_url + location
+            self._log.debug("Created Redfish session {}".format(self._session_url))
+
+    def _drop_session(self):
+        with self._login_lock:
+            self._http.headers.pop(self.AUTH_TOKEN_HEADER, None)
+            self._http.auth = (self._user, self._password)
+            self._session_url = None
+
+    def request(self, method, path, body=None, data=None, expand=None, select=None):
+        """
+        Send one Redfish request.
+
+        :param method: http method, e.g. 'GET', 'POST', 'PATCH'
+        :param path: Redfish resource path
+        :param body: json body object, or json string
+        :param data: raw body, e.g. an open firmware image file
+        :param expand: $expand value
+        :param select: list of the properties to $select
+        :return: requests.Response, also for 4xx/5xx statuses
+        :raise: content_exceptions.TestError if the BMC is not reachable after all the retries
+        """
+        self._login()
+        url = self.base_url + self.build_path(path, expand, select)
+        if isinstance(body, str):
+            body = self.load_body(body)
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._http.request(method, url, json=body, data=data, timeout=self.timeout)
+            except requests.RequestException as ex:
+                if attempt == self.retries or (data is not None and hasattr(data, "read")):
+                    raise content_exceptions.TestError("Redfish {} {} failed: {}".format(method, url, ex))
+                self._log.debug("Redfish {} {} failed: {}, retrying in {} seconds".format(method, url, ex, delay))
+            else:
+                if response.status_code == 401 and self.AUTH_TOKEN_HEADER in self._http.headers:
+                    # session expired or BMC rebooted, log in again
+                    self._drop_session()
+                    self._login()
+                    continue
+                if method != "GET" or response.status_code not in self.RETRY_STATUS_CODES or \
+                        attempt == self.retries:
+                    return response
+                self._log.debug("Redfish {} {} returned {}, retrying in {} seconds".format(
+                    method, url, response.status_code, delay))
+            time.sleep(delay)
+            delay *= 2
+        return response
+
+    def _json(self, response):
+        if not response.ok:
+            raise content_exceptions.TestError("Redfish {} {} failed with status {}: {}".format(
+                response.request.method, response.url, response.status_code, response.text))
+        return response.json() if response.content else {}
+
+    def get(self, path, expand=None, select=None):
+        """
+        :return: json object of the resource
+        :raise: content_exceptions.TestError on http errors
+        """
+        return self._json(self.request("GET", path, expand=expand, select=select))
+
+    def post(self, path, body=None, data=None):
+        """
+        :return: json object of the response, empty dict for empty responses
+        :raise: content_exceptions.TestError on http errors
+        """
+        return self._json(self.request("POST", path, body=body, data=data))
+
+    def patch(self, path, body):
+        """
+        :return: json object of the response, empty dict for empty responses
+        :raise: content_exceptions.TestError on http errors
+        """
+        return self._json(self.request("PATCH", path, body=body))
+
+    def curl_request(self, method, path, body=None, include_headers=False):
+        """
+        Send the request and return the response like the curl command used to: the raw response body, prefixed with
+        the status line and the headers if include_headers (curl -i). Http error statuses are not raised.
+
+        :return: response bytes
+        :raise: RuntimeError if the BMC is not reachable
+        """
+        try:
+            response = self.request(method, path, body=body or None)
+        except content_exceptions.TestError as ex:
+            self._log.error(str(ex))
+            raise RuntimeError(str(ex))
+        self._log.debug("Redfish {} {} returned {}".format(method, path, response.status_code))
+        if not include_headers:
+            return response.content
+        headers = "".join("{}: {}\r\n".format(name, value) for name, value in response.headers.items())
+        status_line = "HTTP/1.1 {} {}\r\n".format(response.status_code, response.reason)
+        return (status_line + headers + "\r\n").encode() + response.content
+
+    def get_many(self, paths, expand=None, select=None):
+        """
+        Fetch several resources concurrently, at most max_workers requests are in flight.
+
+        :param paths: Redfish resource paths
+        :return: OrderedDict {path: json object} in the order of the paths
+        """
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(paths)))) as executor:
+            resources = executor.map(lambda path: self.get(path, expand, select), paths)
+            return OrderedDict(zip(paths, resources))
+
+    def get_members(self, collection_path, select=None):
+        """
+        Get all the members of a collection, e.g. the SEL entries or the firmware inventory. Uses $expand and falls
+        back to fetching the members concurrently if the BMC does not expand the collection.
+
+        :param collection_path: path of the Redfish collection
+        :param select: list of the properties to $select of each member
+        :return: list of the member json objects
+        """
+        collection = self.get(collection_path, expand=".")
+        members = collection.get("Members", [])
+        not_expanded = [member["@odata.id"] for member in members if set(member) == {"@odata.id"}]
+        if not not_expanded:
+            return members
+        resources = self.get_many(not_expanded, select=select)
+        return [resources.get(member.get("@odata.id"), member) for member in members]
+
+    def close(self):
+        """
+        Delete the Redfish session and close the pooled connections.
+        """
+        session_url = self._session_url
+        if session_url:
+            try:
+                self._http.delete(session_url, timeout=self.timeout)
+            except requests.RequestException:
+                pass
+        self._drop_session()
+        self._http.close()
+
+    @classmethod
+    def shared(cls, log, bmc_ip, user, password, use_session=False):
+        """
+        Return the client shared by all the callers of the BMC, credentials and authentication method.
+        """
+        key = (bmc_ip, user, password, use_session)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = cls(log, bmc_ip, user, password, use_session=use_session)
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            client.close()
+
+
+atexit.register(RedfishClient.close_all)
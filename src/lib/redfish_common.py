@@ -19,7 +19,6 @@
 # press and approved by Intel in writing.
 
 import os
-import subprocess
 import socket
 import platform
 from configobj import ConfigObj
@@ -28,31 +27,28 @@ import xmltodict
 
 from dtaf_core.lib.dtaf_constants import Framework
 import src.lib.content_exceptions as content_exceptions
+from src.lib.redfish_client import RedfishClient
 
 
 class RedFishCommon(object):
     """
     This class implements common RedFish functions which can be used across all test cases.
     """
-    _CURL_POST_OPTIONS = " -X POST -H \"Content-Type: application/json\" -d \""
-    _CURL_POST_WITHOUT_BODY = " -X POST"
-    _CURL_PATCH_OPTION = " -X PATCH -H \"Content-Type: application/json\" -d \""
-
     BMC_CFG_OPTS = 'suts/sut/silicon/bmc'
     BMC_CFG_NAME = "bmc"
     BMC_CRED = "credentials"
     BMC_IPV4 = "ipv4"
     BMC_USER = "@user"
     BMC_PWD = "@password"
-    LOOP_COUNT = 5
 
-    def __init__(self, test_log, cfg_opts):
+    def __init__(self, test_log, cfg_opts, use_session=False):
         """
         Create an instance of RedFishCommon
 
         :param test_log: Log object
         :param arguments: None
         :param cfg_opts: Configuration Object of provider
+        :param use_session: True to use a Redfish session instead of basic authentication
         """
         super(RedFishCommon, self).__init__()
         self._log = test_log
@@ -77,8 +73,8 @@ class RedFishCommon(object):
             raise ex
 
         self._log.info("Found BMC IP: " + self.bmc_ip)
-        self._base_url = " https://" + str(self.bmc_ip)
-        self.curl_base_command = "curl -u {}:{} -k --insecure ".format(self.bmc_debug_user, self.bmc_password)
+        self.redfish_client = RedfishClient.shared(self._log, self.bmc_ip, self.bmc_debug_user, self.bmc_password,
+                                                   use_session)
 
     def populate_bmc_details(self):
         host_name = socket.gethostname()
@@ -118,83 +114,35 @@ class RedFishCommon(object):
 
     def curl_get(self, url_string):
         """
-        This method executes the get requests of Redfish APIs using curl command and returns the Output string
+        This method executes the get requests of Redfish APIs and returns the Output string
 
         :returns: output json response from API.
         """
-        curl_command = self.curl_base_command + self._base_url + str(url_string)
-        self._log.info("Execute the curl command : {}".format(curl_command))
-
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "Curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("Curl command error log = '{}".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("Curl command '{}' executed successfully...".format(curl_command))
-            self._log.debug("---------curl command result start----------")
-            self._log.debug(str(result.stdout.decode('utf-8').strip("\r\n")))
-            self._log.debug("---------curl command result end------------")
-
-        return result.stdout
+        self._log.info("Execute the Redfish GET : {}".format(url_string))
+        result = self.redfish_client.curl_request("GET", str(url_string))
+        self._log.debug("---------Redfish GET result start----------")
+        self._log.debug(str(result.decode('utf-8').strip("\r\n")))
+        self._log.debug("---------Redfish GET result end------------")
+        return result
 
     def curl_post(self, url_string, request_body=""):
         """
-        This method executes post Redfish APIs using curl command and returns the Output string
+        This method executes post Redfish APIs and returns the Output string
 
         :returns: output json response from API.
         """
-        if request_body:
-            curl_command = self.curl_base_command + self._base_url + str(url_string) + self._CURL_POST_OPTIONS + \
-                       str(request_body)
-        else:
-            curl_command = self.curl_base_command + self._base_url + str(url_string) + self._CURL_POST_WITHOUT_BODY
-
-        self._log.info("Execute the curl command : {}".format(curl_command))
-
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "Curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("StdError='{}'".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("The curl command '{}' executed successfully..".format(curl_command))
-            self._log.info("Curl command result = " + str(result.stdout.decode('utf-8').strip("\r\n")))
-
-        return result.stdout
+        self._log.info("Execute the Redfish POST : {} {}".format(url_string, request_body))
+        result = self.redfish_client.curl_request("POST", str(url_string), request_body)
+        self._log.info("Redfish POST result = " + str(result.decode('utf-8').strip("\r\n")))
+        return result
 
     def curl_patch(self, url_string, request_body=""):
         """
-        This method executes Patch Redfish APIs using curl command and returns the Output string
+        This method executes Patch Redfish APIs and returns the Output string including the response headers
 
         :returns: output json response from API.
         """
-        curl_command = self.curl_base_command + " -i " +  self._base_url + str(url_string) + self._CURL_PATCH_OPTION + \
-                       str(request_body)
-        self._log.info("Execute the curl command : {}".format(curl_command))
-
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "The curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("StdOut='{}'".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("The curl command '{}' executed successfully.".format(curl_command))
-            self._log.info("The Curl command result = " + str(result.stdout.decode('utf-8').strip("\r\n")))
-
-        return result.stdout
+        self._log.info("Execute the Redfish PATCH : {} {}".format(url_string, request_body))
+        result = self.redfish_client.curl_request("PATCH", str(url_string), request_body, include_headers=True)
+        self._log.info("The Redfish PATCH result = " + str(result.decode('utf-8').strip("\r\n")))
+        return result
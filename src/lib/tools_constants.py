@@ -82,8 +82,16 @@ class Artifactory:
             ArtifactoryFolderNames.UEFI: "/opt/Automation/Tools/{}/Uefi/{}"
         }
     }
+    ARTIFACTORY_URL = "https://ubit-artifactory-ba.intel.com/artifactory/list/dcg-dea-srvplat-local/{}"
     CURL_CMD = f"curl -f -u {SysUser.USER}:{SysUser.PWD} "
-    DOWNLOADING_CMD = CURL_CMD + r" -X GET https://ubit-artifactory-ba.intel.com/artifactory/list/dcg-dea-srvplat-local/{} --output {}"
+    DOWNLOADING_CMD = CURL_CMD + r" -X GET " + ARTIFACTORY_URL + " --output {}"
+
+    # Content addressed collateral cache shared by all test runs on the host
+    Host_Cache_Path = {
+        HostOs.Windows: "C:\\Automation\\Tools\\.collateral_cache",
+        HostOs.Linux: "/opt/Automation/Tools/.collateral_cache"
+    }
+    CACHE_MAX_PARALLEL_DOWNLOADS = 4
 
 
 class ArtifactoryTools:
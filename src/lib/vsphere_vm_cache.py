@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import threading
+
+
+class VsphereVmCache(object):
+    """
+    Cache of the VirtualMachine properties of a vCenter/ESXi server, filled by one property collector retrieval
+    and then kept up to date incrementally.
+
+    The cache owns a dedicated property collector with one filter over a recursive container view of all the VMs.
+    The first refresh returns the full content, every following refresh is a non blocking WaitForUpdatesEx call
+    with the last data version which only returns the VMs created, removed or changed since then. Queries refresh
+    the cache first, so a poll loop costs one small round trip instead of a walk over the whole inventory.
+    """
+    PROPERTIES = ["name", "runtime.powerState", "guest.toolsStatus", "guest.ipAddress", "guest.net",
+                  "config.hardware.memoryMB", "snapshot"]
+    REMOVE_OPS = ("remove", "indirectRemove")
+
+    def __init__(self, service_instance, properties=None, log=None):
+        """
+        :param service_instance: connected pyVmomi ServiceInstance
+        :param properties: VM property paths to collect, PROPERTIES by default
+        :param log: optional logger object
+        """
+        self._service_instance = service_instance
+        self.properties = list(properties or self.PROPERTIES)
+        self._log = log
+        self._lock = threading.RLock()
+        self._collector = None
+        self._view = None
+        self._filter = None
+        self._wait_options = None
+        self._version = None
+        self._vms = {}
+        self._names = {}
+
+    @staticmethod
+    def _get_moid(obj):
+        return getattr(obj, "_moId", None) or str(obj)
+
+    def _create_filter(self):
+        from pyVmomi import vim, vmodl
+
+        content = self._service_instance.RetrieveContent()
+        self._collector = content.propertyCollector.CreatePropertyCollector()
+        self._view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
+
+        traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(name="traverseEntities", path="view", skip=False,
+                                                                     type=vim.view.ContainerView)
+        obj_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=self._view, skip=True, selectSet=[traversal_spec])
+        property_spec = vmodl.query.PropertyCollector.PropertySpec(type=vim.VirtualMachine, pathSet=self.properties)
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=[obj_spec], propSet=[property_spec])
+        self._filter = self._collector.CreateFilter(filter_spec, True)
+        self._wait_options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=0)
+        self._version = ""
+
+    def _apply_object_update(self, object_update):
+        moid = self._get_moid(object_update.obj)
+        if object_update.kind == "leave":
+            vm = self._vms.pop(moid, None)
+            if vm is not None and self._names.get(vm.get("name")) == moid:
+                del self._names[vm["name"]]
+            return
+
+        vm = self._vms.setdefault(moid, {"obj": object_update.obj})
+        old_name = vm.get("name")
+        for change in object_update.changeSet or []:
+            if change.op in self.REMOVE_OPS:
+                vm.pop(change.name, None)
+            else:
+                vm[change.name] = change.val
+        if vm.get("name") != old_name:
+            if self._names.get(old_name) == moid:
+                del self._names[old_name]
+            if vm.get("name") is not None:
+                self._names[vm["name"]] = moid
+
+    def refresh(self):
+        """
+        Fetch the changes since the last refresh, the full content on the first call.
+
+        :return: number of VM updates applied
+        """
+        with self._lock:
+            if self._filter is None:
+                self._create_filter()
+            count = 0
+            while True:
+                update_set = self._collector.WaitForUpdatesEx(self._version, self._wait_options)
+                if update_set is None:
+                    break
+                for filter_update in update_set.filterSet or []:
+                    for object_update in filter_update.objectSet or []:
+                        self._apply_object_update(object_update)
+                        count += 1
+                self._version = update_set.version
+                # a truncated update set is continued by the next call with the new version
+                if not getattr(update_set, "truncated", False):
+                    break
+            if count and self._log is not None:
+                self._log.debug("VM cache applied {} updates, {} VMs cached".format(count, len(self._vms)))
+            return count
+
+    def get_vm_names(self):
+        """
+        :return: list of the names of all the VMs
+        """
+        with self._lock:
+            self.refresh()
+            return list(self._names)
+
+    def get_vm(self, vm_name):
+        """
+        :param vm_name: name of the VM
+        :return: the vim.VirtualMachine managed object or None if no VM has this name
+        """
+        with self._lock:
+            self.refresh()
+            moid = self._names.get(vm_name)
+            return None if moid is None else self._vms[moid]["obj"]
+
+    def get_property(self, vm_name, path, default=None):
+        """
+        :param vm_name: name of the VM
+        :param path: collected property path, e.g. 'runtime.powerState'
+        :param default: value returned if the property is not set
+        :return: the cached property value
+        :raise: RuntimeError if no VM has this name
+        """
+        with self._lock:
+            self.refresh()
+            moid = self._names.get(vm_name)
+            if moid is None:
+                raise RuntimeError("Managed Object " + vm_name + " not found.")
+            return self._vms[moid].get(path, default)
+
+    def close(self):
+        """
+        Destroy the property filter, the container view and the property collector of the cache.
+        """
+        with self._lock:
+            for obj in (self._filter, self._view, self._collector):
+                if obj is None:
+                    continue
+                try:
+                    obj.Destroy()
+                except Exception:
+                    pass
+            self._filter = self._view = self._collector = None
+            self._version = None
+            self._vms.clear()
+            self._names.clear()
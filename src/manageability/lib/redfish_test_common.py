@@ -23,9 +23,9 @@ import os
 import re
 import sys
 import time
-from ast import literal_eval
 
 from src.lib import redfish_common, content_exceptions
+from src.lib.redfish_client import RedfishClient
 from src.lib.content_base_test_case import ContentBaseTestCase
 from src.lib.install_collateral import InstallCollateral
 
@@ -40,7 +40,6 @@ class RedFishTestCommon(ContentBaseTestCase):
     _REDFISH_SYSTEM_URL = "/redfish/v1/Systems/system"
     _REDFISH_SYSTEM_RESET_URL = "/redfish/v1/Systems/system/Actions/ComputerSystem.Reset"
     _REDFISH_UPDATE_FIRMWARE_URL = "/redfish/v1/UpdateService"
-    _REDFISH_FILE_UPLOAD_CMD = " --data-binary @{}"
     _REDFISH_GRACEFULSHUTDOWN_JSON = r"{\"ResetType\": \"GracefulShutdown\"}"
     _REDFISH_GRACEFUL_RESTART_JSON = r"{\"ResetType\": \"GracefulRestart\"}"
     _REDFISH_FORCEOFF_JSON = r"{\"ResetType\": \"ForceOff\"}"
@@ -104,20 +103,29 @@ class RedFishTestCommon(ContentBaseTestCase):
         :returns : boolean
         """
         ret_value = True
-        json_response_data = self._redfish_obj.curl_get(self._REDFISH_BASIC_URL)
-        if self._REDFISH_AUTHENTICATION_URL not in str(json_response_data):
-            log_error = "Error - Redfish URL : {} is not Correct - {}".format(self._REDFISH_BASIC_URL,
-                                                                              json_response_data)
-            self._log.error(log_error)
-            raise RuntimeError(log_error)
-        self._log.info("Successfully tested the Redfish API without Errors!")
-
-        json_response_data = self._redfish_obj.curl_get(self._REDFISH_AUTHENTICATION_URL)
-        if self._REDFISH_SYSTEM_URL not in str(json_response_data):
-            log_error = "Error - Redfish URL : {} is not Correct - {}".format(self._REDFISH_AUTHENTICATION_URL,
-                                                                              json_response_data)
-            self._log.error(log_error)
-            raise RuntimeError(log_error)
+        # own client without Redfish session, every request is sent with the basic authentication header
+        basic_auth_client = RedfishClient(self._log, self._redfish_obj.bmc_ip, self._redfish_obj.bmc_debug_user,
+                                          self._redfish_obj.bmc_password, use_session=False)
+        try:
+            self._log.info("Execute the Redfish GET with basic authentication: {}".format(self._REDFISH_BASIC_URL))
+            json_response_data = basic_auth_client.curl_request("GET", self._REDFISH_BASIC_URL)
+            if self._REDFISH_AUTHENTICATION_URL not in str(json_response_data):
+                log_error = "Error - Redfish URL : {} is not Correct - {}".format(self._REDFISH_BASIC_URL,
+                                                                                  json_response_data)
+                self._log.error(log_error)
+                raise RuntimeError(log_error)
+            self._log.info("Successfully tested the Redfish API without Errors!")
+
+            self._log.info("Execute the Redfish GET with basic authentication: {}".format(
+                self._REDFISH_AUTHENTICATION_URL))
+            json_response_data = basic_auth_client.curl_request("GET", self._REDFISH_AUTHENTICATION_URL)
+            if self._REDFISH_SYSTEM_URL not in str(json_response_data):
+                log_error = "Error - Redfish URL : {} is not Correct - {}".format(self._REDFISH_AUTHENTICATION_URL,
+                                                                                  json_response_data)
+                self._log.error(log_error)
+                raise RuntimeError(log_error)
+        finally:
+            basic_auth_client.close()
         self._log.info("Successfully tested the Redfish API for Basic Authentication without Errors!")
         return ret_value
 
@@ -128,10 +136,12 @@ class RedFishTestCommon(ContentBaseTestCase):
         :returns : boolean
         """
         ret_value = True
-        json_response_data = self._redfish_obj.curl_get(self._REDFISH_SEL_ENTRIES_URL)
-        sel_entries_dict = literal_eval(json_response_data.decode('utf8').strip("\r\n"))
+        # one request per SEL entry, a Redfish session saves the credential check of each of them
+        sel_client = RedfishClient.shared(self._log, self._redfish_obj.bmc_ip, self._redfish_obj.bmc_debug_user,
+                                          self._redfish_obj.bmc_password, use_session=True)
+        sel_entries = sel_client.get_members(self._REDFISH_SEL_ENTRIES_URL)
         self._log.info("check the SEL for any unexpected events!")
-        for each_sel_entry in sel_entries_dict[self._SEL_KEY_MEMBERS]:
+        for each_sel_entry in sel_entries:
             if each_sel_entry:
                 if str(datetime.datetime.now().date()) == each_sel_entry[self._SEL_KEY_CREATED].split("T")[0]:
                     if each_sel_entry[self._SEL_KEY_SEVERITY] == self._SEL_SEVERITY_CRITICAL:
@@ -337,8 +347,9 @@ class RedFishTestCommon(ContentBaseTestCase):
             raise content_exceptions.TestError(log_error)
         self._log.info("Successfully tested the Redfish firmware update API for Basic Authentication without Errors!")
 
-        curl_command = self._REDFISH_UPDATE_FIRMWARE_URL+ self._REDFISH_FILE_UPLOAD_CMD.format(bmc_fw_path)
-        json_response_data = self._redfish_obj.curl_post(curl_command)
+        with open(bmc_fw_path, "rb") as bmc_fw_image:
+            json_response_data = self._redfish_obj.redfish_client.request(
+                "POST", self._REDFISH_UPDATE_FIRMWARE_URL, data=bmc_fw_image).content
         if self._FIRMWARE_UPDATE_TASK_STATUS not in str(json_response_data):
             log_error = "Error - Redfish URL : {} is not Correct - {}".format(self._REDFISH_SYSTEM_RESET_URL,
                                                                               json_response_data)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+import json
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dtaf_core.lib.tklib.basic.const import SUT_PLATFORM
+from dtaf_core.lib.tklib.basic.log import logger
+from src.network.lib.utility import execute_host_cmd
+
+
+class IperfStreamResult(object):
+    """
+    Result of one iperf3 client process, parsed from its --json output
+    """
+
+    def __init__(self, port, data):
+        self.port = port
+        self.error = data.get('error')
+        end = data.get('end', {})
+        sum_sent = end.get('sum_sent', {})
+        sum_received = end.get('sum_received', {})
+        cpu = end.get('cpu_utilization_percent', {})
+        self.sent_bytes = sum_sent.get('bytes', 0)
+        self.received_bytes = sum_received.get('bytes', 0)
+        self.sent_bps = sum_sent.get('bits_per_second', 0.0)
+        self.received_bps = sum_received.get('bits_per_second', 0.0)
+        self.retransmits = sum_sent.get('retransmits', 0)
+        self.seconds = sum_received.get('seconds', sum_sent.get('seconds', 0.0))
+        self.host_cpu = cpu.get('host_total', 0.0)
+        self.remote_cpu = cpu.get('remote_total', 0.0)
+        self.parallel = len(end.get('streams', []))
+
+    def __repr__(self):
+        return f'port={self.port} received={self.received_bps / 1e9:.2f}Gbps sent={self.sent_bps / 1e9:.2f}Gbps ' \
+               f'retransmits={self.retransmits} host_cpu={self.host_cpu:.1f}% remote_cpu={self.remote_cpu:.1f}%'
+
+
+class IperfResult(object):
+    """
+    Aggregated result of all iperf3 client processes of one connection
+    """
+
+    def __init__(self, streams, elapsed):
+        self.streams = streams
+        self.elapsed = elapsed
+
+    @property
+    def errors(self):
+        return [f'port {s.port}: {s.error}' for s in self.streams if s.error]
+
+    @property
+    def received_bps(self):
+        return sum(s.received_bps for s in self.streams)
+
+    @property
+    def sent_bps(self):
+        return sum(s.sent_bps for s in self.streams)
+
+    @property
+    def received_gbps(self):
+        return self.received_bps / 1e9
+
+    @property
+    def retransmits(self):
+        return sum(s.retransmits for s in self.streams)
+
+    @property
+    def host_cpu(self):
+        return max([s.host_cpu for s in self.streams] or [0.0])
+
+    @property
+    def remote_cpu(self):
+        return max([s.remote_cpu for s in self.streams] or [0.0])
+
+    def __repr__(self):
+        return f'{len(self.streams)} processes in {self.elapsed:.1f}s: received={self.received_gbps:.2f}Gbps ' \
+               f'retransmits={self.retransmits} host_cpu={self.host_cpu:.1f}% remote_cpu={self.remote_cpu:.1f}%'
+
+
+class LocalHost(object):
+    """
+    Minimal sut-like wrapper of the host itself, used by the loopback mode of Iperf3Engine
+    """
+    SUT_PLATFORM = SUT_PLATFORM.WINDOWS if platform.system() == 'Windows' else SUT_PLATFORM.LINUX
+
+    @staticmethod
+    def execute_shell_cmd(cmd, timeout=30, cwd=None):
+        return execute_host_cmd(cmd, timeout, cwd)
+
+
+class Iperf3Engine(object):
+    """
+    Run several iperf3 client/server pairs concurrently and collect the --json results
+
+    All servers are started with one command on the server sut (--one-off, so they exit after their client),
+    all clients are started with one blocking command on the client sut which returns as soon as every client
+    has finished, and the json reports are returned in the output of the same command. No fixed sleep and no
+    log folder download is needed.
+    """
+    DEFAULT_BASE_PORT = 5201
+    START_TIMEOUT = 60
+    FINISH_MARGIN = 60
+    REPORT_MARKER = '##### iperf3 report port '
+
+    def __init__(self, server_sut, client_sut, server_ip, cmd_linux='iperf3', cmd_windows=None, work_dir=None):
+        """
+        Args:
+            server_sut: sut running the iperf3 servers
+            client_sut: sut running the iperf3 clients
+            server_ip: ip address of the server port under test
+            cmd_linux: iperf3 command on linux
+            cmd_windows: iperf3.exe path on windows
+            work_dir: folder for the json reports on the client sut
+        """
+        self.server_sut = server_sut
+        self.client_sut = client_sut
+        self.server_ip = server_ip
+        self.cmd_linux = cmd_linux
+        self.cmd_windows = cmd_windows or 'iperf3.exe'
+        self.work_dir = work_dir
+
+    @classmethod
+    def loopback(cls, cmd_linux='iperf3', cmd_windows=None):
+        """
+        Engine running servers and clients on the host itself over 127.0.0.1, to check the tooling without a SUT
+        """
+        return cls(LocalHost, LocalHost, '127.0.0.1', cmd_linux, cmd_windows)
+
+    def _cmd(self, sut):
+        return self.cmd_windows if sut.SUT_PLATFORM == SUT_PLATFORM.WINDOWS else self.cmd_linux
+
+    def kill_servers(self):
+        if self.server_sut.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
+            self.server_sut.execute_shell_cmd('taskkill /F /IM iperf3.exe', 30)
+        else:
+            self.server_sut.execute_shell_cmd('kill -9 $(pidof iperf3) 2>/dev/null', 30)
+
+    def start_servers(self, ports):
+        cmd = self._cmd(self.server_sut)
+        if self.server_sut.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
+            start = '; '.join(f"Start-Process -WindowStyle Hidden -FilePath '{cmd}' -ArgumentList '-s -1 -p {port}'"
+                              for port in ports)
+            server_cmd = f'PowerShell -Command "& {{{start}}}"'
+        else:
+            server_cmd = ' && '.join(f'{cmd} -s -1 -D -p {port}' for port in ports)
+        exit_code, _, stderr = self.server_sut.execute_shell_cmd(server_cmd, self.START_TIMEOUT)
+        if exit_code != 0:
+            raise RuntimeError(f'failed to start iperf3 servers on ports {ports}: {stderr}')
+
+    def _client_cmd(self, ports, duration, parallel, proto):
+        cmd = self._cmd(self.client_sut)
+        udp = ' -u -b 0' if proto == 'udp' else ''
+        args = f'-c {self.server_ip} -t {duration} -P {parallel}{udp} -J'
+        if self.client_sut.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
+            work_dir = self.work_dir or '$env:TEMP'
+            start = '; '.join(f"$p{port} = Start-Process -PassThru -WindowStyle Hidden -FilePath '{cmd}' "
+                              f"-ArgumentList '{args} -p {port}' "
+                              f"-RedirectStandardOutput {work_dir}\\iperf3_client_{port}.json" for port in ports)
+            wait = ', '.join(f'$p{port}' for port in ports)
+            report = '; '.join(f"Write-Output '{self.REPORT_MARKER}{port}'; "
+                               f"Get-Content {work_dir}\\iperf3_client_{port}.json" for port in ports)
+            return f'PowerShell -Command "& {{{start}; Wait-Process -InputObject {wait}; {report}}}"'
+
+        work_dir = self.work_dir or '/tmp'
+        start = ' '.join(f'{cmd} {args} -p {port} > {work_dir}/iperf3_client_{port}.json 2>&1 &' for port in ports)
+        report = '; '.join(f"echo '{self.REPORT_MARKER}{port}'; cat {work_dir}/iperf3_client_{port}.json"
+                           for port in ports)
+        return f'{start} wait; {report}'
+
+    @classmethod
+    def parse_reports(cls, output):
+        """
+        Split the combined client output into per-port json reports
+
+        Returns:
+            list of IperfStreamResult
+        """
+        streams = []
+        for chunk in output.split(cls.REPORT_MARKER)[1:]:
+            port, _, report = chunk.partition('\n')
+            try:
+                data = json.loads(report)
+            except ValueError:
+                data = {'error': f'invalid iperf3 json report: {report.strip()[:200]}'}
+            streams.append(IperfStreamResult(int(port.strip()), data))
+        return streams
+
+    def run(self, duration, processes=4, parallel=1, proto='tcp', base_port=DEFAULT_BASE_PORT):
+        """
+        Run processes iperf3 client/server pairs with parallel streams each, all at the same time
+
+        Args:
+            duration: transfer time, unit is second
+            processes: number of iperf3 client/server pairs
+            parallel: number of streams of each client (-P)
+            proto: tcp/udp
+            base_port: first server port, the pairs use base_port .. base_port + processes - 1
+
+        Returns:
+            IperfResult
+
+        Raises:
+            RuntimeError: If any client reports an error
+        """
+        ports = [base_port + i for i in range(processes)]
+        start = time.time()
+        self.start_servers(ports)
+        client_cmd = self._client_cmd(ports, duration, parallel, proto)
+        logger.info(f'-----------run {processes} iperf3 clients x {parallel} streams to {self.server_ip}-----------')
+        _, stdout, stderr = self.client_sut.execute_shell_cmd(client_cmd, duration + self.FINISH_MARGIN)
+        result = IperfResult(self.parse_reports(stdout), time.time() - start)
+        if len(result.streams) != processes:
+            raise RuntimeError(f'expected {processes} iperf3 reports, got {len(result.streams)}: {stderr}')
+        if result.errors:
+            raise RuntimeError(f'iperf3 failed: {result.errors}')
+        for stream in result.streams:
+            logger.debug(f'iperf3 {stream}')
+        logger.info(f'iperf3 result to {self.server_ip}: {result}')
+        return result
+
+
+def run_concurrently(engines, duration, processes=4, parallel=1, proto='tcp'):
+    """
+    Run the engines of several connections at the same time, each with its own port range
+
+    Returns:
+        list of IperfResult in the order of engines
+    """
+    if not engines:
+        return []
+    with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+        futures = [executor.submit(engine.run, duration, processes, parallel, proto,
+                                   Iperf3Engine.DEFAULT_BASE_PORT + index * processes)
+                   for index, engine in enumerate(engines)]
+    return [future.result() for future in futures]
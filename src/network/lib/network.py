@@ -10,6 +10,7 @@ from dtaf_core.lib.tklib.basic.testcase import Case
 from dtaf_core.lib.tklib.basic.log import logger
 from dtaf_core.lib.tklib.basic.config import LOG_PATH
 from src.network.lib.config import *
+from src.network.lib.iperf import Iperf3Engine, run_concurrently
 from dtaf_core.lib.tklib.steps_lib.os_scene import Linux, Windows, OperationSystem
 from dtaf_core.lib.tklib.steps_lib.uefi_scene import UefiShell
 from dtaf_core.lib.tklib.basic.utility import ParameterParser
@@ -619,7 +620,8 @@ class GenericNicOp(object):
     def iperf_stress(cls, duration, proto='tcp', *conn):
         """
         Run iperf stress with duration seconds, and check results meet connection requirements
-        Recommend to use script on SUT OS for completing this
+        All client/server pairs of all connections run at the same time, the call returns as soon as every iperf3
+        client has reported completion, throughput is taken from the iperf3 --json reports
         Need to run 4 iperf threads for getting the correct tcp throughput (especially for high speed/rate connection)
 
         Args:
@@ -628,163 +630,50 @@ class GenericNicOp(object):
             *conn: interface.NicPortConnection object
 
         Returns:
-            None
+            list of iperf.IperfResult, one per connection
 
         Raises:
             RuntimeError: If any errors
         """
         MAX_PROCESS_NUM = 4
-        DEFAULT_PORT_NO = 5201
-        IPERF2_PROCESS_MIN = 14
-        IPERF2_PROCESS_MAX = 30
+        # windows tcp stack needs more streams to reach the line rate, replaces the former iperf2 -P 14..30 sweep
+        WINDOWS_STREAM_NUM = 4
 
         if proto != 'tcp':
             raise RuntimeError('iperf_stress only support tcp test')
 
+        engines = []
+        parallel = 1
         for conn_inst in conn:
             port1 = conn_inst.port1
             port2 = conn_inst.port2
             sut1 = port1.sut
             sut2 = port2.sut
+            if SUT_PLATFORM.WINDOWS in (sut1.SUT_PLATFORM, sut2.SUT_PLATFORM):
+                parallel = WINDOWS_STREAM_NUM
+            engines.append(Iperf3Engine(sut1, sut2, port1.ip, cmd_windows=f'{cls.tool_path}\\iperf3\\iperf3.exe'))
 
-            log_folder_name = 'iperf_test'
-            if sut2.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
-                remote_folder_path = cls.tool_path + '\\iperf2\\' + log_folder_name
-                cmd = f'{cls.tool_path}\\iperf2\\iperf2.exe'
-            else:
-                remote_folder_path = cls.tool_path + '/' + log_folder_name
-                cmd = 'iperf3'
+        logger.info(f'-----------kill all iperf3 server process-----------')
+        killed = set()
+        for engine in engines:
+            if id(engine.server_sut) not in killed:
+                engine.kill_servers()
+                killed.add(id(engine.server_sut))
 
-            logger.info(f'-----------kill all iperf2 server process on sut1-----------')
-            if sut1.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
-                _, stdout, _ = sut1.execute_shell_cmd('tasklist /FI \"IMAGENAME eq iperf.exe\"', 30)
-                if 'iperf.exe' in stdout:
-                    sut1.execute_shell_cmd('taskkill /F /IM iperf.exe', 30)
-            else:
-                _, stdout, _ = sut1.execute_shell_cmd(f'ps -e | grep iperf3', 30)
-                if stdout != '':
-                    sut1.execute_shell_cmd('kill -9 $(pidof iperf3)')
-
-            # create new log folder for running iperf3 in sut
-            exit_code, stdout, stderr = sut1.execute_shell_cmd(f'mkdir {remote_folder_path}')
-            if exit_code == 1 and 'exist' in stderr:
-                OperationSystem[sut1.SUT_PLATFORM].remove_folder(sut1, remote_folder_path)
-                sut1.execute_shell_cmd(f'mkdir {remote_folder_path}')
-            exit_code, stdout, stderr = sut2.execute_shell_cmd(f'mkdir {remote_folder_path}')
-            if exit_code == 1 and 'exist' in stderr:
-                OperationSystem[sut2.SUT_PLATFORM].remove_folder(sut2, remote_folder_path)
-                sut2.execute_shell_cmd(f'mkdir {remote_folder_path}')
+        results = run_concurrently(engines, duration, MAX_PROCESS_NUM, parallel, proto)
 
-            if sut1.SUT_PLATFORM == SUT_PLATFORM.WINDOWS:
-                for i in range(IPERF2_PROCESS_MIN, IPERF2_PROCESS_MAX):
-                    logger.info(f'-----------start iperf2 server on sut1-----------')
-                    port_no = DEFAULT_PORT_NO
-                    log_file = f'{remote_folder_path}\\server_{port_no}_{i}.txt'
-                    sut1.execute_shell_cmd_async(f'{cmd} -s  -p {port_no} -P {i}> {log_file}')
-                    logger.info('-----------start iperf2 client on sut2-----------')
-                    log_file = f'{remote_folder_path}\\client_{port_no}_{i}.txt'
-                    sut2.execute_shell_cmd_async(f'{cmd} -c {port1.ip} -p {port_no} -t {duration} -P {i}> {log_file}')
-
-                    if duration >= 60 * 5:
-                        sleep_time = duration + 90
-                    else:
-                        sleep_time = duration * 1.2
-                    logger.info(f'-----------sleep {sleep_time} sec to wait for iperf2 finish transfer-----------')
-                    time.sleep(sleep_time)
-
-                    # download log file to check result
-                    sut1.download_to_local(remote_folder_path, LOG_PATH)
-                    sut2.download_to_local(remote_folder_path, LOG_PATH)
-
-                    # calc sum of transfer and bandwith
-                    transfer = 0
-                    bandwidth = 0
-                    for root, dirs, files in os.walk(os.path.join(LOG_PATH, log_folder_name)):
-                        for file in files:
-                            if file.startswith('client_{}_{}'.format(port_no, i)) and file.endswith('.txt'):
-                                log_file = os.path.join(root, file)
-                                with open(log_file, 'r') as fs:
-                                    data = fs.read()
-                                    receiver_str = re.search(r'.*SUM.*sec(.*/sec)', data).group(1)
-                                    receiver_data = re.split(r'\s+', receiver_str.strip())
-                                    transfer = float(receiver_data[0])
-                                    bandwidth = float(receiver_data[2])
-
-                    transfer_unit = receiver_data[1]
-                    bandwidth_unit = receiver_data[3]
-
-                    logger.debug(f'iperf total transfer = {transfer} {transfer_unit}')
-                    logger.debug(f'iperf total bandwidth = {bandwidth} {bandwidth_unit}')
-
-                    # convert data to unified unit
-                #    transfer = cls.__iperf3_data_conversion(transfer, transfer_unit[0], bandwidth_unit[0])
-                    logger.debug(f'iperf2 port num = {i} bandwidth = {bandwidth}')
-                    if bandwidth > port1.nic.type.rate * 0.8:
-                        break
-
-                if bandwidth > port1.nic.type.rate * 0.8:
-                    logger.info(
-                        f'test iperf2 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} pass')
-                else:
-                    raise RuntimeError(
-                        f'test iperf2 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} fail')
-
-            #LINUX
+        for conn_inst, result in zip(conn, results):
+            port1 = conn_inst.port1
+            port2 = conn_inst.port2
+            logger.debug(f'iperf total bandwidth = {result.received_gbps} Gbits/sec, '
+                         f'retransmits = {result.retransmits}')
+            if result.received_gbps > port1.nic.type.rate * 0.8:
+                logger.info(
+                    f'test iperf3 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} pass')
             else:
-                if sut1.SUT_PLATFORM == SUT_PLATFORM.LINUX:
-                    for i in range(MAX_PROCESS_NUM):
-                        port_no = DEFAULT_PORT_NO + i
-                        log_file = f'{remote_folder_path}/server_{port_no}.txt'
-                        sut1.execute_shell_cmd_async(f'{cmd} -s --one-off -p {port_no} > {log_file}')
-                if sut2.SUT_PLATFORM == SUT_PLATFORM.LINUX:
-                    for i in range(MAX_PROCESS_NUM):
-                        port_no = DEFAULT_PORT_NO + i
-                        log_file = f'{remote_folder_path}/client_{port_no}.txt'
-                        sut2.execute_shell_cmd_async(f'{cmd} -c {port1.ip} -p {port_no} -t {duration} > {log_file}')
-                # wait for iperf3 finish transfer
-                if duration >= 60 * 5:
-                    sleep_time = duration + 90
-                else:
-                    sleep_time = duration * 1.2
-                logger.info(f'-----------sleep {sleep_time} sec to wait for iperf3 finish transfer-----------')
-                time.sleep(sleep_time)
-
-                # download log file to check result
-                sut1.download_to_local(remote_folder_path, LOG_PATH)
-                sut2.download_to_local(remote_folder_path, LOG_PATH)
-
-                # calc sum of transfer and bandwith
-                transfer = 0
-                bandwidth = 0
-                for root, dirs, files in os.walk(os.path.join(LOG_PATH, log_folder_name)):
-                    for file in files:
-                        if file.startswith('client_') and file.endswith('.txt'):
-                            log_file = os.path.join(root, file)
-                            with open(log_file, 'r') as fs:
-                                data = fs.read()
-                                receiver_str = re.search(r'.*sec(.*/sec).*receiver', data).group(1)
-                                receiver_data = re.split(r'\s+', receiver_str.strip())
-                                transfer += float(receiver_data[0])
-                                bandwidth += float(receiver_data[2])
-
-                transfer_unit = receiver_data[1]
-                bandwidth_unit = receiver_data[3]
-
-                logger.debug(f'iperf total transfer = {transfer} {transfer_unit}')
-                logger.debug(f'iperf total bandwidth = {bandwidth} {bandwidth_unit}')
-
-                # convert data to unified unit
-            #    transfer = cls.__iperf3_data_conversion(transfer, transfer_unit[0], bandwidth_unit[0])
-
-                logger.debug(f'check transfer > bandwidth / 8 * duration * 0.8 with unit {bandwidth_unit[0]}Bytes')
-
-                if bandwidth > port1.nic.type.rate * 0.8:
-                #if transfer > bandwidth / 8 * duration * 0.8:
-                    logger.info(
-                        f'test iperf3 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} pass')
-                else:
-                    raise RuntimeError(
-                        f'test iperf3 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} fail')
+                raise RuntimeError(
+                    f'test iperf3 stress from {port1.nic.type.family} with {port1.ip} to {port2.nic.type.family} with {port2.ip} fail')
+        return results
 
     @classmethod
     def __iperf3_data_conversion(cls, number, old_unit, new_unit):
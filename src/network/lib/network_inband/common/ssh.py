@@ -8,7 +8,10 @@ import os
 import traceback
 import getpass
 import stat
+import select
 import socket
+import threading
+import atexit
 import time
 
 from src.network.inband.common.log import log
@@ -29,6 +32,121 @@ class Result:
     stderr = ''
 
 
+class CommandStats(object):
+    """
+    Latency statistics of the commands executed over one pooled connection
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        self.min = latency if self.min is None else min(self.min, latency)
+        self.max = latency if self.max is None else max(self.max, latency)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return 'count=%s, mean=%.3fs, min=%.3fs, max=%.3fs' % (self.count, self.mean, self.min or 0.0,
+                                                                self.max or 0.0)
+
+
+class SSHConnectionPool(object):
+    """
+    Process wide pool of ssh connections keyed by host and credentials.
+
+    All SSHClient objects talking to the same host with the same credentials share one paramiko transport,
+    every command runs in its own channel so that commands from different threads run concurrently over
+    the same connection. Idle connections are kept open until close_all() or process exit.
+    """
+    _lock = threading.Lock()
+    _clients = {}
+    _stats = {}
+
+    @staticmethod
+    def key(hostname, port, username, password):
+        return hostname, int(port), username, password
+
+    @classmethod
+    def get(cls, key):
+        """
+        Return the pooled paramiko client of the key if its transport is still active, else None
+        """
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                return None
+            transport = client.get_transport()
+            if transport is None or not transport.is_active():
+                cls._clients.pop(key, None)
+                try:
+                    client.close()
+                except:
+                    pass
+                return None
+            return client
+
+    @classmethod
+    def put(cls, key, client):
+        """
+        Add a connected paramiko client to the pool, return the client which is pooled for the key
+        """
+        with cls._lock:
+            pooled = cls._clients.get(key)
+            if pooled is not None and pooled.get_transport() is not None and pooled.get_transport().is_active():
+                # another thread connected meanwhile, share its connection
+                try:
+                    client.close()
+                except:
+                    pass
+                return pooled
+            cls._clients[key] = client
+            return client
+
+    @classmethod
+    def discard(cls, key):
+        with cls._lock:
+            client = cls._clients.pop(key, None)
+        if client:
+            try:
+                client.close()
+            except:
+                pass
+
+    @classmethod
+    def record(cls, key, latency):
+        with cls._lock:
+            cls._stats.setdefault(key[:3], CommandStats()).add(latency)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return {(hostname, port, username): CommandStats}
+        """
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except:
+                pass
+
+
+atexit.register(SSHConnectionPool.close_all)
+
+
 class SSHClient(object):
     def __init__(self,
                  hostname=None,
@@ -86,28 +204,40 @@ class SSHClient(object):
     def localhost(self):
         return socket.gethostname()
 
+    @property
+    def pool_key(self):
+        return SSHConnectionPool.key(self.hostname, self.port, self.username, self.password)
+
     def connect(self, timeout=CONNECT_TIMEOUT):
+        """
+        Connect to the remote system, an active pooled connection of the same host and credentials is reused
+        """
+        self.client = SSHConnectionPool.get(self.pool_key)
+        if self.client:
+            log.info('***** Reusing connection to <%s> ...' % self.hostname)
+            return True
+
         try:
-            self.client = paramiko.SSHClient()
-            self.client.load_system_host_keys()
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
             # Set policy to use when connecting to servers without a known host key
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
             log.info('***** Connecting <%s> ...' % self.hostname)
             try:
                 if not USEGSSAPI or (not USEGSSAPI and not DOGSSAPIKEYEXCHANGE):
-                    self.client.connect(self.hostname,
-                                        self.port,
-                                        self.username,
-                                        self.password,
-                                        timeout=timeout)
+                    client.connect(self.hostname,
+                                   self.port,
+                                   self.username,
+                                   self.password,
+                                   timeout=timeout)
                 else:
-                    self.client.connect(self.hostname,
-                                        self.port,
-                                        self.username,
-                                        gss_auth=USEGSSAPI,
-                                        gss_kex=DOGSSAPIKEYEXCHANGE,
-                                        timeout=timeout)
+                    client.connect(self.hostname,
+                                   self.port,
+                                   self.username,
+                                   gss_auth=USEGSSAPI,
+                                   gss_kex=DOGSSAPIKEYEXCHANGE,
+                                   timeout=timeout)
             except Exception as ex:
                 log.error('##### Exception: %s: %s' % (ex.__class__, ex))
                 traceback.print_exc()
@@ -118,46 +248,81 @@ class SSHClient(object):
             log.error('##### Exception: %s: %s' % (ex.__class__, ex))
             traceback.print_exc()
             try:
-                self.client.close()
+                client.close()
             except:
                 pass
             return False
+        self.client = SSHConnectionPool.put(self.pool_key, client)
         return True
 
+    def is_connected(self):
+        """
+        Return True if the client holds a connection with an active transport
+        """
+        if not self.client:
+            return False
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
     def execute(self, cmd, timeout=EXEC_TIMEOUT):
         """
         Return (exit-code, stdout-str, stderr-str)
         """
         log.info('[%s@%s]# %s' % (self.username, self.hostname, cmd))
 
-        chan = self.client.get_transport().open_session()
-        chan.exec_command(cmd)
-
-        now = time.time()
-        while time.time() - now < timeout:
-            if chan.recv_ready():
-                out = chan.recv(1024).decode()
-                sys.stdout.write(out)
-                self.result.stdout += out
-            if chan.recv_stderr_ready():
-                err = chan.recv_stderr(1024).decode()
-                sys.stderr.write(err)
-                self.result.stderr += err
-            if chan.exit_status_ready():
-                self.result.exitcode = chan.recv_exit_status()
-                break
-        else:
-            log.error(f'timeout happened within: {timeout}s')
-            self.result.returncode = -sys.maxsize - 2
+        if not self.is_connected() and not self.connect():
+            raise RuntimeError('failed to connect to <%s>' % self.hostname)
 
+        self.result = Result()
+        start = time.time()
+        chan = self.client.get_transport().open_session()
+        try:
+            chan.exec_command(cmd)
+
+            # block on the channel until data or exit status arrives instead of polling
+            while True:
+                if chan.recv_ready():
+                    out = chan.recv(65536).decode(errors='ignore')
+                    sys.stdout.write(out)
+                    self.result.stdout += out
+                elif chan.recv_stderr_ready():
+                    err = chan.recv_stderr(65536).decode(errors='ignore')
+                    sys.stderr.write(err)
+                    self.result.stderr += err
+                elif chan.exit_status_ready():
+                    self.result.exitcode = chan.recv_exit_status()
+                    break
+                elif chan.closed:
+                    log.error('channel closed without exit status')
+                    break
+                else:
+                    remaining = timeout - (time.time() - start)
+                    if remaining <= 0:
+                        log.error(f'timeout happened within: {timeout}s')
+                        self.result.exitcode = self.result.returncode = -sys.maxsize - 2
+                        break
+                    select.select([chan], [], [], remaining)
+        finally:
+            chan.close()
+
+        latency = time.time() - start
+        SSHConnectionPool.record(self.pool_key, latency)
+        log.debug('[%s@%s] command finished in %.3fs' % (self.username, self.hostname, latency))
         return self.result
 
-    def disconnect(self):
-        if self.client:
-            try:
-                self.client.close()
-            except:
-                pass
+    def latency_stats(self):
+        """
+        Return the CommandStats of all commands executed to this host with these credentials
+        """
+        return SSHConnectionPool.stats().get(self.pool_key[:3], CommandStats())
+
+    def disconnect(self, close=False):
+        """
+        Release the connection, the pooled connection stays open for other clients unless close is True
+        """
+        if self.client and close:
+            SSHConnectionPool.discard(self.pool_key)
+        self.client = None
 
     def sftp(self, localpath=None, remotepath=None, upload=True, sync=False):
         """
@@ -292,6 +457,9 @@ class SSHClient(object):
             return True
 
         # Main flow
+        if not self.is_connected() and not self.connect():
+            log.error('##### failed to connect to <%s>' % self.hostname)
+            return False
         try:
             _sftp = paramiko.SFTPClient.from_transport(self.client.get_transport())
             _upload(localpath, remotepath) if upload else _download(localpath, remotepath)
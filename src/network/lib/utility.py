@@ -1,5 +1,4 @@
 import subprocess
-import datetime
 import os
 import re
 import threading
@@ -15,6 +14,8 @@ from dtaf_core.lib.tklib.basic.log import LogAll, get_com_logger
 from dtaf_core.lib.tklib.basic.utility import remove_terminal_sequences, get_tag_value
 from dtaf_core.lib.tklib.infra.logs.dtaf_log import dtaf_logger
 
+from src.lib.console_pattern_matcher import StreamPatternMatcher
+
 
 def gen_wait_and_expect_func(sleep_time, func,  *args):
     ret = func(*args)
@@ -132,6 +133,7 @@ class BaseConsoleLogProvider2(ConsoleLogProvider):
     """
     Base Class that record all output data into log file.
     """
+    LOG_THREAD_IDLE_SLEEP = 0.05
 
     def __init__(self, console_log_cfg, name):
         """
@@ -217,23 +219,22 @@ class BaseConsoleLogProvider2(ConsoleLogProvider):
     def _log_thread(self):
         self._logline = ''
         while True:
+            data = self.serial.read_from(self.buffer_name)
+            if not data:
+                # sleep outside of the lock so that writers and other threads are not starved
+                time.sleep(self.LOG_THREAD_IDLE_SLEEP)
+                continue
             self.lock.acquire()
             try:
-                data = self.serial.read_from(self.buffer_name)
-                if not data:
-                    # sleep(): release GIL so that it can be used for other threads
-                    time.sleep(0)
-                    continue
-                else:
-                    self._logline += data
-                    if not self.console_log.closed:
-                        if '\n' in self._logline:
-                            dl = self._logline.split('\n')
-                            for i in range(len(dl) - 1):
-                                self.console_logger.info(remove_terminal_sequences(dl[i]) + '\n')
-                                self.console_log.write(remove_terminal_sequences(dl[i]) + '\n')
-                            self.console_log.flush()
-                            self._logline = dl[-1]
+                self._logline += data
+                if not self.console_log.closed:
+                    if '\n' in self._logline:
+                        dl = self._logline.split('\n')
+                        for i in range(len(dl) - 1):
+                            self.console_logger.info(remove_terminal_sequences(dl[i]) + '\n')
+                            self.console_log.write(remove_terminal_sequences(dl[i]) + '\n')
+                        self.console_log.flush()
+                        self._logline = dl[-1]
             finally:
                 self.lock.release()
 
@@ -306,13 +307,7 @@ class BaseConsoleLogProvider2(ConsoleLogProvider):
                 self.serial.register(self.keyword_buffer, self.buffer_size)
         finally:
             self.runtime_lock.release()
-        start_time = datetime.datetime.now()
-        data = ''
-        while (datetime.datetime.now() - start_time).seconds < timeout:
-            content = self.serial.search_data(self.keyword_buffer)
-            data += content
-            if re.search(pattern, data):
-                return True
-        return False
+        matcher = StreamPatternMatcher(pattern)
+        return matcher.expect(lambda: self.serial.search_data(self.keyword_buffer), timeout) is not None
 
 
@@ -671,6 +671,7 @@ class PcieCommon(ContentBaseTestCase):
         """
         device_info_list = []
         self._log.info("PCIe Device details from Config: {}".format(pcie_slot_device_list))
+        self._pcie_provider.refresh_pcie_snapshot()
         for each_slot in pcie_slot_device_list:
             slot_name = each_slot[PcieSlotAttribute.SLOT_NAME]
             self._log.info("PCIe Slot Name: {}".format(slot_name))
@@ -794,6 +795,7 @@ class PcieCommon(ContentBaseTestCase):
         """
         device_info_list = []
         self._log.info("PCIe Device details from Config: {}".format(pcie_slot_device_list))
+        self._pcie_provider.refresh_pcie_snapshot()
         for each_slot in pcie_slot_device_list:
             slot_name = each_slot[PcieSlotAttribute.SLOT_NAME]
             self._log.info("PCIe Slot Name: {}".format(slot_name))
@@ -948,6 +950,7 @@ class PcieCommon(ContentBaseTestCase):
                                                           positive_link_width_only=True)[protocol]
         self._log.info("PCIe dict info from SLS- {}".format(slot_dict))
         ret_val = False
+        self._pcie_provider.refresh_pcie_snapshot()
         for each_socket, each_socket_dict in slot_dict.items():
             for each_port, each_port_dict in each_socket_dict.items():
                 ret_val = True
@@ -1235,6 +1238,8 @@ class PcieCommon(ContentBaseTestCase):
                                                          silicon_reg_provider_obj=self.reg_provider_obj)[protocol]
 
         ret_val = False
+        # one pcie topology capture for all the ports, verify_link_speed and verify_link_width read from it
+        self._pcie_provider.refresh_pcie_snapshot()
         for each_socket, pcie_ports_dict in pcie_dict.items():
             for each_port, device_details_dict in pcie_ports_dict.items():
                 if device_details_dict['speed'] == gen:
@@ -19,9 +19,10 @@
 # otherwise. Any license under such intellectual property rights must be express
 # and approved by Intel in writing.
 ##########################################################################
+import csv
+import glob
 import os
-import pandas as pd
-from sqlalchemy import create_engine
+import threading
 import six
 if six.PY2:
     from pathlib import Path
@@ -30,6 +31,81 @@ if six.PY3:
 import configparser
 from src.pnp.lib.pnp_constants import ClusteringMode, Config, Filename
 
+
+class _TestcaseConfigIndex(object):
+    """
+    Process wide index of the PnP testcase config csv files.
+
+    All the csv files of the pnp config folder are read once into dictionaries keyed by testcase and by parent
+    testcase, a file is read again only when its modification time changes.
+    """
+    _lock = threading.RLock()
+    _indexes = {}
+    _all_indexed = False
+
+    @staticmethod
+    def _convert_column(values):
+        """
+        Convert the values of one csv column like pandas does: int or float if all the values are numbers, else str.
+        Empty values are None.
+        """
+        present = [value for value in values if value != ""]
+        for converter in (int, float):
+            try:
+                converted = [converter(value) for value in present]
+            except ValueError:
+                continue
+            converted.reverse()
+            return [converted.pop() if value != "" else None for value in values]
+        return [value if value != "" else None for value in values]
+
+    @classmethod
+    def _read_config_file(cls, config_file):
+        """
+        :return: list of the rows of the csv config file as dictionaries
+        """
+        with open(config_file, "r", encoding="utf-8-sig", newline="") as csv_file:
+            reader = csv.reader(csv_file)
+            columns = next(reader, [])
+            rows = [row + [""] * (len(columns) - len(row)) for row in reader if row]
+        converted_columns = [cls._convert_column([row[index] for row in rows]) for index in range(len(columns))]
+        return [dict(zip(columns, values)) for values in zip(*converted_columns)]
+
+    @classmethod
+    def _index_config_file(cls, config_file):
+        mtime = os.path.getmtime(config_file)
+        index = cls._indexes.get(config_file)
+        if index is not None and index["mtime"] == mtime:
+            return index
+        index = {"mtime": mtime, "testcases": {}, "linked_testcases": {}}
+        for row in cls._read_config_file(config_file):
+            if row.get(Config.TEST_CASE) is not None:
+                index["testcases"].setdefault(str(row[Config.TEST_CASE]), row)
+            if row.get(Config.PARENT_TEST_CASE) is not None:
+                index["linked_testcases"].setdefault(str(row[Config.PARENT_TEST_CASE]), []).append(row)
+        cls._indexes[config_file] = index
+        return index
+
+    @classmethod
+    def get_index(cls, config_file):
+        """
+        :param config_file: path of the csv config file
+        :return: dictionary with the testcase rows by testcase and the lists of linked testcase rows by parent
+        """
+        with cls._lock:
+            if not cls._all_indexed:
+                for csv_config_file in glob.glob(os.path.join(os.path.dirname(config_file), "*.csv")):
+                    cls._index_config_file(csv_config_file)
+                cls._all_indexed = True
+            return cls._index_config_file(config_file)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._indexes.clear()
+            cls._all_indexed = False
+
+
 class TestcaseConfigs(object):
     """
     Class for managing PnP Testcase Configs
@@ -50,9 +126,8 @@ class TestcaseConfigs(object):
         Returns:
             Absolute path of the file
         """
-        config_path_from_pnp_src = Path("config\\" + wl_config_file_name)
         pnp_path = Path(os.path.dirname(os.path.realpath(__file__))).parent
-        pnp_config_path = os.path.join(pnp_path, config_path_from_pnp_src)
+        pnp_config_path = os.path.join(str(pnp_path), "config", wl_config_file_name)
         return pnp_config_path
 
     def get_config_for_testcase(self, workload_config_file, tc_name):
@@ -64,28 +139,13 @@ class TestcaseConfigs(object):
         :returns dictionary
         """
         config_file = self.__get_pnp_config_path(workload_config_file)
-        
-        engine = create_engine('sqlite://', echo=False)
-        
-        '''Return? if testcase not available in configs xl'''
-
-        #Read given Excel sheet into a data frame
-        df = pd.read_csv(config_file)
-        
-        #Convert data frame to sql by creating a table named configs
-        df.to_sql('configs', engine, if_exists='replace', index=False)
-
-        #Prepare and run query
-        query = "select * from configs where " + Config.TEST_CASE + "='{}'".format(tc_name)
-        result = engine.execute(query)
+        config = _TestcaseConfigIndex.get_index(config_file)["testcases"].get(str(tc_name))
 
-        final = pd.DataFrame(result,columns=df.columns)
-        config = final.to_dict(orient='records')
-        
         if not config:
             return {}
 
-        return config[0]
+        # callers update the config, keep the index unchanged
+        return dict(config)
 
     def get_configs_for_linked_testcases(self, workload_config_file, tc_name):
         """
@@ -96,22 +156,8 @@ class TestcaseConfigs(object):
         :returns array of dictionaries
         """
         config_file = self.__get_pnp_config_path(workload_config_file)
-
-        engine = create_engine('sqlite://', echo=False)
-        
-        #Read given Excel sheet int a data frame
-        df = pd.read_csv(config_file)
-        
-        #Convert data frame to sql by creating a table named configs
-        df.to_sql('configs', engine, if_exists='replace', index=False)
-
-        #Prepare and run query
-        query = "select * from configs where " + Config.PARENT_TEST_CASE + "='{}'".format(tc_name)
-        result = engine.execute(query)
-
-        final = pd.DataFrame(result,columns=df.columns)
-        config = final.to_dict(orient='records')
-        return config
+        configs = _TestcaseConfigIndex.get_index(config_file)["linked_testcases"].get(str(tc_name), [])
+        return [dict(config) for config in configs]
 
 
 class WorkloadConfig(object):
@@ -22,6 +22,7 @@
 
 import re
 import os
+import copy
 from abc import ABCMeta, abstractmethod
 from importlib import import_module
 
@@ -60,6 +61,8 @@ class MemoryProvider(BaseProvider):
     INTEL_PERSISTENT_MEMORY = "Intel persistent memory"
     DDR5_STRING = "DDR5"
     DDR4_STRING = "DDR4"
+    SMBIOS_MEMORY_DEVICE_CMD = "dmidecode -t 17"
+    BOOT_ID_CMD = None
 
     def __init__(self, log, cfg_opts, os_obj):
         """
@@ -82,6 +85,9 @@ class MemoryProvider(BaseProvider):
         self._product_family = self._common_content_lib_obj.get_platform_family()
         self._cpu_info_provider = CpuInfoProvider.factory(self._log, cfg_opts, self._os)
         self._artifactory_obj = ContentArtifactoryUtils(self._log, self._os, self._common_content_lib_obj, cfg_opts)
+        # SMBIOS type 17 snapshot of the current boot, all the memory slot queries are served from it
+        self._smbios_snapshot = None
+        self._smbios_boot_id = None
 
     @staticmethod
     def factory(log, cfg_opts, os_obj):
@@ -151,14 +157,46 @@ class MemoryProvider(BaseProvider):
         raise NotImplementedError
 
     @abstractmethod
-    def get_memory_slots_details(self):
+    def get_memory_slots_details(self, refresh=False):
         """
         This function is used to get dmidecode command in linux, wmic command data in windows for all memory slots.
 
+        :param refresh: True to read the SMBIOS data again even if the SUT was not rebooted
         :return:
         """
         raise NotImplementedError
 
+    def get_boot_id(self):
+        """
+        This function is used to get the identifier of the current SUT boot, it changes on every reboot.
+
+        :return: boot id string
+        """
+        return self._common_content_lib_obj.execute_sut_cmd(self.BOOT_ID_CMD, "get the boot id",
+                                                            self._command_timeout).strip()
+
+    def get_smbios_snapshot(self, cmd_path=None, refresh=False):
+        """
+        This function returns the parsed dmidecode type 17 output of the current boot. dmidecode is run and parsed in
+        memory only once per boot, the later calls return a copy of the snapshot.
+
+        :param cmd_path: path where dmidecode is executed
+        :param refresh: True to discard the snapshot of the current boot
+        :return: dmi decode data in the form of dictionary
+        """
+        boot_id = self.get_boot_id()
+        if refresh or self._smbios_snapshot is None or boot_id != self._smbios_boot_id:
+            self._log.info("Reading the SMBIOS memory device data of the boot '{}'".format(boot_id))
+            dmi_output = self._common_content_lib_obj.execute_sut_cmd(self.SMBIOS_MEMORY_DEVICE_CMD,
+                                                                      "get dmi dmidecode -t 17 type output",
+                                                                      self._command_timeout, cmd_path=cmd_path)
+            self._smbios_snapshot = self._dmidecode_parser.parse_dmidecode_output(dmi_output)
+            self._smbios_boot_id = boot_id
+        else:
+            self._log.debug("Using the SMBIOS memory device snapshot of the boot '{}'".format(boot_id))
+        # callers update the returned dictionary, e.g. update_ddr_from_dmidecode
+        return copy.deepcopy(self._smbios_snapshot)
+
     @abstractmethod
     def get_snc_node_info(self):
         """
@@ -597,6 +635,7 @@ class MemoryWindowsProvider(MemoryProvider):
     Class to provide get total system memory, populated memory slots, locator information functionality
     for windows platform
     """
+    BOOT_ID_CMD = "wmic os get LastBootUpTime /value"
 
     def __init__(self, log, cfg_opts, os_obj):
         super(MemoryWindowsProvider, self).__init__(log, cfg_opts, os_obj)
@@ -613,7 +652,7 @@ class MemoryWindowsProvider(MemoryProvider):
         pass
 
     def re_initialize_memory_provider(self):
-        self.dict_dmi_decode_data = self.get_memory_slots_details()
+        self.dict_dmi_decode_data = self.get_memory_slots_details(refresh=True)
         self.dict_dmi_decode_data = self.update_ddr_from_dmidecode(self.dict_dmi_decode_data)
 
     def get_total_system_memory(self):
@@ -670,27 +709,14 @@ class MemoryWindowsProvider(MemoryProvider):
         self._log.info("The populated memory locators in the SUT are : {}".format(dram_memory_location_list))
         return dram_memory_location_list
 
-    def get_memory_slots_details(self):
+    def get_memory_slots_details(self, refresh=False):
         """
         This function is used to get the wmic command data in the form of a dictionary
 
+        :param refresh: True to read the SMBIOS data again even if the SUT was not rebooted
         :return wmic_dict: wmic data in the form of a dictionary
         """
-
-        dmi_cmd = "dmidecode -t 17 > dmi.txt"
-        dmi_decode_folder = "dmidecode"
-        self._common_content_lib_obj.execute_sut_cmd(dmi_cmd, "get dmi dmidecode -t 17 type output",
-                                                     self._command_timeout, cmd_path=self._dmidecode_path)
-
-        self._common_content_lib_obj.delete_testcaseid_folder_in_host(test_case_id=dmi_decode_folder)
-
-        log_path_to_parse = self._common_content_lib_obj.copy_log_files_to_host(
-            test_case_id=dmi_decode_folder, sut_log_files_path=self._dmidecode_path, extension=".txt")
-
-        # Check whether the dmi.txt exists in the folder has been done inside the "dmidecode_parser" function.
-        dict_dmi_decode_from_tool = self._dmidecode_parser.dmidecode_parser(log_path_to_parse)
-
-        return dict_dmi_decode_from_tool
+        return self.get_smbios_snapshot(cmd_path=self._dmidecode_path, refresh=refresh)
 
     def get_locator_info(self, mem_info, locator):
         """
@@ -1344,6 +1370,7 @@ class MemoryLinuxProvider(MemoryProvider):
     """
 
     MEM_REGEX = r"Mem:\s*[0-9]*"
+    BOOT_ID_CMD = "cat /proc/sys/kernel/random/boot_id"
     PACKAGE_NUMACTL = "numactl"
     PACKAGE_DAXCTL = "daxctl"
 
@@ -1361,7 +1388,7 @@ class MemoryLinuxProvider(MemoryProvider):
         """
         This method is to re-initialise the memory provider.
         """
-        self.dict_dmi_decode_data = self.get_memory_slots_details()
+        self.dict_dmi_decode_data = self.get_memory_slots_details(refresh=True)
 
     def get_total_system_memory(self):
         """
@@ -1443,26 +1470,14 @@ class MemoryLinuxProvider(MemoryProvider):
                         memory_info_data_dict['Bank Locator'] = self.dict_dmi_decode_data[key]['Bank Locator']
         return memory_info_data_dict
 
-    def get_memory_slots_details(self):
+    def get_memory_slots_details(self, refresh=False):
         """
          This function is used to get the dmidecode command data in the form of a dictionary
 
+        :param refresh: True to read the SMBIOS data again even if the SUT was not rebooted
         :return dict_dmi_decode_from_tool: dmi decode data in the from of dictionary
         """
-        dmi_cmd = "dmidecode -t 17 > dmi.txt"
-        dmi_decode_folder = "dmidecode"
-        self._common_content_lib_obj.execute_sut_cmd(dmi_cmd, "get dmi dmidecode -t 17 type output",
-                                                     self._command_timeout, cmd_path=self.LINUX_USR_ROOT_PATH)
-
-        self._common_content_lib_obj.delete_testcaseid_folder_in_host(test_case_id=dmi_decode_folder)
-
-        log_path_to_parse = self._common_content_lib_obj.copy_log_files_to_host(
-            test_case_id=dmi_decode_folder, sut_log_files_path=self.LINUX_USR_ROOT_PATH, extension=".txt")
-
-        # Check whether the dmi.txt exists in the folder has been done inside the "dmidecode_parser" function.
-        dict_dmi_decode_from_tool = self._dmidecode_parser.dmidecode_parser(log_path_to_parse)
-
-        return dict_dmi_decode_from_tool
+        return self.get_smbios_snapshot(cmd_path=self.LINUX_USR_ROOT_PATH, refresh=refresh)
 
     def get_snc_node_info(self):
         """
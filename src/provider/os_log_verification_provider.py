@@ -20,6 +20,7 @@
 # and approved by Intel in writing.
 #################################################################################
 
+import hashlib
 import re
 import os
 import json
@@ -102,20 +103,198 @@ class OsLogVerificationProvider(BaseProvider):
         raise NotImplementedError
 
 
+class OsLogCursor(object):
+    """
+    Read position in one OS log source: the next line of a log file, the journal cursor or the last dmesg timestamp.
+
+    The signatures found in the log content read so far are kept with the cursor, so that a check only fetches and
+    scans the lines logged since the previous check of the same source. The head identifies the content the position
+    refers to: the oldest journal entry, the first dmesg line or the inode, size and checksum of the lines of a log
+    file read so far. A different head means the log was cleared, rotated or rewritten.
+    """
+
+    def __init__(self):
+        self.head = None
+        self.position = None
+        self.size = 0
+        self.digest = hashlib.md5()
+        self.scanned_signatures = set()
+        self.found_signatures = set()
+
+    def reset(self):
+        """
+        Forget the read position, the next read fetches the whole log again.
+        """
+        self.__init__()
+
+
 class OsLogVerificationProviderLinux(OsLogVerificationProvider):
     """
     This Class has different method of Storage Functionality on Windows Platform
     """
+    OS_LOG_SOURCES = {
+        OsLogVerificationConstant.DUT_MESSAGES_FILE_NAME: OsLogVerificationConstant.DUT_MESSAGES_PATH,
+        OsLogVerificationConstant.DUT_JOURNALCTL_FILE_NAME: None,
+        OsLogVerificationConstant.DUT_DMESG_FILE_NAME: None,
+        OsLogVerificationConstant.DUT_RAS_TOOLS_FILE_NAME: "exe.log",
+        OsLogVerificationConstant.DUT_STRESS_FILE_NAME: "stress.log"}
+    # inode and size of the file and checksum of the lines already read, to detect a truncated, rotated or rewritten
+    # log, followed by the lines from the cursor
+    LOG_FILE_READ_CMD = "stat -c '%i %s' {path} && head -n {read_lines} {path} | md5sum && tail -n +{line} {path}"
+    # cursor of the oldest journal entry, to detect a cleared or vacuumed journal, followed by the new entries
+    JOURNAL_HEAD_CMD = 'echo "$(' + OsLogVerificationConstant.DUT_JOURNALCTL_NO_PROMPT + \
+                       ' -q -o export 2>/dev/null | head -n 1)"; '
+    JOURNAL_READ_CMD = OsLogVerificationConstant.DUT_JOURNALCTL_NO_PROMPT + " --show-cursor"
+    JOURNAL_AFTER_CURSOR_OPTION = " --after-cursor='{}'"
+    JOURNAL_CURSOR_REGEX = r"^-- cursor: (.*)$"
+    # first line of the ring buffer, to detect a cleared or wrapped buffer, followed by the lines from the timestamp
+    DMESG_READ_CMD = "dmesg | awk -F'[][]' -v ts={} 'NR == 1 || $2 + 0 >= ts'"
+    DMESG_TIMESTAMP_REGEX = r"^\[\s*(\d+\.\d+)\]"
+    SIGNATURE_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
 
     def __init__(self, log, os_obj, cfg_opts=None):
         super(OsLogVerificationProviderLinux, self).__init__(log, os_obj, cfg_opts)
         self._log = log
         self._cfg_opts = cfg_opts
         self._os = os_obj
+        self._os_log_cursors = {}
 
     def factory(log, os_obj, cfg_opts=None):
         pass
 
+    def reset_os_log_cursors(self, dut_os_error_log_file_name=None):
+        """
+        Forget the read position of the OS log sources, the next check scans the whole log again.
+
+        :param dut_os_error_log_file_name: OS log source i.e. messages or dmesg, None for all the sources
+        """
+        for source, cursor in self._os_log_cursors.items():
+            if dut_os_error_log_file_name in (None, source):
+                cursor.reset()
+
+    def _read_log_file(self, path, cursor):
+        """
+        Fetch the lines added to the log file since the cursor.
+
+        :return: new log content
+        """
+        line = cursor.position or 1
+        output = self._os.execute(self.LOG_FILE_READ_CMD.format(path=path, read_lines=line - 1, line=line),
+                                  self._cmd_time_out_in_sec).stdout.split("\n", 2)
+        if len(output) < 3:
+            self._log.debug("{} does not exist".format(path))
+            cursor.reset()
+            return ""
+        file_stat, read_lines_checksum, log_content = output
+        inode, size = file_stat.split()
+        if cursor.position and (inode != cursor.head or int(size) < cursor.size or
+                                read_lines_checksum.split()[0] != cursor.digest.hexdigest()):
+            self._log.debug("{} was truncated, rotated or rewritten, reading it from the start".format(path))
+            cursor.reset()
+            return self._read_log_file(path, cursor)
+        cursor.head = inode
+        cursor.size = int(size)
+        # the last line may be partially written, it is read again with the next lines
+        complete_lines = log_content.split("\n")[:-1]
+        if complete_lines:
+            cursor.digest.update(("\n".join(complete_lines) + "\n").encode("utf-8"))
+        cursor.position = line + len(complete_lines)
+        return log_content
+
+    def _read_journal(self, cursor):
+        """
+        Fetch the journal entries logged after the journal cursor.
+
+        :return: new log content
+        """
+        cmd = self.JOURNAL_HEAD_CMD + self.JOURNAL_READ_CMD
+        if cursor.position:
+            cmd += self.JOURNAL_AFTER_CURSOR_OPTION.format(cursor.position)
+        result = self._os.execute(cmd, self._cmd_time_out_in_sec)
+        head, _, log_content = result.stdout.partition("\n")
+        if cursor.position and (result.cmd_failed() or head != cursor.head):
+            # journal files deleted by clear_all_os_error_logs still accept the old cursor
+            self._log.debug("Journal cursor '{}' is no more valid, reading the whole journal".format(cursor.position))
+            cursor.reset()
+            return self._read_journal(cursor)
+        cursor.head = head
+        journal_cursor = re.search(self.JOURNAL_CURSOR_REGEX, log_content, re.MULTILINE)
+        if journal_cursor:
+            cursor.position = journal_cursor.group(1).strip()
+        return log_content
+
+    def _read_dmesg(self, cursor):
+        """
+        Fetch the kernel ring buffer lines logged since the last dmesg timestamp.
+
+        :return: new log content
+        """
+        lines = self._os.execute(self.DMESG_READ_CMD.format(cursor.position or 0),
+                                 self._cmd_time_out_in_sec).stdout.strip().split("\n")
+        if cursor.head is not None and lines[0] != cursor.head:
+            self._log.debug("Kernel ring buffer was cleared or wrapped, reading it from the start")
+            cursor.reset()
+            return self._read_dmesg(cursor)
+        cursor.head = lines[0]
+        timestamp = re.search(self.DMESG_TIMESTAMP_REGEX, lines[-1])
+        # lines without timestamp can not be filtered, the whole buffer is read on every check
+        cursor.position = timestamp.group(1) if timestamp else None
+        return "\n".join(lines)
+
+    @classmethod
+    def find_signatures(cls, signatures, log_content):
+        """
+        Find the error signatures in the log content, all the signatures are matched in one compiled pass.
+
+        :param signatures: error signature regular expressions
+        :param log_content: log content to scan
+        :return: set of the signatures found in the log content
+        """
+        pending = list(signatures)
+        found = set()
+        position = 0
+        while pending:
+            try:
+                combined_regex = re.compile("|".join("(?P<signature{}>{})".format(index, signature)
+                                                     for index, signature in enumerate(pending)),
+                                            cls.SIGNATURE_REGEX_FLAGS)
+            except re.error:
+                # signatures with numbered back references can not be combined
+                return found | set(signature for signature in pending
+                                   if re.search(signature, log_content, cls.SIGNATURE_REGEX_FLAGS))
+            match = combined_regex.search(log_content, position)
+            if not match:
+                break
+            # the other signatures can only match from this position, continue from there without the found one
+            position = match.start()
+            found.add(pending.pop(int(match.lastgroup[len("signature"):])))
+        return found
+
+    def find_new_os_log_signatures(self, dut_os_error_log_file_name, signatures):
+        """
+        Scan the OS log content logged since the previous check of the same source for the error signatures.
+
+        :param dut_os_error_log_file_name: OS log source i.e. messages, journalctl or dmesg
+        :param signatures: error signature regular expressions
+        :return: set of the signatures found in the current OS log content
+        """
+        cursor = self._os_log_cursors.setdefault(dut_os_error_log_file_name, OsLogCursor())
+        if not set(signatures).issubset(cursor.scanned_signatures):
+            # the log content already read was not scanned for these signatures
+            cursor.reset()
+        if dut_os_error_log_file_name == OsLogVerificationConstant.DUT_JOURNALCTL_FILE_NAME:
+            log_content = self._read_journal(cursor)
+        elif dut_os_error_log_file_name == OsLogVerificationConstant.DUT_DMESG_FILE_NAME:
+            log_content = self._read_dmesg(cursor)
+        else:
+            log_content = self._read_log_file(self.OS_LOG_SOURCES[dut_os_error_log_file_name], cursor)
+        self._log.info("%s", log_content.strip())
+
+        cursor.scanned_signatures.update(signatures)
+        cursor.found_signatures.update(self.find_signatures(cursor.scanned_signatures - cursor.found_signatures,
+                                                            log_content.strip()))
+        return cursor.found_signatures
+
     def verify_os_log_error_messages(self, test_file, dut_os_error_log_file_name,
                                      passed_error_signature_list_to_parse, error_signature_list_to_log=None,
                                      check_error_in_log=False):
@@ -154,28 +333,16 @@ class OsLogVerificationProviderLinux(OsLogVerificationProvider):
         else:
             error_signature_list_to_parse = list(passed_error_signature_list_to_parse)
 
-        # Create the appropriate message file either from ras_tools or os to check key words
-        os_log_cmd_mapping_dictionary = {
-            OsLogVerificationConstant.DUT_MESSAGES_FILE_NAME:
-                "cat " + OsLogVerificationConstant.DUT_MESSAGES_PATH,
-            OsLogVerificationConstant.DUT_JOURNALCTL_FILE_NAME:
-                OsLogVerificationConstant.DUT_JOURNALCTL_FILE_NAME + " --no-pager",
-                OsLogVerificationConstant.DUT_DMESG_FILE_NAME: OsLogVerificationConstant.DUT_DMESG_FILE_NAME,
-                OsLogVerificationConstant.DUT_RAS_TOOLS_FILE_NAME: "cat exe.log",
-                OsLogVerificationConstant.DUT_STRESS_FILE_NAME: "cat stress.log"}
-        try:
-            os_log_cmd_to_execute = os_log_cmd_mapping_dictionary[dut_os_error_log_file_name]
-        except KeyError:
+        if dut_os_error_log_file_name not in self.OS_LOG_SOURCES:
             raise ValueError("Invalid or unknown OS error log specified")
 
-        output_file_log = self._os.execute(os_log_cmd_to_execute, self._cmd_time_out_in_sec)
-        self._log.info("%s", output_file_log.stdout.strip())
         self._log.info("Check " + dut_os_error_log_file_name + " file content after error injection")
+        found_signatures = self.find_new_os_log_signatures(dut_os_error_log_file_name, error_signature_list_to_parse)
 
         found = 0
         for string_to_look in error_signature_list_to_parse:
             self._log.info("Looking for [%s]", string_to_look)
-            if re.findall(string_to_look, output_file_log.stdout.strip(), re.IGNORECASE | re.MULTILINE):
+            if string_to_look in found_signatures:
                 self._log.debug(" String found")
                 found = found + 1
             else:
@@ -306,6 +306,7 @@ class LinuxLtssmProvider(PcieLtssmToolProvider):
             width = self._pcie_provider_obj.get_linkstatus_width(device_id)
             bus_id = self._pcie_provider_obj.get_device_bus(device_id=device_id)
         else:
+            self._pcie_provider_obj.refresh_pcie_snapshot(bdf)
             speed = self._pcie_provider_obj.get_link_status_speed_by_bdf(bdf)
             width = self._pcie_provider_obj.get_link_status_width_by_bdf(bdf)
             bus_id = self._pcie_provider_obj.get_device_bus(bdf=bdf)
@@ -369,6 +370,7 @@ class LinuxLtssmProvider(PcieLtssmToolProvider):
             width = self._pcie_provider_obj.get_linkstatus_width(device_id)
             bus_id = self._pcie_provider_obj.get_device_bus(device_id=device_id)
         else:
+            self._pcie_provider_obj.refresh_pcie_snapshot(bdf)
             speed = self._pcie_provider_obj.get_link_status_speed_by_bdf(bdf)
             width = self._pcie_provider_obj.get_link_status_width_by_bdf(bdf)
             bus_id = self._pcie_provider_obj.get_device_bus(bdf=bdf)
@@ -497,6 +499,7 @@ class CscriptsLtssmProvider(PcieLtssmToolProvider):
             speed = self._pcie_provider_obj.get_linkcap_speed(device_id)
             width = self._pcie_provider_obj.get_linkstatus_width(device_id)
         else:
+            self._pcie_provider_obj.refresh_pcie_snapshot(bdf)
             speed = self._pcie_provider_obj.get_link_status_speed_by_bdf(bdf)
             width = self._pcie_provider_obj.get_link_status_width_by_bdf(bdf)
         self._log.debug("Negotiable Link Width for device id: {} is {}".format(device_id, width))
@@ -688,6 +691,7 @@ class PythonsvLtssmProvider(PcieLtssmToolProvider):
             speed = self._pcie_provider_obj.get_linkcap_speed(device_id)
             width = self._pcie_provider_obj.get_linkstatus_width(device_id)
         else:
+            self._pcie_provider_obj.refresh_pcie_snapshot(bdf)
             speed = self._pcie_provider_obj.get_link_status_speed_by_bdf(bdf)
             width = self._pcie_provider_obj.get_link_status_width_by_bdf(bdf)
         self._log.debug("Negotiable Link Width for device id: {} is {}".format(device_id, width))
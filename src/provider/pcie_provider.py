@@ -248,6 +248,114 @@ class PcieProvider(BaseProvider):
         """
         raise NotImplementedError
 
+    def refresh_pcie_snapshot(self, bdf=None):
+        """
+        This method is to capture the pcie topology of the SUT again, e.g. after reboot, link retrain or driver
+        bind/unbind. Providers which do not keep a pcie topology snapshot query the SUT on every call, so there is
+        nothing to refresh.
+
+        :param bdf: capture only this device again, None for the complete topology
+        :return None
+        """
+        pass
+
+
+class PcieTopologySnapshot(object):
+    """
+    Snapshot of the complete pcie topology of the SUT, parsed from the output of a single verbose lspci invocation.
+    Holds the ids, class and kernel driver of every function and its verbose lspci section, which carries the link
+    capability, link status and capability details.
+    """
+    DEVICE_HEADER_REGEX = r"^(\S+)\s(.+?)\s\[[0-9a-fA-F]{4}\]:\s.*\[([0-9a-fA-F]{4}):([0-9a-fA-F]{4})\]"
+    KERNEL_DRIVER_REGEX = r'Kernel\sdriver\sin\suse\S\s(\S+)'
+    DEFAULT_PCI_DOMAIN = "0000:"
+
+    def __init__(self, lspci_output):
+        """
+        Create a new PcieTopologySnapshot object.
+
+        :param lspci_output: output of 'lspci -vvv -nn -k' from the SUT
+        """
+        self._device_output_dict = {}
+        self._device_dict = {}
+        self._bdf_list = []
+        device_lines = None
+        for each_line in lspci_output.splitlines():
+            if not each_line.strip():
+                continue
+            if not each_line[0].isspace():
+                header = re.match(self.DEVICE_HEADER_REGEX, each_line)
+                if header:
+                    device_lines = [each_line]
+                    bdf = header.group(1)
+                    self._bdf_list.append(bdf)
+                    self._device_output_dict[bdf] = device_lines
+                    self._device_dict[bdf] = {PcieAttribute.VENDOR_ID: header.group(3).lower(),
+                                              PcieAttribute.DEVICE_ID: header.group(4).lower(),
+                                              PcieAttribute.DEVICE_DRIVER: None,
+                                              PcieAttribute.DEVICE_CLASS: header.group(2)}
+                    continue
+            if device_lines is not None:
+                device_lines.append(each_line)
+
+        for bdf, device_lines in self._device_output_dict.items():
+            self._device_output_dict[bdf] = "\n".join(device_lines) + "\n"
+            driver = re.findall(self.KERNEL_DRIVER_REGEX, self._device_output_dict[bdf])
+            if driver:
+                self._device_dict[bdf][PcieAttribute.DEVICE_DRIVER] = driver[0]
+
+    def __contains__(self, bdf):
+        return self.__normalize_bdf(bdf) in self._device_output_dict
+
+    def __normalize_bdf(self, bdf):
+        """
+        lspci omits the pci domain 0000, accept the bdf with or without it.
+        """
+        if bdf not in self._device_output_dict and bdf.startswith(self.DEFAULT_PCI_DOMAIN):
+            return bdf[len(self.DEFAULT_PCI_DOMAIN):]
+        return bdf
+
+    def get_bdf_list(self):
+        """
+        :return: bdf of all functions in lspci order
+        """
+        return list(self._bdf_list)
+
+    def get_device_dict(self):
+        """
+        :return: pcie devices in dictionary form eg:- {'00:01.7': {'vendor_id': '8086', 'device_id': '0b00',
+        'device_driver': 'ioatdma', 'device_class': 'System peripheral'},...}
+        """
+        return self._device_dict
+
+    def update_device(self, bdf, lspci_output):
+        """
+        This method is to replace the details of one device with a new verbose lspci capture of it. The device is
+        dropped from the snapshot if the capture does not contain it any more.
+
+        :param bdf
+        :param lspci_output: output of 'lspci -vvv -nn -k -s <bdf>' from the SUT
+        """
+        device_snapshot = PcieTopologySnapshot(lspci_output)
+        if bdf not in device_snapshot._device_output_dict and bdf not in self._device_output_dict:
+            bdf = self.__normalize_bdf(bdf)
+        if bdf in device_snapshot._device_output_dict:
+            if bdf not in self._device_output_dict:
+                self._bdf_list.append(bdf)
+            self._device_output_dict[bdf] = device_snapshot._device_output_dict[bdf]
+            self._device_dict[bdf] = device_snapshot._device_dict[bdf]
+        elif bdf in self._device_output_dict:
+            self._bdf_list.remove(bdf)
+            del self._device_output_dict[bdf]
+            del self._device_dict[bdf]
+
+    def get_device_output(self, bdf):
+        """
+        :param bdf
+        :return: verbose lspci section of the bdf, None if the bdf is not part of the snapshot
+        """
+        return self._device_output_dict.get(self.__normalize_bdf(bdf))
+
 
 class PcieProviderLinux(PcieProvider):
     """
@@ -257,6 +365,8 @@ class PcieProviderLinux(PcieProvider):
     """
     LSPCI_MM_CMD = "lspci -mm"
     LSPCI_MN_CMD = "lspci -mn"
+    LSPCI_TOPOLOGY_CMD = "lspci -vvv -nn -k"
+    LSPCI_DEVICE_TOPOLOGY_CMD = "lspci -vvv -nn -k -s {}"
     LSPCI_DRIVER_CMD = "lspci -v -d {}:{}"
     KERNEL_DRIVER_REGEX = r'Kernel\sdriver\sin\suse\S\s(\S+)'
     LINCAP_REGEX = r"LnkCap:\sPort\s\S+\sSpeed\s(\S+)"
@@ -273,8 +383,7 @@ class PcieProviderLinux(PcieProvider):
         self._log = log
         self._cfg_opts = cfg_opts
         self._os = os_obj
-        self.__dict_pci_device_dict = {}
-        self.__bdf_device_class_dict = {}
+        self._pcie_snapshot = None
         self._pcie_device_dict = self.__enumerate_pcie_devices()
         self.cxl_type_dict = {"Cache- IO+ Mem+": "Type 3", "Cache+ IO+ Mem-": "Type 1", "Cache+ IO+ Mem+": "Type 2"}
 
@@ -283,41 +392,54 @@ class PcieProviderLinux(PcieProvider):
 
     def __enumerate_pcie_devices(self):
         """
-        This method is to enumerate the pcie devices.
+        This method is to enumerate the pcie devices. Ids, class, kernel driver, link and capability details of all
+        functions are captured with a single lspci invocation into a snapshot which is used by the per bdf queries
+        until refresh_pcie_snapshot is called.
 
         :return pcie devices in dictionary form eg:- {'00:01.7': {'vendor_id': '8086', 'device_id': '0b00',
         'device_driver': 'ioatdma', 'device_class': 'System peripheral'}, '00:02.0': {'vendor_id': '8086',
         'device_id': '09a6', 'device_driver': None, 'device_class': 'System peripheral'},...}.
         """
-        command_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LSPCI_MM_CMD, cmd_str=
-        self.LSPCI_MM_CMD, execute_timeout=
-                                                                  self._cmd_time_out_in_sec)
-        pcie_bdf_device_class_info_list = command_output.split('\n')[:-1]
-        for each_line in pcie_bdf_device_class_info_list:
-            each_line_list = each_line.split('"')
-            bdf_value = each_line_list[0][:-1]
-            self.__bdf_device_class_dict[bdf_value] = each_line_list[1]
-        command_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LSPCI_MN_CMD, cmd_str=
-        self.LSPCI_MN_CMD, execute_timeout=
-                                                                  self._cmd_time_out_in_sec)
-        pcie_device_info_list = command_output.split('\n')[:-1]
-        for each_line in pcie_device_info_list:
-            each_device_info_dict = {}
-            each_line_list = each_line.split(' ')
-            each_device_info_dict[PcieAttribute.VENDOR_ID] = each_line_list[2][1:-1]
-            each_device_info_dict[PcieAttribute.DEVICE_ID] = each_line_list[3][1:-1]
-            command_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LSPCI_DRIVER_CMD.format(
-                each_line_list[2][1:-1], each_line_list[3][1:-1]), cmd_str=self.LSPCI_DRIVER_CMD.format(
-                each_line_list[2][1:-1], each_line_list[3][1:-1]), execute_timeout=self._cmd_time_out_in_sec)
-            regex_out_put = re.findall(self.KERNEL_DRIVER_REGEX, command_output)
-            if len(regex_out_put):
-                each_device_info_dict[PcieAttribute.DEVICE_DRIVER] = regex_out_put[0]
-            else:
-                each_device_info_dict[PcieAttribute.DEVICE_DRIVER] = None
-            each_device_info_dict[PcieAttribute.DEVICE_CLASS] = self.__bdf_device_class_dict[each_line_list[0]]
+        command_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LSPCI_TOPOLOGY_CMD,
+                                                                  cmd_str=self.LSPCI_TOPOLOGY_CMD,
+                                                                  execute_timeout=self._cmd_time_out_in_sec)
+        self._pcie_snapshot = PcieTopologySnapshot(command_output)
+        self._log.debug("Captured pcie topology snapshot of {} functions".format(
+            len(self._pcie_snapshot.get_bdf_list())))
+        return self._pcie_snapshot.get_device_dict()
 
-            self.__dict_pci_device_dict[each_line_list[0]] = each_device_info_dict
-        return self.__dict_pci_device_dict
+    def refresh_pcie_snapshot(self, bdf=None):
+        """
+        This method is to capture the pcie topology snapshot again, e.g. after reboot, link retrain or driver
+        bind/unbind.
+
+        :param bdf: capture only this device again, None for the complete topology
+        :return None
+        """
+        if bdf is None or self._pcie_snapshot is None:
+            self._pcie_device_dict = self.__enumerate_pcie_devices()
+            return
+        command = self.LSPCI_DEVICE_TOPOLOGY_CMD.format(bdf)
+        command_output = self._common_content_lib.execute_sut_cmd(sut_cmd=command, cmd_str=command,
+                                                                  execute_timeout=self._cmd_time_out_in_sec)
+        self._pcie_snapshot.update_device(bdf, command_output)
+
+    def __get_device_lspci_output(self, bdf):
+        """
+        This method is to get the verbose lspci output of the bdf from the pcie topology snapshot. Devices which
+        are not part of the snapshot are queried from the SUT.
+
+        :param bdf
+        :return verbose lspci output of the bdf
+        """
+        if self._pcie_snapshot is None:
+            self.refresh_pcie_snapshot()
+        lspci_output = self._pcie_snapshot.get_device_output(bdf)
+        if lspci_output is None:
+            lspci_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
+                                                                    cmd_str=self.LNKCAP_SPEED.format(bdf),
+                                                                    execute_timeout=self._cmd_time_out_in_sec)
+        return lspci_output
 
     def get_pcie_devices(self, re_enumerate=False):
         """
@@ -330,7 +452,7 @@ class PcieProviderLinux(PcieProvider):
         'device_id': '09a6', 'device_driver': None, 'device_class': 'System peripheral'},...}.
         """
         if re_enumerate:
-            self._pcie_device_dict = self.__enumerate_pcie_devices()
+            self.refresh_pcie_snapshot()
         return self._pcie_device_dict
 
     def get_device_details_by_device_id(self, device_id):
@@ -384,9 +506,7 @@ class PcieProviderLinux(PcieProvider):
                 if PcieAttribute.LINKCAP_SPEED in device_details.keys():
                     linkcap_speed = device_details[PcieAttribute.LINKCAP_SPEED]
                 else:
-                    cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          cmd_str=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          execute_timeout=self._cmd_time_out_in_sec)
+                    cmd_output = self.__get_device_lspci_output(bdf_key)
                     regex_output = re.findall(self.LINCAP_REGEX, cmd_output)
                     linkcap_speed = regex_output[0].replace(',', '')
                     device_details[PcieAttribute.LINKCAP_SPEED] = linkcap_speed
@@ -406,9 +526,7 @@ class PcieProviderLinux(PcieProvider):
                 if PcieAttribute.LINKCAP_WIDTH in device_details.keys():
                     linkcap_width = device_details[PcieAttribute.LINKCAP_WIDTH]
                 else:
-                    cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          cmd_str=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          execute_timeout=self._cmd_time_out_in_sec)
+                    cmd_output = self.__get_device_lspci_output(bdf_key)
                     regex_output = re.findall(self.LINCAP_WIDTH_REGEX, cmd_output)
                     linkcap_width = regex_output[0].replace(',', '')
                     device_details[PcieAttribute.LINKCAP_WIDTH] = linkcap_width
@@ -422,9 +540,7 @@ class PcieProviderLinux(PcieProvider):
         :return width
         :raise content_exceptions
         """
-        lspci_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
-                                                                cmd_str=self.LNKCAP_SPEED.format(bdf),
-                                                                execute_timeout=self._cmd_time_out_in_sec)
+        lspci_output = self.__get_device_lspci_output(bdf)
         regex_output = re.findall(self.LINCAP_WIDTH_REGEX, lspci_output)
         if not regex_output:
             raise content_exceptions.TestFail("Link Cap Width was not captured in OS for bdf: {}".format(bdf))
@@ -439,9 +555,7 @@ class PcieProviderLinux(PcieProvider):
         :return speed
         :raise content_exceptions
         """
-        lspci_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
-                                                                cmd_str=self.LNKCAP_SPEED.format(bdf),
-                                                                execute_timeout=self._cmd_time_out_in_sec)
+        lspci_output = self.__get_device_lspci_output(bdf)
         regex_output = re.findall(self.LINCAP_REGEX, lspci_output)
         if not regex_output:
             raise content_exceptions.TestFail("Link Cap Speed was not captured in OS for bdf: {}".format(bdf))
@@ -459,9 +573,7 @@ class PcieProviderLinux(PcieProvider):
         if not bdf:
             raise content_exceptions.TestFail("Please pass bdf as an Arguments")
         else:
-            cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
-                                                                  cmd_str=self.LNKCAP_SPEED.format(bdf),
-                                                                  execute_timeout=self._cmd_time_out_in_sec)
+            cmd_output = self.__get_device_lspci_output(bdf)
             regex_output = re.findall(self.LINK_STATUS_SPEED, cmd_output)
             if not regex_output:
                 raise content_exceptions.TestFail("Link Status speed was not captured in OS for bdf: {}".format(bdf))
@@ -479,9 +591,7 @@ class PcieProviderLinux(PcieProvider):
         if not bdf:
             raise content_exceptions.TestFail("Please pass bdf as an Arguments")
         else:
-            cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
-                                                                  cmd_str=self.LNKCAP_SPEED.format(bdf),
-                                                                  execute_timeout=self._cmd_time_out_in_sec)
+            cmd_output = self.__get_device_lspci_output(bdf)
             regex_output = re.findall(self.LINK_STATUS_WIDTH_REGEX, cmd_output)
             if not regex_output:
                 raise content_exceptions.TestFail("Link Status Width was not captured in OS for bdf: {}".format(bdf))
@@ -501,9 +611,7 @@ class PcieProviderLinux(PcieProvider):
                 if PcieAttribute.LINKSTATUS_WIDTH in device_details.keys():
                     link_status_width = device_details[PcieAttribute.LINKSTATUS_WIDTH]
                 else:
-                    cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          cmd_str=self.LNKCAP_SPEED.format(bdf_key),
-                                                                          execute_timeout=self._cmd_time_out_in_sec)
+                    cmd_output = self.__get_device_lspci_output(bdf_key)
                     regex_output = re.findall(self.LINK_STATUS_WIDTH_REGEX, cmd_output)
                     link_status_width = regex_output[0].replace(',', '')
                     device_details[PcieAttribute.LINKCAP_WIDTH] = link_status_width
@@ -532,14 +640,17 @@ class PcieProviderLinux(PcieProvider):
 
         :return None
         """
-        cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LSPCI_DRIVER_CMD.format('8086', device_id),
-                                                              cmd_str="kernel driver command execution",
-                                                              execute_timeout=
-                                                              self._cmd_time_out_in_sec)
-        regex_out_put = re.findall(self.KERNEL_DRIVER_REGEX, cmd_output)
+        if self._pcie_snapshot is None:
+            self.refresh_pcie_snapshot()
+        regex_out_put = [device_details[PcieAttribute.DEVICE_DRIVER] for device_details in
+                         self._pcie_device_dict.values() if device_details[PcieAttribute.VENDOR_ID] == '8086' and
+                         device_details[PcieAttribute.DEVICE_ID] == device_id and
+                         device_details[PcieAttribute.DEVICE_DRIVER]]
         if regex_out_put:
             self._common_content_lib.execute_sut_cmd("modprobe -r {}".format(regex_out_put[0]), cmd_str="driver disable"
                                                      , execute_timeout=self._cmd_time_out_in_sec)
+            # Driver bindings have changed, capture the snapshot again on the next query
+            self._pcie_snapshot = None
             self._log.debug("Kernel driver for device id: {} is now disable".format(device_id))
         self._log.debug("Kernel driver for device id: {} is already disable".format(device_id))
 
@@ -561,8 +672,7 @@ class PcieProviderLinux(PcieProvider):
         """
         if not bdf:
             raise content_exceptions.TestFail("No bdf was found to search...Please pass bdf value as parameter")
-        lspci_out_put = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf), cmd_str=
-        self.LNKCAP_SPEED.format(bdf), execute_timeout=self._cmd_time_out_in_sec)
+        lspci_out_put = self.__get_device_lspci_output(bdf)
         device_driver_name = re.findall(self.KERNEL_DRIVER_REGEX, lspci_out_put)
         if device_driver_name:
             self._log.debug("Device driver for bdf: {} is visible is OS: {}".format(bdf, device_driver_name))
@@ -595,8 +705,7 @@ class PcieProviderLinux(PcieProvider):
             self._log.debug("Bus value : {}".format(bdf_value))
             if bdf_key.startswith(bus):
                 each_device_dict[bdf_key] = bdf_value
-                cmd_output = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf_key), cmd_str=
-                             self.LNKCAP_SPEED.format(bdf_key), execute_timeout=self._cmd_time_out_in_sec)
+                cmd_output = self.__get_device_lspci_output(bdf_key)
                 regex_output = re.findall(self.CXL_TYPE_REGEX, cmd_output)
                 if regex_output:
                     each_device_dict[bdf_key]["cxl_device_type"] = self.cxl_type_dict[regex_output[0][-15:]]
@@ -622,9 +731,7 @@ class PcieProviderLinux(PcieProvider):
         """
         if not bdf:
             raise content_exceptions.TestFail("Please send bdf as an Argument")
-        cmd_out_put = self._common_content_lib.execute_sut_cmd(sut_cmd=self.LNKCAP_SPEED.format(bdf),
-                                                               cmd_str="command to get driver",
-                                                               execute_timeout=self._cmd_time_out_in_sec)
+        cmd_out_put = self.__get_device_lspci_output(bdf)
         driver_name = re.findall(self.KERNEL_DRIVER_REGEX, cmd_out_put)
         if driver_name:
             driver_name = driver_name[0]
@@ -23,6 +23,7 @@ import os
 import re
 
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
 from importlib import import_module
 from six import add_metaclass
 
@@ -249,6 +250,106 @@ class LinuxSoCWatch(SOCWatchProvider):
         self._os.copy_file_from_sut_to_local(csv_file_path.strip(), os.path.join(log_dir, self.CSV_FILE))
 
 
+class SocWatchTable(object):
+    """
+    One table of the socwatch CSV output: title line, header line, separator line and the data rows.
+    """
+
+    def __init__(self, title, columns, rows):
+        """
+        :param title: title line of the table
+        :param columns: stripped column names of the header line
+        :param rows: data rows, lists of the stripped cell strings
+        """
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+
+    @staticmethod
+    def _to_number(value):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    def typed_rows(self):
+        """
+        :return: list of {column: value} dictionaries, numeric cells converted to float
+        """
+        return [dict(zip(self.columns, [self._to_number(value) for value in row])) for row in self.rows]
+
+    def to_dict(self):
+        """
+        Legacy dictionary of the table, {first cell: {column: value string}}, repeated first cells are suffixed
+        with _<row index>.
+        """
+        table_data_dict = OrderedDict()
+        for j, row in enumerate(self.rows):
+            pstate = row[0]
+            if pstate not in table_data_dict.keys():
+                table_data_dict[pstate] = {}
+            if len(table_data_dict[pstate]):
+                pstate = pstate + "_%s" % j
+                table_data_dict[pstate] = {}
+            for i in range(1, len(row)):
+                table_data_dict[pstate][self.columns[i]] = row[i]
+        return table_data_dict
+
+
+class SocWatchCSVIndex(object):
+    """
+    Index of all the tables of one socwatch CSV output, the file is read once and split into its blank line
+    separated blocks, every block is indexed by its first line.
+    """
+
+    def __init__(self, csv_file):
+        """
+        :param csv_file: full path to the csv file
+        """
+        with open(csv_file) as csv_file_read:
+            data = csv_file_read.read()
+        self._blocks = [block.strip().splitlines() for block in data.split("\n\n") if block.strip()]
+        self._titles = OrderedDict()
+        for index, block in enumerate(self._blocks):
+            # repeated titles resolve to the last table like the former str.split(title)[-1]
+            self._titles[block[0].strip()] = (index, 0)
+
+    @staticmethod
+    def _make_table(title, lines):
+        columns = [item.strip() for item in lines[0].split(",")] if lines else []
+        rows = [[item.strip() for item in line.strip().split(",")] for line in lines[2:]]
+        return SocWatchTable(title, columns, rows)
+
+    @property
+    def titles(self):
+        return list(self._titles.keys())
+
+    def _locate(self, match):
+        """
+        :return: (block index, line index, title line) of the last table title containing match, None if not found
+        """
+        if match in self._titles:
+            return self._titles[match] + (match, )
+        for index in range(len(self._blocks) - 1, -1, -1):
+            for line_index in range(len(self._blocks[index]) - 1, -1, -1):
+                if match in self._blocks[index][line_index]:
+                    return index, line_index, self._blocks[index][line_index]
+        return None
+
+    def get_table(self, match):
+        """
+        :param match: table title, or part of it
+        :return: SocWatchTable, None if the output has no such table
+        """
+        location = self._locate(match)
+        if location is None:
+            return None
+        index, line_index, title = location
+        block = self._blocks[index]
+        # the text after the title on its own line is ignored, the header follows on the next line
+        return self._make_table(title, block[line_index + 1:])
+
+
 class SocWatchCSVReader(object):
     """
     Reads the socwatch output which is in CSV format
@@ -271,6 +372,8 @@ class SocWatchCSVReader(object):
         """
         self._log = log
         self.csv_file = csv_file
+        self._csv_index = None
+        self._csv_index_key = None
 
     def update_csv_file(self, csv_file):
         """
@@ -279,6 +382,34 @@ class SocWatchCSVReader(object):
         :param csv_file: full path to the csv file
         """
         self.csv_file = csv_file
+        self._csv_index = None
+
+    @property
+    def csv_index(self):
+        """
+        Table index of the csv file, parsed again only if the file changed since the last parse.
+        """
+        stat = os.stat(self.csv_file)
+        index_key = (self.csv_file, stat.st_mtime, stat.st_size)
+        if self._csv_index is None or self._csv_index_key != index_key:
+            self._log.info("Reading the CSV file")
+            self._csv_index = SocWatchCSVIndex(self.csv_file)
+            self._csv_index_key = index_key
+        return self._csv_index
+
+    def get_table(self, match, alternative_match=None):
+        """
+        :param match: table heading
+        :param alternative_match: list of alternative table headings, used if match is not found
+        :return: SocWatchTable
+        :raise: content_exceptions.TestFail if none of the tables is found
+        """
+        for table_match in [match] + list(alternative_match or []):
+            table = self.csv_index.get_table(table_match)
+            if table is not None:
+                return table
+        raise content_exceptions.TestFail("Table {} and {} not found in the socwatch output".format(
+            match, alternative_match))
 
     def read_csv_table(self, match, alternative_match=None):
         """
@@ -288,37 +419,10 @@ class SocWatchCSVReader(object):
         :param alternative_match: alternative table heading
         :return table_data_dict: returns the particular table
         """
-        self._log.info("Reading the CSV file")
-        from collections import OrderedDict
-        table_data_dict = OrderedDict()
-        with open(self.csv_file) as csv_file_read:
-            data = csv_file_read.read()
-            if data.split(match)[-1].strip() == "":
-                return table_data_dict
-            if match not in data:
-                if alternative_match:
-                    for table_data in alternative_match:
-                        if table_data in data:
-                            match = table_data
-                            break
-            if match not in data:
-                raise content_exceptions.TestFail(
-                    "Table %s and %s not found in the socwatch output" % match % alternative_match)
-            table = data.split(match)[-1].split("\n\n")[0].strip().splitlines()
-            table_heads = [item.strip() for item in table[0].split(",")]
-            table_data = [item.strip() for item in table[2::]]
-            self._log.debug("Table heads for pacakge {}".format(table_heads))
-            self._log.debug("Table data for pacakge {}".format(table_data))
-            for j in range(len(table_data)):
-                pstate_data = [item.strip() for item in table_data[j].split(",")]
-                pstate = pstate_data[0]
-                if pstate not in table_data_dict.keys():
-                    table_data_dict[pstate] = {}
-                if len(table_data_dict[pstate]):
-                    pstate = pstate + "_%s" % j
-                    table_data_dict[pstate] = {}
-                for i in range(1, len(pstate_data)):
-                    table_data_dict[pstate][table_heads[i]] = pstate_data[i]
+        table = self.get_table(match, alternative_match)
+        self._log.debug("Table heads for pacakge {}".format(table.columns))
+        self._log.debug("Table data for pacakge {}".format(table.rows))
+        table_data_dict = table.to_dict()
         self._log.debug("Package table data dict {}".format(table_data_dict))
         return table_data_dict
 
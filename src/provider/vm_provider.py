@@ -41,6 +41,7 @@ from src.provider.stressapp_provider import StressAppTestProvider
 from src.lib.common_content_lib import CommonContentLib
 from src.lib.content_configuration import ContentConfiguration
 from src.lib.install_collateral import InstallCollateral
+from src.lib.powercli_worker import PowerCliWorker
 from src.lib import content_exceptions
 
 VM_CONFIGURATION_FILE = """<?xml version="1.0" encoding="UTF-8"?>
@@ -5800,12 +5801,12 @@ class ESXiVmProvider(VMProvider):
     GUEST_SERVICE_STR = "Guest Service Interface"
     SILENT_CONTINUE = "$progressPreference = 'silentlyContinue'"
 
-    COPY_COMMAND_TO_VM = "Connect-VIServer {} -User {} -Password {};Copy-VMGuestFile -Source {} -Destination {} -LocalToGuest -VM {} -GuestUser {} -GuestPassword {}"
-
     EXTRACT_FILE_STR = "'Expand-Archive -Path {} -DestinationPath {}'"
-    ESTABLISH_PS_SESSION = "Connect-VIServer {} -User {}" \
-                           " -Password {};$vm = Get-vm -name {};$Output=Invoke-VMScript -vm $vm " \
-                           "-ScriptText {} -GuestUser {} -GuestPassword {}"
+    # run in the PowerCLI worker, which is already connected to the server
+    COPY_VM_GUEST_FILE_CMD = "Copy-VMGuestFile -Source {} -Destination {} -LocalToGuest -VM {} -GuestUser {} " \
+                             "-GuestPassword {}"
+    INVOKE_VM_SCRIPT_CMD = "$vm = Get-vm -name {};$Output=Invoke-VMScript -vm $vm -ScriptText {} -GuestUser {} " \
+                           "-GuestPassword {}"
 
     def create_vm(self, vm_name, os_variant, no_of_cpu=2, disk_size=6, memory_size=4, vm_creation_timeout=1600,
                   vm_parallel=None, vm_create_async=None, mac_addr=None, pool_id=None, pool_vol_id=None,cpu_core_list=None,
@@ -6402,9 +6403,7 @@ class ESXiVmProvider(VMProvider):
               "$vm = get-vm {}; $vm | Get-VMQuestion | Set-VMQuestion -DefaultOption -confirm:$false;" \
               "$toolsStatus = $vm.extensionData.Guest.ToolsStatus;}}" \
               " while($toolsStatus -ne 'toolsOK' -And $tm -le {});".format(vm_name, vm_name, max_wait)
-        self.vmp_execute_host_cmd_esxi(cmd=cmd, cwd=".", timeout=max_wait)
-        cmd = "Start-Sleep -Seconds 30;"
-        self.vmp_execute_host_cmd_esxi(cmd=cmd, cwd=".", timeout=60)
+        self.vmp_execute_host_cmds_esxi([cmd, "Start-Sleep -Seconds 30;"], timeout=max_wait + 60)
 
     def start_vm_install(self, vm_name, vm_parallel=None):
         """
@@ -6898,24 +6897,12 @@ class ESXiVmProvider(VMProvider):
             self._log.info("Copying {} from SUT to VM".format(self.SSH_FILE_NAME))
 
             #===========================================================
-            copy_ssh_file = self.COPY_COMMAND_TO_VM.format(self.sut_ip, self.sut_user, self.sut_pass,source_path,destination_path, vm_name,vm_account, vm_password)
-
-            self._log.info(copy_ssh_file)
-            command_result = os.system(
-                "powershell $progressPreference = 'silentlyContinue'; {}".format(copy_ssh_file))
-
-            #++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-
-
-
+            copy_ssh_file = self.COPY_VM_GUEST_FILE_CMD.format(source_path, destination_path, vm_name, vm_account,
+                                                               vm_password)
             script_block = self.EXTRACT_FILE_STR.format(self.VM_SSH_FOLDER, self.VM_ROOT_PATH)
-
-
-            extract_file = self.ESTABLISH_PS_SESSION.format(self.sut_ip, self.sut_user,self.sut_pass,
-                                                            vm_name, script_block, vm_account, vm_password)
-            self._log.info(extract_file)
-            command_result = os.system(
-                "powershell $progressPreference = 'silentlyContinue'; {}".format(extract_file))
+            extract_file = self.INVOKE_VM_SCRIPT_CMD.format(vm_name, script_block, vm_account, vm_password)
+            self._log.info("{}\n{}".format(copy_ssh_file, extract_file))
+            self.vmp_execute_host_cmds_esxi([copy_ssh_file, extract_file], timeout=self._command_timeout)
             # self._log.debug(command_result)
             self._log.info("Successfully copied OpenSSH file & Extracted in VM.")
         except Exception as ex:
@@ -6957,30 +6944,17 @@ class ESXiVmProvider(VMProvider):
                     self.copy_ssh_file_to_vm(vm_name, vm_account, vm_password, host_path, self.VM_SSH_FOLDER,
                                              common_content_lib_vm_obj=common_content_lib_vm_obj)
 
-                run_ssh_cmd = self.ESTABLISH_PS_SESSION.format(self.sut_ip, self.sut_user, self.sut_pass,
-                                                               vm_name, self.SSH_FILE, vm_account, vm_password)
-
-                start_ssh = self.ESTABLISH_PS_SESSION.format(self.sut_ip, self.sut_user, self.sut_pass,
-                                                             vm_name, self.START_SERVICE_SSHD_CMD, vm_account,
-                                                             vm_password)
-
-                set_ssh_service = self.ESTABLISH_PS_SESSION.format(self.sut_ip, self.sut_user, self.sut_pass,
-                                                                   vm_name, self.SET_SERVICE_CMD, vm_account,
-                                                                   vm_password)
-
-                get_ssh_name = self.ESTABLISH_PS_SESSION.format(self.sut_ip, self.sut_user, self.sut_pass,
-                                                                vm_name, self.GET_SSH_NAME_CMD, vm_account, vm_password)
-
-                ssh_commands_list = [run_ssh_cmd, start_ssh, set_ssh_service, get_ssh_name]
-                for each_command in ssh_commands_list:
-                    try:
-                        command_result = os.system(
-                            "powershell $progressPreference = 'silentlyContinue'; {}".format(each_command))
-                        self._log.debug(command_result)
-                    except:
-                        pass
-                    time.sleep(20)
-                    self._log.info("Successfully Enabled SSH in VM : {}...".format(vm_name))
+                ssh_commands_list = []
+                for script_text in [self.SSH_FILE, self.START_SERVICE_SSHD_CMD, self.SET_SERVICE_CMD,
+                                    self.GET_SSH_NAME_CMD]:
+                    ssh_commands_list.append(self.INVOKE_VM_SCRIPT_CMD.format(vm_name, script_text, vm_account,
+                                                                              vm_password))
+                    ssh_commands_list.append("Start-Sleep -Seconds 20")
+                # all the steps in one round trip to the PowerCLI worker
+                for command_result in self.vmp_execute_host_cmds_esxi(ssh_commands_list,
+                                                                      timeout=self._command_timeout):
+                    self._log.debug(command_result)
+                self._log.info("Successfully Enabled SSH in VM : {}...".format(vm_name))
 
             except Exception as ex:
                 raise ("Error while enabling SSH in VM : {}...".format(ex))
@@ -7687,17 +7661,40 @@ class ESXiVmProvider(VMProvider):
         out, err = self.__vmp_execute_host_cmd(cmd, timeout, cwd, powershell)
         return out.decode(), err.decode()
 
+    @property
+    def powercli_worker(self):
+        """
+        PowerCLI worker of the SUT, it connects to the server once and is shared by all the ESXi commands.
+        """
+        return PowerCliWorker.get(self._log, self.sut_ip, self.sut_user, self.sut_pass)
+
+    def vmp_execute_host_cmds_esxi(self, cmds, timeout=30):
+        """
+        Execute several PowerCLI commands in one round trip to the PowerCLI worker.
+
+        :param cmds: list of PowerCLI commands
+        :param timeout: time out of the whole batch
+        :return: list of PowerCliResult
+        """
+        self._log.debug(f"<{self.sut_ip}> execute host commands {cmds} in PowerCLI")
+        # same margin as vmp_execute_host_cmd
+        results = self.powercli_worker.execute_batch(cmds, timeout=int(timeout * 5))
+        for result in results:
+            self._log.info('return stdout: {}'.format(result.output))
+            if result.error:
+                self._log.debug('return stderr: {}'.format(result.error))
+        return results
+
     def vmp_execute_host_cmd_esxi(self, cmd, cwd=".", timeout=30):
         """
+        Execute the command in the PowerCLI worker, which is already connected to the SUT with
          Set-PowerCLIConfiguration -InvalidCertificateAction Ignore -Confirm:$false -WarningAction 0 2>$null|out-null;
          Connect-VIServer -Server 10.89.91.247 -Protocol https -User root -Password intel@123 -Force -WarningAction 0 2>$null|out-null;
+
+        :param cmd: PowerCLI command
+        :param cwd: unused, kept for compatibility
+        :param timeout: command time out
+        :return: (stdout, stderr)
         """
-        CMD_SUPRESS_CERT_WARN = f'Set-PowerCLIConfiguration -InvalidCertificateAction Ignore -Confirm:$false ' \
-                                f'-WarningAction 0 2>$null|out-null'
-        VMP_CMD_CONNECT_TO_ESXI = f'$Conn = Connect-VIServer -Server {self.sut_ip} ' + \
-                                  f'-Protocol https -User {self.sut_user} ' + \
-                                  f'-Password {self.sut_pass} ' + \
-                                  f'-Force -WarningAction 0 2>$null|out-null'
-        self._log.debug(f"<{self.sut_ip}> execute host command {cmd} in PowerCLI")
-        host_cmd = f"{CMD_SUPRESS_CERT_WARN}; {VMP_CMD_CONNECT_TO_ESXI}; {cmd}"
-        self.vmp_execute_host_cmd(cmd=host_cmd, cwd=cwd, timeout=timeout, powershell=True)
+        result = self.vmp_execute_host_cmds_esxi([cmd], timeout=timeout)[0]
+        return result.output, result.error
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import csv
+import os
+from collections import OrderedDict
+
+from src.lib import content_exceptions
+
+
+class RunningStat(object):
+    """
+    Running min, max, mean and last value of one monitored event, constant memory whatever the run length.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.last = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.last = value
+
+    def merge(self, other):
+        """
+        Add the values of the other RunningStat, e.g. to get the statistics of an event over all the cores.
+        """
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.last = other.last
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def get(self, stat):
+        """
+        :param stat: 'min', 'max', 'mean' or 'last'
+        """
+        return getattr(self, stat)
+
+    def __repr__(self):
+        return "RunningStat(count={}, min={}, max={}, mean={}, last={})".format(self.count, self.min, self.max,
+                                                                             self.mean, self.last)
+
+
+class PqosMonitorIngester(object):
+    """
+    Streaming ingester of the pqos monitoring output, both the text output of "pqos -m/-r ..." and the csv output
+    of "pqos ... -u csv".
+
+    The output is consumed line by line, every line updates the running statistics of its monitored core group,
+    PID or RMID, so long MBM/LLC monitoring runs are ingested in linear time and constant memory:
+
+        TIME 2021-03-18 05:24:52
+            CORE   IPC   MISSES     LLC[KB]   MBL[MB/s]   MBR[MB/s]
+               0  0.51     228k      2160.0         2.5         0.0
+    """
+    DATA_TO_IGNORE = ("NOTE", "CAT", "CMT/MBM", "WARN:")
+    TIME_STR = "TIME"
+    KEY_COLUMNS = ("CORE", "Core", "PID", "PID(s)", "RMID", "SOCKET", "Socket")
+    CSV_TIME_COLUMN = "Time"
+
+    def __init__(self):
+        self.columns = None
+        self.key_columns = []
+        self.intervals = 0
+        # {(key column values): OrderedDict {event column: RunningStat}}
+        self.stats = OrderedDict()
+        self._last_time = None
+        self._csv = False
+
+    @staticmethod
+    def _to_number(value):
+        """
+        Convert the pqos value, the 'k' suffix of the MISSES column is stripped like before ("228k" -> 228).
+        """
+        value = value.strip().rstrip("k")
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+
+    def _set_header(self, columns):
+        self.columns = columns
+        self.key_columns = [column for column in columns if column in self.KEY_COLUMNS or
+                            column == self.CSV_TIME_COLUMN]
+
+    def _add_row(self, values):
+        if self.columns is None or len(values) != len(self.columns):
+            return
+        row = dict(zip(self.columns, values))
+        if self.CSV_TIME_COLUMN in row and row[self.CSV_TIME_COLUMN] != self._last_time:
+            self._last_time = row[self.CSV_TIME_COLUMN]
+            self.intervals += 1
+        key = tuple(row[column].strip() for column in self.key_columns if column != self.CSV_TIME_COLUMN)
+        event_stats = self.stats.get(key)
+        if event_stats is None:
+            event_stats = self.stats[key] = OrderedDict((column, RunningStat()) for column in self.columns
+                                                        if column not in self.key_columns)
+        for column, stat in event_stats.items():
+            try:
+                stat.add(self._to_number(row[column]))
+            except ValueError:
+                pass
+
+    def feed_line(self, line):
+        """
+        Ingest one line of the pqos output.
+        """
+        stripped = line.strip()
+        if not stripped or stripped.startswith(self.DATA_TO_IGNORE):
+            return
+        if self._csv or stripped.startswith(self.CSV_TIME_COLUMN + ","):
+            values = next(csv.reader([stripped]))
+            if values[0] == self.CSV_TIME_COLUMN:
+                self._csv = True
+                self._set_header(values)
+            else:
+                self._add_row(values)
+        elif stripped.startswith(self.TIME_STR):
+            self.intervals += 1
+        elif "CORE" in stripped or stripped.split()[0] in self.KEY_COLUMNS:
+            self._set_header(stripped.split())
+        else:
+            self._add_row(stripped.split())
+
+    def feed(self, lines):
+        """
+        :param lines: pqos output text, or an iterable of its lines, e.g. an open file
+        :return: self
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        for line in lines:
+            self.feed_line(line)
+        return self
+
+    def feed_file(self, file_path):
+        """
+        Ingest a pqos output file, e.g. pqos_mon.csv, line by line.
+        """
+        with open(file_path, "r") as pqos_file:
+            return self.feed(pqos_file)
+
+    @property
+    def event_columns(self):
+        return [column for column in self.columns or [] if column not in self.key_columns]
+
+    def get_stat(self, key, column):
+        """
+        :param key: monitored core group, PID or RMID, e.g. '0'
+        :param column: event column, e.g. 'MBL[MB/s]'
+        :return: RunningStat, None if the key was not monitored
+        """
+        event_stats = self.stats.get(key if isinstance(key, tuple) else (str(key), ))
+        return event_stats.get(column) if event_stats else None
+
+    def column_stat(self, column):
+        """
+        :return: RunningStat of the event column over all the monitored keys
+        """
+        column_stat = RunningStat()
+        for event_stats in self.stats.values():
+            if column in event_stats:
+                column_stat.merge(event_stats[column])
+        return column_stat
+
+    def to_records(self, stat="mean"):
+        """
+        :param stat: 'min', 'max', 'mean' or 'last'
+        :return: list of {column: value} dictionaries, one per monitored key. Numeric key values are int.
+        """
+        key_columns = [column for column in self.key_columns if column != self.CSV_TIME_COLUMN]
+        records = []
+        for key, event_stats in self.stats.items():
+            record = OrderedDict()
+            for column, value in zip(key_columns, key):
+                record[column] = int(value) if value.isdigit() else value
+            for column, running_stat in event_stats.items():
+                record[column] = running_stat.get(stat)
+            records.append(record)
+        return records
+
+    def to_dataframe(self, stat="mean"):
+        """
+        :return: pandas DataFrame of to_records(stat)
+        """
+        import pandas as pd
+        return pd.DataFrame(self.to_records(stat))
+
+    def export(self, file_path, stats=("min", "max", "mean")):
+        """
+        Export the statistics, one row per monitored key and one <event>_<stat> column per event and statistic.
+
+        :param file_path: .csv or .parquet file path, parquet needs pandas with pyarrow or fastparquet
+        :param stats: statistics to export
+        :return: file_path
+        :raise: content_exceptions.TestError if parquet is requested but not supported
+        """
+        key_columns = [column for column in self.key_columns if column != self.CSV_TIME_COLUMN]
+        columns = key_columns + ["{}_{}".format(column, stat) for column in self.event_columns for stat in stats]
+        records = []
+        for key, event_stats in self.stats.items():
+            row = list(key)
+            for running_stat in event_stats.values():
+                row.extend(running_stat.get(stat) for stat in stats)
+            records.append(row)
+
+        if os.path.splitext(file_path)[1].lower() == ".parquet":
+            import pandas as pd
+            try:
+                pd.DataFrame(records, columns=columns).to_parquet(file_path, index=False)
+            except ImportError as ex:
+                raise content_exceptions.TestError("Parquet export is not supported: {}".format(ex))
+            return file_path
+        with open(file_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(columns)
+            writer.writerows(records)
+        return file_path
@@ -31,6 +31,7 @@ import matplotlib.pyplot as plt
 from src.lib import content_exceptions
 from src.lib.install_collateral import InstallCollateral
 from src.lib.dtaf_content_constants import RDTConstants, RootDirectoriesConstants
+from src.rdt.lib.pqos_monitor import PqosMonitorIngester
 
 
 class RdtUtils(object):
@@ -570,24 +571,6 @@ class RdtUtils(object):
 
         return event_df
 
-    def strip_data(self, event_data):
-        """ Get the event result and strips K from the MISSES column
-
-        :param event_data: event monitoring data result
-        :return: return the event data by string k from MISSES column
-        """
-        event_data.loc[:, self.EVENT_MISS] = event_data[self.EVENT_MISS].apply(lambda x: int(x.strip("k")))
-
-        return event_data
-
-    def get_time_index(self, event_output):
-        """This method takes event output and returns the index of TIME string
-
-        :param event_output: event monitoring data result
-        :return: return list of indices of TIME
-        """
-        return [index for index, data in enumerate(event_output.split("\n")) if re.search(self.TIME_STR, data)]
-
     def collect_rdt_statistic_data(self, event_result, stress_run=False):
         """
         This method get the collects the event data while stress is running
@@ -596,53 +579,15 @@ class RdtUtils(object):
         :param stress_run: True if stress is running
         :return: Actual stress data
         """
-        time_index = self.get_time_index(event_result)
-        time_index.append(len(event_result.split("\n")) - 1)
-        monitor_data = pd.DataFrame()
-        for first, second in zip(time_index, time_index[1:]):
-            event_res = "\n".join(event_result.split("\n")[first:second])
-            data = self.strip_data(self.__parse_monitoring_data(event_res))
-            if stress_run:
-                monitor_data = self.get_max_data(monitor_data, data)
-            else:
-                monitor_data = self.get_min_data(monitor_data, data)
+        # the last line of the output is dropped like before, it can be a partially written row
+        ingester = PqosMonitorIngester().feed(event_result.split("\n")[:-1])
+        if ingester.intervals and not ingester.stats:
+            raise content_exceptions.TestFail("Unable to get the data frame with the command output")
+        monitor_data = ingester.to_dataframe("max" if stress_run else "min")
+        self._log.debug("The monitoring data frame is:'{}'".format(monitor_data))
 
         return monitor_data
 
-    def get_max_data(self, event_df_new, event_df_old):
-        """
-        This method get the maximum value from input data frames
-
-        :param event_df_new: event monitoring data result 1
-        :param event_df_old: event monitoring data result 2
-        :return: Actual stress data
-        """
-
-        if event_df_new.empty:
-            return event_df_old
-        for event_col in self.RDT_EVENT_PARAMETERS_LIST:
-            # create new column in df1 to check if value match
-            event_df_new[event_col] = np.where(event_df_new[event_col] > event_df_old[event_col],
-                                               event_df_new[event_col], event_df_old[event_col])
-        return event_df_new
-
-    def get_min_data(self, event_df_new, event_df_old):
-        """
-        This method get the minimum value from input data frames
-
-        :param event_df_new: event monitoring data result 1
-        :param event_df_old: event monitoring data result 2
-        :return: Actual default data
-        """
-
-        if event_df_new.empty:
-            return event_df_old
-        for event_col in self.RDT_EVENT_PARAMETERS_LIST:
-            # create new column in df1 to check if value match
-            event_df_new[event_col] = np.where(event_df_new[event_col] < event_df_old[event_col],
-                                               event_df_new[event_col], event_df_old[event_col])
-        return event_df_new
-
     def check_rdt_event_statistics_increased(self, data_without_stress, data_with_stress):
         """
         This Function compares two data frames of rdt event values and checks whether
@@ -1342,28 +1287,17 @@ class RdtUtils(object):
         # wait for 30 seconds before reading the csv file to fetch the consistent data.
         time.sleep(30)
         self._os.copy_file_from_sut_to_local(csv_file, host_path)
-        df = pd.read_csv(host_path)
-        self._log.debug("Data read from csv file : {}".format(df))
-        if len(cores) == 1:
-            # Fetch core 0 value from pqos output
-            core0_df = df.loc[df[RDTConstants.RDT_CORE_STR] == int(cores[0])]
-            core0_df = core0_df.iloc[[-1]]
-            socket0_core0 = core0_df[RDTConstants.RDT_MBL_STR].tolist()[0]
-            if mbr:
-                socket0_core0 = core0_df[RDTConstants.RDT_MBR_STR].tolist()[0]
-            return [socket0_core0]
-
-        # Fetch core 0 value from pqos output
-        core0_df = df.loc[df[RDTConstants.RDT_CORE_STR] == int(cores[0])]
-        core0_df = core0_df.iloc[[-1]]
-        core0 = core0_df[RDTConstants.RDT_MBL_STR].tolist()[0]
-
-        # Fetch core 1 value from pqos output
-        core1_df = df.loc[df[RDTConstants.RDT_CORE_STR] == int(cores[1])]
-        core1_df = core1_df.iloc[[-1]]
-        core1 = core1_df[RDTConstants.RDT_MBL_STR].tolist()[0]
-
-        return [core0, core1]
+        ingester = PqosMonitorIngester().feed_file(host_path)
+        event = RDTConstants.RDT_MBR_STR if mbr and len(cores) == 1 else RDTConstants.RDT_MBL_STR
+        values = []
+        for core in cores[:2]:
+            core_stat = ingester.get_stat(core, event)
+            if core_stat is None:
+                raise content_exceptions.TestFail("Core {} is not monitored in {}".format(core, host_path))
+            values.append(core_stat.last)
+        self._log.debug("Last {} values of the cores {} : {}".format(event, cores, values))
+
+        return values
 
     def run_pcm_tool(self, cmd, filename, host_path, cwd):
         """
@@ -1413,14 +1347,12 @@ class RdtUtils(object):
         self._log.info("Copy pqos_mon.csv file to Host to read the data")
         time.sleep(self.EXEC_TIME)
         self._os.copy_file_from_sut_to_local(csv_file, host_path)
-        # read the csv file content into a dataframe.
-        df = pd.read_csv(host_path)
-        self._log.debug("Data read from csv file : {}".format(df))
+        # stream the csv file content into the running statistics.
+        ingester = PqosMonitorIngester().feed_file(host_path)
         # Fetch Required value from pqos output
-        if mbl:
-            return sum(df[RDTConstants.RDT_MBL_STR]) / len(df[RDTConstants.RDT_MBL_STR])
-        if not mbl:
-            return sum(df[RDTConstants.RDT_MBR_STR]) / len(df[RDTConstants.RDT_MBR_STR])
+        event_stat = ingester.column_stat(RDTConstants.RDT_MBL_STR if mbl else RDTConstants.RDT_MBR_STR)
+        self._log.debug("Statistics read from csv file : {}".format(event_stat))
+        return event_stat.mean
 
     def run_taskset_file(self, stream_file_path):
         """
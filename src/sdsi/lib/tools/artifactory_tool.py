@@ -28,9 +28,9 @@
 import os
 from logging import Logger
 
-import requests
 from dtaf_core.providers.sut_os_provider import SutOsProvider
 
+from src.lib.collateral_cache import CollateralCache, CollateralCacheError
 from src.sdsi.lib.tools.sut_os_tool import SutOsTool
 
 class ArtifactoryInstallError(RuntimeError):
@@ -40,6 +40,8 @@ class ArtifactoryTool:
     """Class to install tools from artifactory."""
     ARTIFACTORY_URL = "https://ubit-artifactory-ba.intel.com/artifactory/list/dcg-dea-srvplat-local/{}"
     STRESSAPP_TOOL_LINUX = "Automation_Tools/SPR/Linux/stressapptest"
+    INSTALL_FOLDER = 'C:\\Automation'
+    CACHE_FOLDER = os.path.join(INSTALL_FOLDER, 'Tools', '.collateral_cache')
 
     def __init__(self, log: Logger, sut_os: SutOsProvider) -> None:
         """Initialize the artifactory tool.
@@ -50,6 +52,7 @@ class ArtifactoryTool:
         """
         self._sut_os_tool = SutOsTool(log, sut_os)
         self._log = log
+        self._cache = CollateralCache(log, self.CACHE_FOLDER)
 
     def download_tool_to_host(self, tool_path: str) -> str:
         """Performs the artifactory tool download to the host.
@@ -65,20 +68,17 @@ class ArtifactoryTool:
             ArtifactoryInstallError: If the tool fails to download from artifactory.
         """
         tool_name = os.path.basename(tool_path)
-        install_folder = 'C:\\Automation'
-        host_tool_directory = os.path.join(install_folder, tool_path)
+        host_tool_directory = os.path.join(self.INSTALL_FOLDER, tool_path)
 
         self._log.info(f"Requesting {tool_name} tool from artifactory.")
-        res = requests.get(self.ARTIFACTORY_URL.format(tool_path))
-        if res.status_code != 200:
-            error_msg = f'Failed to install tool from artifactory, response code: {res.status_code}'
+        try:
+            self._cache.fetch(self.ARTIFACTORY_URL.format(tool_path), host_tool_directory)
+        except CollateralCacheError as ex:
+            error_msg = f'Failed to install tool from artifactory: {ex}'
             self._log.error(error_msg)
             raise ArtifactoryInstallError(error_msg)
 
-        self._log.info(f"Installing {tool_name} tool from artifactory.")
-        os.makedirs(os.path.join(install_folder, os.path.dirname(tool_path)), exist_ok=True)
-        with open(host_tool_directory, 'wb') as tool_file:
-            [tool_file.write(chunk) for chunk in res.iter_content(chunk_size=512)]
+        self._log.info(f"Installed {tool_name} tool from artifactory.")
         return host_tool_directory
 
     def download_tool_to_sut(self, tool_path: str, sut_path: str) -> str:
@@ -27,26 +27,20 @@
 
         redfish_tool.curl_post(power_control_url, power_on_cmd)
 """
-import subprocess
-
+from src.lib.redfish_client import RedfishClient
 from src.sdsi.lib.tools.automation_config_tool import AutomationConfigTool
 
 
-# TODO REFACTOR THIS CLASS, REALLY POOR IMPLEMENTATION + DOCUMENTATION. USE REQUEST LIBRARY INSTEAD OF CURL COMMANDS.
 class RedFishTool:
     """
     This provides an interface to interact with the Redfish API.
     """
-    _CURL_POST_OPTIONS = " -X POST -H \"Content-Type: application/json\" -d \""
-    _CURL_POST_WITHOUT_BODY = " -X POST"
-    _CURL_PATCH = " -X PATCH -H \"Content-Type: application/json\" -d \""
     BMC_CFG_OPTS = 'suts/sut/silicon/bmc'
     BMC_CFG_NAME = "bmc"
     BMC_CRED = "credentials"
     BMC_IPV4 = "ipv4"
     BMC_USER = "@user"
     BMC_PWD = "@password"
-    LOOP_COUNT = 5
 
     def __init__(self, test_log, config):
         """
@@ -63,87 +57,40 @@ class RedFishTool:
         self.bmc_user = automation_config_tool.get_config_value("Section0", "username")
         self.bmc_pass = automation_config_tool.get_config_value("Section0", "password")
 
-        self._base_url = " https://" + str(self.bmc_ip)
-        self.curl_base_command = "curl -u {}:{} -k --insecure ".format(self.bmc_user, self.bmc_pass)
+        self.redfish_client: RedfishClient = RedfishClient.shared(self._log, self.bmc_ip, self.bmc_user,
+                                                                  self.bmc_pass)
 
-    def curl_get(self, url_string):
+    def curl_get(self, url_string: str) -> bytes:
         """
-        This method executes the get requests of Redfish APIs using curl command and returns the Output string
+        This method executes the get requests of Redfish APIs and returns the Output string
 
         :returns: output json response from API.
         """
-        curl_command = self.curl_base_command + self._base_url + str(url_string)
-        self._log.info("Execute the curl command : {}".format(curl_command))
-
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "Curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("Curl command error log = '{}".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("Curl command '{}' executed successfully...".format(curl_command))
-            self._log.debug("---------curl command result start----------")
-            self._log.debug(str(result.stdout.decode('utf-8').strip("\r\n")))
-            self._log.debug("---------curl command result end------------")
-
-        return result.stdout
-
-    def curl_post(self, url_string, request_body=""):
+        self._log.info("Execute the Redfish GET : {}".format(url_string))
+        result = self.redfish_client.curl_request("GET", str(url_string))
+        self._log.debug("---------Redfish GET result start----------")
+        self._log.debug(str(result.decode('utf-8').strip("\r\n")))
+        self._log.debug("---------Redfish GET result end------------")
+        return result
+
+    def curl_post(self, url_string: str, request_body: str = "") -> bytes:
         """
-        This method executes post Redfish APIs using curl command and returns the Output string
+        This method executes post Redfish APIs and returns the Output string
 
         :returns: output json response from API.
         """
-        if request_body:
-            curl_command = self.curl_base_command + self._base_url + str(url_string) + self._CURL_POST_OPTIONS + \
-                           str(request_body)
-        else:
-            curl_command = self.curl_base_command + self._base_url + str(url_string) + self._CURL_POST_WITHOUT_BODY
-
-        self._log.info("Execute the curl command : {}".format(curl_command))
+        self._log.info("Execute the Redfish POST : {} {}".format(url_string, request_body))
+        result = self.redfish_client.curl_request("POST", str(url_string), request_body)
+        self._log.info("Redfish POST result = " + str(result.decode('utf-8').strip("\r\n")))
+        return result
 
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "Curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("StdError='{}'".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("The curl command '{}' executed successfully..".format(curl_command))
-            self._log.info("Curl command result = " + str(result.stdout.decode('utf-8').strip("\r\n")))
-
-        return result.stdout
-
-    def curl_patch(self, url_string, request_body=""):
+    def curl_patch(self, url_string: str, request_body: str = "") -> bytes:
         """
-        This method executes Patch Redfish APIs using curl command and returns the Output string
+        This method executes Patch Redfish APIs and returns the Output string including the response headers
 
         :returns: output json response from API.
         """
-        curl_command = self.curl_base_command + " -i " + self._base_url + url_string + self._CURL_PATCH + request_body
-        self._log.info("Execute the curl command : {}".format(curl_command))
-
-        for count in range(self.LOOP_COUNT):
-            result = subprocess.run(curl_command, stdout=subprocess.PIPE)
-            if result.returncode == 0:
-                break
-
-        if result.returncode != 0:
-            log_error = "The curl command '{}' failed with return code : {}".format(curl_command, result.returncode)
-            self._log.error(log_error)
-            self._log.error("StdOut='{}'".format(result.stderr))
-            raise RuntimeError(log_error)
-        else:
-            self._log.info("The curl command '{}' executed successfully.".format(curl_command))
-            self._log.info("The Curl command result = " + str(result.stdout.decode('utf-8').strip("\r\n")))
-
-        return result.stdout
+        self._log.info("Execute the Redfish PATCH : {} {}".format(url_string, request_body))
+        result = self.redfish_client.curl_request("PATCH", url_string, request_body, include_headers=True)
+        self._log.info("The Redfish PATCH result = " + str(result.decode('utf-8').strip("\r\n")))
+        return result
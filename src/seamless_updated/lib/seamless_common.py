@@ -55,6 +55,7 @@ from src.lib.bios_util import BiosUtil
 from dtaf_core.providers.console_log import ConsoleLogProvider
 from dtaf_core.lib.base_test_case import BaseTestCase
 from src.lib.content_configuration import ContentConfiguration
+from src.lib.console_pattern_matcher import StreamPatternMatcher
 
 from dtaf_core.providers.dc_power import DcPowerControlProvider
 from dtaf_core.providers.ac_power import AcPowerControlProvider
@@ -344,29 +345,16 @@ class SeamlessBaseTest(BaseTestCase):
         :param serial_port: Port number for bios
         :param timeout_seconds: timeout for connecion
         """
-        time_end = datetime.now() + timedelta(seconds=timeout_seconds)
         self._log.info("Waiting for BIOS boot. Timeout is " + str(timeout_seconds))
-        serial_data = ""
         self._last_bios_version = ""
-        while True:
-            if datetime.now() > time_end:
-                self._log.info("Timeout waiting for BIOS boot")
-                return False
-
-            serial_data += serial_port.read(1)
-
-            if len(self._last_bios_version) == 0:
-                # Bios ID: WLYDCRB1.SFU.0013.D27.1911260642
-                m = re.search("Bios ID: [A-Z0-9]+\\.[A-Z]+\\.[0-9]+\\.[0-9A-Z]+\\.[0-9]+(.)*\\n", serial_data)
-                # match_string = ""
-                if m is not None:
-                    try:
-                        match_string = m.group(0)
-                        self._last_bios_version = string.strip(string.split(match_string, ' ')[2])
-                        self._log.info("Found BIOS version: " + self._last_bios_version)
-                        break
-                    except:
-                        self._log.debug("Error matching BIOS version")
+        # Bios ID: WLYDCRB1.SFU.0013.D27.1911260642
+        matcher = StreamPatternMatcher("Bios ID: [A-Z0-9]+\\.[A-Z]+\\.[0-9]+\\.[0-9A-Z]+\\.[0-9]+(.)*\\n")
+        result = matcher.expect(lambda: self._read_serial_chunk(serial_port), timeout_seconds)
+        if result is None:
+            self._log.info("Timeout waiting for BIOS boot")
+            return False
+        self._last_bios_version = result[1].group(0).split(' ')[2].strip()
+        self._log.info("Found BIOS version: " + self._last_bios_version)
 
         self.locate_bmc_ip(is_post_power_cycle=True)
 
@@ -378,33 +366,46 @@ class SeamlessBaseTest(BaseTestCase):
         :param clear_first: Clear old output
         :return return code
         """
-        time_end = datetime.now() + timedelta(seconds=timeout_seconds)
         self._log.info("Waiting for prompt. Timeout is " + str(timeout_seconds))
         return_code = self.AT_NO_PROMPT
         if clear_first:
             self._serial_output = ""
 
-        while True:
-            if datetime.now() > time_end:
-                self._log.info("Timeout waiting for prompt")
-                break
-
-            self._serial_output += serial_port.read(1)
-            if self.BMC_USER_PROMPT in self._serial_output:
-                self._log.info("Found user name prompt")
-                return_code = self.AT_USERNAME_PROMPT
-                break
-            if self.BMC_PASSWORD_PROMPT in self._serial_output:
-                self._log.info("Found password prompt")
-                return_code = self.AT_PASSWORD_PROMPT
-                break
-            if self.BMC_COMMAND_PROMPT in self._serial_output:
-                self._log.info("Found command prompt")
-                return_code = self.AT_COMMAND_PROMPT
-                break
+        prompts = {self.AT_USERNAME_PROMPT: re.escape(self.BMC_USER_PROMPT),
+                   self.AT_PASSWORD_PROMPT: re.escape(self.BMC_PASSWORD_PROMPT),
+                   self.AT_COMMAND_PROMPT: re.escape(self.BMC_COMMAND_PROMPT)}
+        prompt_names = {self.AT_USERNAME_PROMPT: "user name", self.AT_PASSWORD_PROMPT: "password",
+                        self.AT_COMMAND_PROMPT: "command"}
+        matcher = StreamPatternMatcher(prompts)
+        serial_output = [self._serial_output]
+
+        def read_chunk():
+            chunk = self._read_serial_chunk(serial_port)
+            serial_output.append(chunk)
+            return chunk
+
+        result = matcher.feed(self._serial_output) or matcher.expect(read_chunk, timeout_seconds)
+        self._serial_output = "".join(serial_output)
+        if result is None:
+            self._log.info("Timeout waiting for prompt")
+        else:
+            return_code = result[0]
+            self._log.info("Found {} prompt".format(prompt_names[return_code]))
 
         return return_code
 
+    @staticmethod
+    def _read_serial_chunk(serial_port):
+        """
+        Read all the data waiting in the serial port, blocks up to the port timeout for the first byte.
+        :param serial_port: Serial port
+        :return decoded data
+        """
+        data = serial_port.read(serial_port.in_waiting or 1)
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="ignore")
+        return data
+
     def get_sel(self, show_log=False):
         """
         Get system event log from BMC
@@ -1,4 +1,5 @@
 import os
+import json
 import time
 from pathlib import Path
 import re
@@ -18,19 +19,16 @@ def check_tool_installation(tool_name):
         print(f"Tool:{tool} has not been installed !")
 
 def scan_disks():
-    scan_out=os.popen("lsblk -dpn |awk '{print $1}'")
-    scan_out=scan_out.read()
-    disk_list=[]
+    # one lsblk call for all disks and their partitions
+    scan_out=json.loads(os.popen("lsblk -J -p -o NAME,TYPE").read())
     free_disk_list=[]
-    
-    for line in scan_out.splitlines():
-        disk_status=os.popen("lsblk -lpn " + line + " | awk '{print $1}'").read()
-        disk_partition_number = os.popen(f"lsblk -lpn {line} |grep -i 'part' -c").read()
-        
-        if int(disk_partition_number) == 0:
-            free_disk_list.append(line)
-        
-        disk_list.append(line)
+
+    for disk in scan_out["blockdevices"]:
+        if disk.get("type") != "disk":
+            continue
+        partitions=[child for child in disk.get("children", []) if child.get("type") == "part"]
+        if len(partitions) == 0:
+            free_disk_list.append(disk["name"])
 
     return free_disk_list[-1]
 
@@ -46,6 +46,8 @@ from src.lib.content_artifactory_utils import ContentArtifactoryUtils
 from src.lib.dtaf_content_constants import TimeConstants, DynamoToolConstants, IOmeterToolConstants, Mprime95ToolConstant
 from src.lib.common_content_lib import VmUserLin
 from src.lib.common_content_lib import VmUserWin
+from src.lib.parallel_task_runner import ParallelTaskRunner
+from src.lib.powercli_worker import PowerCliWorker
 
 from dtaf_core.providers.provider_factory import ProviderFactory
 from dtaf_core.providers.internal.ssh_sut_os_provider import SshSutOsProvider
@@ -232,6 +234,7 @@ class VirtualizationCommon(ContentBaseTestCase):
     SOCKET = "Socket\(s\):\s+([0-9]+)"
     vm_create_thread_list = []
     vm_create_key_lock = threading.Lock()
+    VM_CREATE_MAX_PARALLEL = 8
 
     MLC_TOOL_CMD = "./mlc"
     MLC_STR = "mlc"
@@ -290,6 +293,7 @@ class VirtualizationCommon(ContentBaseTestCase):
         self._common_content_lib = CommonContentLib(self._log, os_obj, cfg_opts)
         self._sut_os = self.os.os_type.lower()
         self._cfg_opts = cfg_opts
+        self._vm_task_runner = ParallelTaskRunner(self._log, self.VM_CREATE_MAX_PARALLEL)
         self.vcenter_ip = self._common_content_configuration.get_vcenter_ip()
         self.VCENTER_USERNAME = self._common_content_configuration.get_vcenter_username()
         self.VCENTER_PASSWORD = self._common_content_configuration.get_vcenter_password()
@@ -582,11 +586,10 @@ class VirtualizationCommon(ContentBaseTestCase):
         vm_thread = None
         if vm_parallel is not None:
             # Trigger VM creation in a thread
-            vm_thread = threading.Thread(target=self.__create_vm_generic,
-                                         args=(vm_name, vm_type, vm_parallel,
-                                               vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
-                                               nw_bridge, devlist, "qemu"))
-            vm_thread.start()
+            vm_thread = self._vm_task_runner.submit(vm_name, self.__create_vm_generic,
+                                                    vm_name, vm_type, vm_parallel,
+                                                    vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
+                                                    nw_bridge, devlist, "qemu")
             self._log.info(" Started VM creation thread for VM:{}.".format(vm_name))
             self.vm_create_thread_list.append(vm_thread)
         else:
@@ -629,12 +632,10 @@ class VirtualizationCommon(ContentBaseTestCase):
         devlist=[]
         if vm_parallel is not None:
             # Trigger VM creation in a thread
-            vm_thread = threading.Thread(target=self.__create_vm_generic,
-                                              args=(vm_name, vm_type, vm_parallel,
-                                              vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
-                                              nw_bridge, devlist,
-                                              None))
-            vm_thread.start()
+            vm_thread = self._vm_task_runner.submit(vm_name, self.__create_vm_generic,
+                                                    vm_name, vm_type, vm_parallel,
+                                                    vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
+                                                    nw_bridge, devlist, None)
             self._log.info(" Started VM creation thread for VM:{}.".format(vm_name))
             self.vm_create_thread_list.append(vm_thread)
         else:
@@ -646,14 +647,23 @@ class VirtualizationCommon(ContentBaseTestCase):
 
         return vm_thread
 
-    def create_vm_wait(self, thread_list=None):
+    def create_vm_wait(self, thread_list=None, deadline=None):
+        """
+        Wait for the VMs created in parallel by create_vm_generic, create_vm_qemu_generic or
+        create_vmware_vm_generic.
+
+        :param thread_list: tasks returned by the create methods, the pending VM creations if None
+        :param deadline: overall timeout in seconds for all VMs, no limit if None
+        :return: ParallelTaskReport with the result, duration and timeout flag of every VM creation
+        """
         if thread_list is None:
-            thread_list = self.vm_create_thread_list
-        for index, thread_vm in enumerate(thread_list):
-            self._log.info(" Waiting for thread for VM:{}.".format(index))
-            thread_vm.join()
-            self._log.info(" Cleaned thread for VM:{}.".format(index))
+            thread_list = list(self.vm_create_thread_list)
+            del self.vm_create_thread_list[:]
+        self._log.info(" Waiting for {} VM creation(s): {}".format(len(thread_list),
+                                                                    [vm_task.name for vm_task in thread_list]))
+        report = self._vm_task_runner.wait(thread_list, deadline)
         time.sleep(self.VM_WAIT_TIME)
+        return report
 
     def create_hyperv_vm(self, vm_name, vm_type, vm_memory=None, vhd_dir_path=None):
         """
@@ -736,12 +746,10 @@ class VirtualizationCommon(ContentBaseTestCase):
         devlist=[]
         if vm_parallel is not None:
             # Trigger VM creation in a thread
-            vm_thread = threading.Thread(target=self.__create_vmware_vm_generic,
-                                              args=(vm_name, vm_type, vm_parallel,
-                                              vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
-                                              nw_bridge, devlist, use_powercli,
-                                              None))
-            vm_thread.start()
+            vm_thread = self._vm_task_runner.submit(vm_name, self.__create_vmware_vm_generic,
+                                                    vm_name, vm_type, vm_parallel,
+                                                    vm_create_async, mac_addr, pool_id, pool_vol_id, cpu_core_list,
+                                                    nw_bridge, devlist, use_powercli, None)
             self._log.info(" Started VM creation thread for VM:{}.".format(vm_name))
             self.vm_create_thread_list.append(vm_thread)
         else:
@@ -5188,14 +5196,25 @@ class VirtualizationCommon(ContentBaseTestCase):
             raise content_exceptions.TestFail(ex)
 
     def connect_vcenter(self, vcenter_ip, vcenter_user, vcenter_password, cmd, cwd=".", timeout=30):
-        CMD_SUPRESS_CERT_WARN = f'Set-PowerCLIConfiguration -InvalidCertificateAction Ignore -Confirm:$false ' \
-                                f'-WarningAction 0 2>$null|out-null'
-        CMD_CONNECT_TO_ESXI_vcenter = f'Connect-VIServer -Server {vcenter_ip} ' + \
-                                      f'-Protocol https -User {vcenter_user} ' + \
-                                      f'-Password {vcenter_password}'
-        self._log.info(f"<{vcenter_ip}> execute host command {CMD_CONNECT_TO_ESXI_vcenter} in PowerCLI")
-        host_cmd = f"{CMD_SUPRESS_CERT_WARN}; {CMD_CONNECT_TO_ESXI_vcenter}; {cmd}"
-        return self._vm_provider.vmp_execute_host_cmd(cmd=host_cmd, cwd=cwd, timeout=timeout, powershell=True)
+        """
+        Execute the PowerCLI command on the vCenter server. The PowerCLI worker of the vCenter connects once and is
+        reused by the following calls.
+
+        :param vcenter_ip: vCenter server ip
+        :param vcenter_user: vCenter user name
+        :param vcenter_password: vCenter password
+        :param cmd: PowerCLI command
+        :param cwd: unused, kept for compatibility
+        :param timeout: command time out
+        :return: (stdout, stderr)
+        """
+        self._log.info(f"<{vcenter_ip}> execute host command {cmd} in PowerCLI")
+        worker = PowerCliWorker.get(self._log, vcenter_ip, vcenter_user, vcenter_password)
+        # same margin as vmp_execute_host_cmd
+        result = worker.execute(cmd, timeout=int(timeout * 5))
+        if result.error:
+            self._log.debug(f"return stderr: {result.error}")
+        return result.output, result.error
 
     def migrate_vm_to_new_datastore(self, vm_name, dest_datastore):
         try:
@@ -5219,7 +5238,7 @@ class VirtualizationCommon(ContentBaseTestCase):
             result_p = self.connect_vcenter(self.vcenter_ip, self.VCENTER_USERNAME, self.VCENTER_PASSWORD,
                                             cmd_get_datastore2)
             for word in result_p:
-                if b'datastore_new' in word:
+                if 'datastore_new' in word:
                     self._log.info('Vm migrated successfully to new datastore')
                     return 0
             else:
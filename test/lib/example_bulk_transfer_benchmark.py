@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from dtaf_core.lib.base_test_case import BaseTestCase
+from dtaf_core.lib.dtaf_constants import Framework
+from dtaf_core.providers.provider_factory import ProviderFactory
+from dtaf_core.providers.sut_os_provider import SutOsProvider
+
+from src.lib.bulk_transfer import BulkTransfer
+from src.lib.content_configuration import ContentConfiguration
+
+
+class ExampleBulkTransferBenchmark(BaseTestCase):
+    """
+    Compare the per file copy with the bulk archive transfer, for a log set of many small files on a Linux SUT.
+    """
+    SUT_LOG_DIR = "/tmp/bulk_transfer_benchmark"
+    CREATE_FILES_CMD = "rm -rf {0} && mkdir -p {0} && cd {0} && for i in $(seq 1 {1}); do " \
+                       "head -c {2} /dev/urandom | base64 > file_$i.log; done"
+
+    def __init__(self, test_log, arguments, cfg_opts):
+        super(ExampleBulkTransferBenchmark, self).__init__(test_log, arguments, cfg_opts)
+        sut_os_cfg = cfg_opts.find(SutOsProvider.DEFAULT_CONFIG_PATH)
+        self._os = ProviderFactory.create(sut_os_cfg, test_log)  # type: SutOsProvider
+        self._command_timeout = ContentConfiguration(test_log).get_command_timeout()
+        self._number_of_files = arguments.number_of_files
+        self._file_size = arguments.file_size
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super(ExampleBulkTransferBenchmark, cls).add_arguments(parser)
+        parser.add_argument("--number-of-files", action="store", type=int, default=1000, dest="number_of_files",
+                            help="Number of log files created on the SUT")
+        parser.add_argument("--file-size", action="store", type=int, default=2048, dest="file_size",
+                            help="Random bytes per log file")
+
+    def _per_file_pull(self, host_dir):
+        log_names = self._os.execute("ls *.log", self._command_timeout, cwd=self.SUT_LOG_DIR).stdout.split()
+        for log_name in log_names:
+            self._os.copy_file_from_sut_to_local(self.SUT_LOG_DIR + "/" + log_name, os.path.join(host_dir, log_name))
+        return len(log_names)
+
+    def _per_file_push(self, local_dir, sut_dir):
+        self._os.execute("mkdir -p {}".format(sut_dir), self._command_timeout)
+        for file_name in os.listdir(local_dir):
+            self._os.copy_local_file_to_sut(os.path.join(local_dir, file_name), sut_dir)
+
+    def execute(self):
+        self._os.execute(self.CREATE_FILES_CMD.format(self.SUT_LOG_DIR, self._number_of_files, self._file_size),
+                         self._command_timeout * 10)
+        bulk_transfer = BulkTransfer(self._log, self._os, self._command_timeout)
+        per_file_dir = tempfile.mkdtemp()
+        bulk_dir = tempfile.mkdtemp()
+        try:
+            start = timeit.default_timer()
+            files_copied = self._per_file_pull(per_file_dir)
+            per_file_pull_time = timeit.default_timer() - start
+
+            manifest = bulk_transfer.pull(self.SUT_LOG_DIR, bulk_dir, "*.log")
+            self._log.info("Pull of {} files: per file copy {:.2f} sec, bulk transfer {:.2f} sec".format(
+                files_copied, per_file_pull_time, manifest.elapsed_time))
+            if len(manifest.files) != files_copied:
+                self._log.error("Bulk transfer copied {} files instead of {}".format(len(manifest.files),
+                                                                                   files_copied))
+                return False
+
+            start = timeit.default_timer()
+            self._per_file_push(per_file_dir, self.SUT_LOG_DIR + "_push")
+            per_file_push_time = timeit.default_timer() - start
+
+            manifest = bulk_transfer.push(bulk_dir, self.SUT_LOG_DIR + "_push", clean=True)
+            self._log.info("Push of {} files: per file copy {:.2f} sec, bulk transfer {:.2f} sec".format(
+                len(manifest.files), per_file_push_time, manifest.elapsed_time))
+        finally:
+            shutil.rmtree(per_file_dir, ignore_errors=True)
+            shutil.rmtree(bulk_dir, ignore_errors=True)
+            self._os.execute("rm -rf {0} {0}_push".format(self.SUT_LOG_DIR), self._command_timeout)
+        return True
+
+
+if __name__ == "__main__":
+    sys.exit(Framework.TEST_RESULT_PASS if ExampleBulkTransferBenchmark.main() else Framework.TEST_RESULT_FAIL)
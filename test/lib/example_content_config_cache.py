@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import sys
+import timeit
+
+from dtaf_core.lib.base_test_case import BaseTestCase
+from dtaf_core.lib.dtaf_constants import Framework
+
+from src.lib.content_configuration import ContentConfiguration
+
+
+class ExampleContentConfigCache(BaseTestCase):
+    """
+    Micro benchmark of the content configuration getters with a cold and a warm configuration cache.
+    """
+    NUMBER_OF_CALLS = 100
+
+    def __init__(self, test_log, arguments, cfg_opts):
+        super(ExampleContentConfigCache, self).__init__(test_log, arguments, cfg_opts)
+        self._content_config = ContentConfiguration(test_log)
+
+    def _time_getters(self):
+        """
+        Time a mix of single attribute getters and whole configuration getters.
+
+        :return: average latency of one getter call in milli seconds.
+        """
+        start = timeit.default_timer()
+        for _ in range(self.NUMBER_OF_CALLS):
+            self._content_config.get_xmlcli_tools_name()
+            self._content_config.get_reboot_timeout()
+            self._content_config.get_profile0_params()
+        return (timeit.default_timer() - start) * 1000 / (self.NUMBER_OF_CALLS * 3)
+
+    def execute(self):
+        cold_latencies = []
+        for _ in range(self.NUMBER_OF_CALLS):
+            ContentConfiguration.clear_cache()
+            start = timeit.default_timer()
+            self._content_config.get_xmlcli_tools_name()
+            cold_latencies.append((timeit.default_timer() - start) * 1000)
+        cold_latency = sum(cold_latencies) / len(cold_latencies)
+
+        warm_latency = self._time_getters()
+        self._log.info("Cold getter latency: {:.3f} ms".format(cold_latency))
+        self._log.info("Warm getter latency: {:.3f} ms".format(warm_latency))
+        return warm_latency < cold_latency
+
+
+if __name__ == "__main__":
+    sys.exit(Framework.TEST_RESULT_PASS if ExampleContentConfigCache.main() else Framework.TEST_RESULT_FAIL)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+from dtaf_core.lib.base_test_case import BaseTestCase
+from dtaf_core.lib.dtaf_constants import Framework
+
+from src.lib.mlc_utils import MlcUtils
+
+
+def legacy_get_numa_node_data_set(out_data_list, line, index):
+    """
+    Node 0 and Node 1 rows of the matrix starting at index, as parsed before MlcLogParser.
+    """
+    if not re.findall(r"\ANuma node", line):
+        return None
+    data_set = {}
+    for node in (0, 1):
+        node_data = out_data_list[index + 1 + node].split("\t")[1:-3]
+        data_set["Node {}".format(node)] = [0 if value == '-' else float(value) for value in node_data]
+    return data_set
+
+
+def legacy_generate_mlc_log_data_set(log_path, encoding_type='utf-8'):
+    """
+    MlcUtils.generate_mlc_log_data_set as it was before MlcLogParser: section boundaries found with one regex per
+    section name and line, then the sections scanned again per line with per node regular expressions.
+    """
+    idle_latencies_data_set = None
+    memory_bw_between_node_data_set = None
+    index_list = []
+    flag = False
+    with open(log_path, 'r', encoding=encoding_type) as fp:
+        mlc_out_list = fp.readlines()
+    for line in mlc_out_list:
+        for section in ("Measuring idle latencies", "Measuring Peak Injection Memory Bandwidths",
+                        "Measuring Memory Bandwidths", "Measuring Loaded Latencies", "Measuring cache-to-cache"):
+            if re.findall(section, line):
+                index_list.append(int(mlc_out_list.index(line)))
+
+    peak_memory_bw = {"ALL Reads": None, "3:1 Reads-Writes": None, "2:1 Reads-Writes": None,
+                      "1:1 Reads-Writes": None, "Stream-triad like": None}
+    hit_latency = None
+    hitm_latency = None
+    latency_list = []
+    for index, line in enumerate(mlc_out_list):
+        if index_list[0] <= index <= index_list[1]:
+            if legacy_get_numa_node_data_set(mlc_out_list, line, index):
+                idle_latencies_data_set = legacy_get_numa_node_data_set(mlc_out_list, line, index)
+
+        if index_list[1] <= index <= index_list[2]:
+            for key in peak_memory_bw:
+                match = re.findall(r"\A" + re.escape(key) + ".*", line)
+                if match:
+                    peak_memory_bw[key] = float(match[0].split(":")[-1].strip("\t"))
+
+        if index_list[2] <= index <= index_list[3]:
+            if legacy_get_numa_node_data_set(mlc_out_list, line, index):
+                memory_bw_between_node_data_set = legacy_get_numa_node_data_set(mlc_out_list, line, index)
+
+        if index_list[3] < index < index_list[4] - 1:
+            if flag:
+                latency_list.append(float(mlc_out_list[index].split("\t")[1]))
+            if "====" in line:
+                flag = True
+
+        if index_list[4] < index:
+            hit_match = re.findall(r"\ALocal Socket L2->L2 HIT\s.*", line)
+            if hit_match:
+                hit_latency = float(hit_match[0].split("\t")[1])
+            hitm_match = re.findall(r"\ALocal Socket L2->L2 HITM.*", line)
+            if hitm_match:
+                hitm_latency = float(hitm_match[0].split("\t")[1])
+
+    return idle_latencies_data_set, peak_memory_bw, memory_bw_between_node_data_set, {'Latency': latency_list}, \
+        {'HIT latency': hit_latency, 'HITM latency': hitm_latency}
+
+
+class ExampleMlcParserBenchmark(BaseTestCase):
+    """
+    Benchmark of the MLC log parser against the previous per node regex parsing, on captured logs or on a synthetic
+    log of a many numa node system. The previous parsing only reads Node 0 and Node 1 and drops the last columns of
+    the rows, the results are compared on what it reads.
+    """
+    NUMBER_OF_RUNS = 10
+    SYNTHETIC_NUMA_NODES = 16
+    SYNTHETIC_LOADED_LATENCY_POINTS = 20000
+
+    def __init__(self, test_log, arguments, cfg_opts):
+        super(ExampleMlcParserBenchmark, self).__init__(test_log, arguments, cfg_opts)
+        self._mlc_utils = MlcUtils(test_log)
+        self._log_paths = arguments.mlc_logs
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super(ExampleMlcParserBenchmark, cls).add_arguments(parser)
+        parser.add_argument("--mlc-logs", action="store", nargs="*", default=[], dest="mlc_logs",
+                            help="Captured MLC logs to parse, a synthetic log is generated when not given")
+
+    def _write_synthetic_log(self, log_file):
+        """
+        Write a MLC log with all the sections for SYNTHETIC_NUMA_NODES numa nodes.
+        """
+        nodes = range(self.SYNTHETIC_NUMA_NODES)
+        header = "Numa node" + "".join("\t{:6d}".format(node) for node in nodes) + "\t\n"
+
+        def matrix(value):
+            return header + "".join("{:8d}".format(row) + "".join("\t{:6.1f}".format(value + row + col)
+                                                                 for col in nodes) + "\t\n" for row in nodes)
+
+        log_file.write("Intel(R) Memory Latency Checker - v3.9\n")
+        log_file.write("Measuring idle latencies (in ns)...\n\t\tNuma node\n" + matrix(80))
+        log_file.write("\nMeasuring Peak Injection Memory Bandwidths for the system\n"
+                       "ALL Reads        :\t231234.5\n3:1 Reads-Writes :\t210101.2\n2:1 Reads-Writes :\t208765.3\n"
+                       "1:1 Reads-Writes :\t190012.1\nStream-triad like:\t201234.7\n")
+        log_file.write("\nMeasuring Memory Bandwidths between nodes within system \n\t\tNuma node\n" +
+                       matrix(50000))
+        log_file.write("\nMeasuring Loaded Latencies for the system\n"
+                       "Inject\tLatency\tBandwidth\nDelay\t(ns)\tMB/sec\n==========================\n")
+        for delay in range(self.SYNTHETIC_LOADED_LATENCY_POINTS):
+            log_file.write(" {:05d}\t{:.2f}\t {:.1f}\n".format(delay, 300.0 - delay * 0.01, 230000.0 - delay))
+        log_file.write("\nMeasuring cache-to-cache transfer latency (in ns)...\n"
+                       "Local Socket L2->L2 HIT  latency\t48.2\nLocal Socket L2->L2 HITM latency\t48.4\n"
+                       "Remote Socket L2->L2 HITM latency (data address homed in writer socket)\n"
+                       "\t\t\tReader Numa Node\nWriter " + matrix(110).replace("Numa node", "Numa Node", 1))
+
+    def _time_parse(self, parse, log_path):
+        """
+        :return: (result of the last run, milliseconds per run)
+        """
+        start = timeit.default_timer()
+        for _ in range(self.NUMBER_OF_RUNS):
+            result = parse(log_path)
+        return result, (timeit.default_timer() - start) * 1000 / self.NUMBER_OF_RUNS
+
+    @staticmethod
+    def _compare_data_sets(legacy_data_sets, data_sets):
+        """
+        :return: list of the differences between the legacy and the new data sets, on the values the legacy reads
+        """
+        differences = []
+        names = ("idle latency", "peak bandwidth", "memory bandwidth", "loaded latency", "cache to cache")
+        for name, legacy_data_set, data_set in zip(names, legacy_data_sets, data_sets):
+            for key, legacy_value in (legacy_data_set or {}).items():
+                value = (data_set or {}).get(key)
+                if isinstance(legacy_value, list) and name in ("idle latency", "memory bandwidth"):
+                    value = (value or [])[:len(legacy_value)]
+                if value != legacy_value:
+                    differences.append("{} {}: legacy {} new {}".format(name, key, legacy_value, value))
+        return differences
+
+    def execute(self):
+        log_paths = list(self._log_paths)
+        if not log_paths:
+            with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as log_file:
+                self._write_synthetic_log(log_file)
+            log_paths.append(log_file.name)
+
+        same_results = True
+        try:
+            for log_path in log_paths:
+                mlc_result, parse_time = self._time_parse(self._mlc_utils.parse_mlc_log, log_path)
+                idle_latency = mlc_result.idle_latency
+                self._log.info("{}: {} bytes, {} numa nodes, {} loaded latency points".format(
+                    log_path, os.path.getsize(log_path), len(idle_latency.rows) if idle_latency else 0,
+                    len(mlc_result.loaded_latency)))
+                try:
+                    legacy_data_sets, legacy_time = self._time_parse(legacy_generate_mlc_log_data_set, log_path)
+                except Exception as ex:
+                    self._log.error("Legacy parsing of {} failed: {}".format(log_path, ex))
+                    self._log.info("MlcLogParser: {:.2f} ms per parse".format(parse_time))
+                    continue
+                self._log.info("MlcLogParser: {:.2f} ms per parse, legacy parsing: {:.2f} ms per parse, {:.1f}x "
+                               "faster".format(parse_time, legacy_time, legacy_time / max(parse_time, 1e-6)))
+
+                differences = self._compare_data_sets(legacy_data_sets,
+                                                      self._mlc_utils.generate_mlc_log_data_set(log_path))
+                for difference in differences:
+                    self._log.error("{}: {}".format(log_path, difference))
+                if differences:
+                    same_results = False
+                else:
+                    self._log.info("{}: MlcLogParser and the legacy parsing give the same results".format(log_path))
+        finally:
+            if not self._log_paths:
+                os.remove(log_paths[0])
+        return same_results
+
+
+if __name__ == "__main__":
+    sys.exit(Framework.TEST_RESULT_PASS if ExampleMlcParserBenchmark.main() else Framework.TEST_RESULT_FAIL)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import hashlib
+import logging
+import os
+import threading
+
+import pytest
+
+from six.moves import BaseHTTPServer
+
+from src.lib.collateral_cache import CollateralCache, CollateralCacheError
+
+
+class _ArtifactoryStandIn(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Minimal local stand-in for Artifactory: serves ARTIFACTS with checksum header and http range support.
+    """
+    ARTIFACTS = {}
+    REQUESTS = []
+    BREAK_AFTER = {}
+    TRUNCATED = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_headers(self, status, data, length):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        if self.path not in self.TRUNCATED:
+            self.send_header(CollateralCache.CHECKSUM_HEADER, hashlib.sha256(data).hexdigest())
+        self.end_headers()
+
+    def do_HEAD(self):
+        data = self.ARTIFACTS.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self._send_headers(200, data, len(data))
+
+    def do_GET(self):
+        self.REQUESTS.append((self.path, self.headers.get("Range")))
+        data = self.ARTIFACTS.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        offset = 0
+        if self.headers.get("Range"):
+            offset = int(self.headers["Range"].split("=")[1].rstrip("-"))
+        self._send_headers(206 if offset else 200, data, len(data) - offset)
+        body = data[offset:]
+        if self.path in self.TRUNCATED:
+            # every response ends before Content-Length and no checksum is published
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        if self.path in self.BREAK_AFTER:
+            # simulate a dropped connection in the middle of the transfer
+            self.wfile.write(body[:self.BREAK_AFTER.pop(self.path)])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def artifactory():
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _ArtifactoryStandIn)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    _ArtifactoryStandIn.ARTIFACTS = {"/tool_a.zip": b"a" * 300000, "/tool_b.zip": b"b" * 1000}
+    _ArtifactoryStandIn.REQUESTS = []
+    _ArtifactoryStandIn.TRUNCATED = set()
+    yield "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_is_cached_and_verified(artifactory, tmp_path):
+    cache = CollateralCache(logging.getLogger(__name__), str(tmp_path / "cache"))
+    dest = str(tmp_path / "run1" / "tool_a.zip")
+    cache.fetch(artifactory + "/tool_a.zip", dest)
+    cache.fetch(artifactory + "/tool_a.zip", str(tmp_path / "run2" / "tool_a.zip"))
+
+    assert open(dest, "rb").read() == _ArtifactoryStandIn.ARTIFACTS["/tool_a.zip"]
+    assert len(_ArtifactoryStandIn.REQUESTS) == 1
+
+
+def test_interrupted_download_is_resumed(artifactory, tmp_path):
+    _ArtifactoryStandIn.BREAK_AFTER["/tool_a.zip"] = 100000
+    cache = CollateralCache(logging.getLogger(__name__), str(tmp_path / "cache"))
+    dest = cache.fetch(artifactory + "/tool_a.zip", str(tmp_path / "tool_a.zip"))
+
+    assert open(dest, "rb").read() == _ArtifactoryStandIn.ARTIFACTS["/tool_a.zip"]
+    path, range_header = _ArtifactoryStandIn.REQUESTS[-1]
+    assert range_header and 0 < int(range_header.split("=")[1].rstrip("-")) <= 100000
+
+
+def test_parallel_fetch_and_missing_artifact(artifactory, tmp_path):
+    cache = CollateralCache(logging.getLogger(__name__), str(tmp_path / "cache"), max_workers=2)
+    dest_list = cache.fetch_many([(artifactory + "/tool_a.zip", str(tmp_path / "tool_a.zip")),
+                                  (artifactory + "/tool_b.zip", str(tmp_path / "tool_b.zip"))])
+    assert [open(dest, "rb").read() for dest in dest_list] == [_ArtifactoryStandIn.ARTIFACTS["/tool_a.zip"],
+                                                               _ArtifactoryStandIn.ARTIFACTS["/tool_b.zip"]]
+
+    with pytest.raises(CollateralCacheError) as error:
+        cache.fetch(artifactory + "/missing.zip", str(tmp_path / "missing.zip"))
+    assert error.value.status_code == 404
+
+
+def test_truncated_download_without_checksum_is_rejected(artifactory, tmp_path):
+    _ArtifactoryStandIn.TRUNCATED.add("/tool_b.zip")
+    cache = CollateralCache(logging.getLogger(__name__), str(tmp_path / "cache"))
+    with pytest.raises(CollateralCacheError):
+        cache.fetch(artifactory + "/tool_b.zip", str(tmp_path / "tool_b.zip"))
+    assert not [name for name in os.listdir(str(tmp_path / "cache" / "objects")) if "." not in name]
+
+
+def test_lock_taken_over_is_not_removed(tmp_path):
+    cache = CollateralCache(logging.getLogger(__name__), str(tmp_path / "cache"))
+    lock_path = str(tmp_path / "artifact.part.lock")
+    token = cache._acquire_lock(lock_path)
+    cache._refresh_lock(lock_path, token)
+    with open(lock_path, "w") as lock_file:
+        lock_file.write("other process")
+
+    with pytest.raises(CollateralCacheError):
+        cache._refresh_lock(lock_path, token)
+    cache._release_lock(lock_path, token)
+    assert open(lock_path).read() == "other process"
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import os
+import tarfile
+
+from src.lib.collateral_manifest import CollateralManifest
+
+
+def test_symlinks_and_directories_are_deployed(tmp_path):
+    source = tmp_path / "tool"
+    (source / "lib").mkdir(parents=True)
+    (source / "empty").mkdir()
+    (source / "lib" / "libx.so.1").write_bytes(b"library")
+    os.utime(str(source / "lib" / "libx.so.1"), (1600000000, 1600000000))
+    os.symlink("libx.so.1", str(source / "lib" / "libx.so"))
+    archive_path = str(tmp_path / "tool.tar.gz")
+    with tarfile.open(archive_path, "w:gz") as archive:
+        archive.add(str(source), "tool")
+
+    manifest = CollateralManifest.from_host_path(archive_path)
+    assert manifest.entries["tool/lib/libx.so"] == ("symlink:libx.so.1", 0)
+    assert manifest.is_directory("tool/empty")
+    assert CollateralManifest.parse(manifest.dumps()).entries.keys() == manifest.entries.keys()
+
+    delta_path = manifest.write_delta_archive(archive_path, "", ["tool/lib/libx.so", "tool/lib/libx.so.1", "tool/empty"],
+                                              str(tmp_path / "delta.tgz"), ".tool.collateral.sha256")
+    with tarfile.open(delta_path) as delta_archive:
+        members = {info.name: info for info in delta_archive.getmembers()}
+    assert members["tool/lib/libx.so"].issym() and members["tool/lib/libx.so"].linkname == "libx.so.1"
+    assert members["tool/empty"].isdir()
+    assert members["tool/lib/libx.so.1"].mtime == 1600000000
+    assert members[".tool.collateral.sha256"].mtime > 1600000000
+    assert sorted(members) == [".tool.collateral.sha256", "tool/empty", "tool/lib/libx.so", "tool/lib/libx.so.1"]
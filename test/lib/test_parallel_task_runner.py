@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from src.lib.parallel_task_runner import ParallelTaskRunner
+
+
+def test_bounded_concurrency_and_report():
+    runner = ParallelTaskRunner(logging.getLogger(__name__), max_workers=3)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def task(index):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        if index == 4:
+            raise RuntimeError("failed")
+        return [1 if index == 5 else 0, "out{}".format(index), ""]
+
+    tasks = OrderedDict(("vm{}".format(index), lambda index=index: task(index)) for index in range(9))
+    report = runner.run(tasks, deadline=30, exit_code=lambda value: value[0])
+    runner.shutdown()
+
+    assert running[1] == 3
+    assert list(report) == list(tasks)
+    assert report.failed == ["vm4", "vm5"]
+    assert report.timed_out == []
+    assert report["vm5"].exit_code == 1
+    assert report["vm0"].duration >= 0.1
+    assert "vm4" not in report.values()
+    assert report.values()["vm2"][1] == "out2"
+
+
+def test_deadline_reports_hung_task():
+    runner = ParallelTaskRunner(logging.getLogger(__name__), max_workers=2)
+    release = threading.Event()
+    tasks = OrderedDict([("hung", release.wait), ("fast", lambda: "done")])
+    start_time = time.time()
+    report = runner.run(tasks, deadline=0.5)
+    release.set()
+    runner.shutdown()
+
+    assert time.time() - start_time < 5
+    assert report.timed_out == ["hung"]
+    assert report.succeeded == ["fast"]
+    assert report.to_records()[0]["timed_out"] is True
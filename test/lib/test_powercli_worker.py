@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import logging
+import sys
+import textwrap
+
+import pytest
+
+from src.lib import content_exceptions
+from src.lib.powercli_worker import PowerCliWorker
+
+# Fake worker speaking the PowerCLI worker line protocol, commands are python expressions evaluated in one scope
+FAKE_WORKER = textwrap.dedent("""
+    import json, os, sys, time
+    MARKER = sys.argv[1]
+    def reply(request_id, results):
+        sys.stdout.write(MARKER + json.dumps({"id": request_id, "results": results}) + "\\n")
+        sys.stdout.flush()
+    print("WARNING: some PowerShell noise")
+    if "--fail-connect" in sys.argv:
+        reply(0, [{"output": "", "error": "Could not resolve the requested VC server.", "success": False}])
+        sys.exit(1)
+    reply(0, [{"output": "", "error": "", "success": True}])
+    scope = {"os": os, "time": time}
+    scope["scope"] = scope
+    for line in iter(sys.stdin.readline, ""):
+        request = json.loads(line)
+        results = []
+        for command in request["commands"]:
+            try:
+                results.append({"output": str(eval(command, scope)), "error": "", "success": True})
+            except Exception as ex:
+                results.append({"output": "", "error": str(ex), "success": False})
+        reply(request["id"], results)
+""")
+
+
+@pytest.fixture
+def worker_cmd(tmp_path):
+    script = tmp_path / "fake_powercli_worker.py"
+    script.write_text(FAKE_WORKER)
+    return [sys.executable, str(script), PowerCliWorker.REPLY_MARKER]
+
+
+@pytest.fixture
+def worker(worker_cmd):
+    worker = PowerCliWorker(logging.getLogger(__name__), "10.0.0.1", "root", "password", worker_cmd)
+    yield worker
+    worker.close()
+
+
+def test_commands_share_one_worker(worker):
+    pid = worker.execute("os.getpid()").output
+    results = worker.execute_batch(["scope.__setitem__('vm', 'vm1')", "scope['vm']", "1/0", "os.getpid()"])
+
+    assert [result.success for result in results] == [True, True, False, True]
+    assert results[1].output == "vm1"
+    assert "division" in results[2].error
+    assert results[3].output == pid
+
+
+def test_timeout_restarts_worker(worker):
+    pid = worker.execute("os.getpid()").output
+    with pytest.raises(content_exceptions.TestError):
+        worker.execute("time.sleep(30)", timeout=1)
+    assert not worker.is_running
+    assert worker.execute("os.getpid()").output != pid
+
+
+def test_connect_failure(worker_cmd):
+    worker = PowerCliWorker(logging.getLogger(__name__), "10.0.0.1", "root", "password",
+                            worker_cmd + ["--fail-connect"])
+    with pytest.raises(content_exceptions.TestSetupError, match="Could not resolve"):
+        worker.execute("os.getpid()")
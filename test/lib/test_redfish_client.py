@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import base64
+import json
+import logging
+import threading
+
+import pytest
+
+from six.moves import BaseHTTPServer, socketserver
+
+from src.lib.redfish_client import RedfishClient
+
+
+class _MockBmc(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Minimal local mock of a BMC Redfish service with session service, keep alive and injectable failures.
+    """
+    protocol_version = "HTTP/1.1"
+    USER = ("root", "0penBmc")
+    RESOURCES = {}
+    state = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.headers.get(RedfishClient.AUTH_TOKEN_HEADER)
+        if token:
+            return token in self.state["tokens"]
+        basic = "Basic " + base64.b64encode("{}:{}".format(*self.USER).encode()).decode()
+        return self.headers.get("Authorization") == basic
+
+    def _handle(self, method):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or "null")
+        with self.state["lock"]:
+            self.state["requests"].append((method, self.path))
+            self.state["connections"].add(self.client_address)
+            failures = self.state["failures"].get(self.path, 0)
+            if failures:
+                self.state["failures"][self.path] = failures - 1
+        if method == "POST" and self.path == RedfishClient.SESSIONS_URL and self.state["sessions"]:
+            if (body["UserName"], body["Password"]) != self.USER:
+                return self._reply(401)
+            token = "token{}".format(len(self.state["tokens"]))
+            self.state["tokens"].append(token)
+            return self._reply(201, {"@odata.id": RedfishClient.SESSIONS_URL + "/1"},
+                               {RedfishClient.AUTH_TOKEN_HEADER: token})
+        if not self._authorized():
+            return self._reply(401)
+        if failures:
+            return self._reply(503)
+        if method == "GET" and self.path in self.RESOURCES:
+            return self._reply(200, self.RESOURCES[self.path])
+        if method == "GET" and self.path.split("?")[0] in self.RESOURCES:
+            # $expand of the collection is not supported, like on most of the BMCs
+            return self._reply(200, self.RESOURCES[self.path.split("?")[0]])
+        if method == "POST" and self.path.endswith("ComputerSystem.Reset"):
+            return self._reply(200, {"Message": "Successfully Completed Request", "ResetType": body["ResetType"]})
+        if method == "PATCH":
+            return self._reply(204)
+        return self._reply(404)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._reply(200)
+
+
+class _ThreadingHttpServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+SEL_URL = "/redfish/v1/Systems/system/LogServices/EventLog/Entries"
+
+
+@pytest.fixture
+def bmc():
+    entries = ["{}/{}".format(SEL_URL, index) for index in range(20)]
+    _MockBmc.RESOURCES = {SEL_URL: {"Members": [{"@odata.id": entry} for entry in entries]}}
+    _MockBmc.RESOURCES.update({entry: {"@odata.id": entry, "Severity": "OK"} for entry in entries})
+    _MockBmc.state = {"lock": threading.Lock(), "requests": [], "connections": set(), "tokens": [],
+                      "failures": {}, "sessions": True}
+    server = _ThreadingHttpServer(("127.0.0.1", 0), _MockBmc)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(bmc):
+    client = RedfishClient(logging.getLogger(__name__), bmc, _MockBmc.USER[0], _MockBmc.USER[1], max_workers=4,
+                           backoff=0.01, use_session=True)
+    yield client
+    client.close()
+
+
+def test_session_and_concurrent_members(client):
+    members = client.get_members(SEL_URL)
+
+    assert [member["@odata.id"] for member in members] == ["{}/{}".format(SEL_URL, index) for index in range(20)]
+    assert len(_MockBmc.state["tokens"]) == 1
+    assert ("GET", SEL_URL + "?$expand=.") in _MockBmc.state["requests"]
+    # keep alive, at most one connection per worker thread
+    assert len(_MockBmc.state["connections"]) <= client.max_workers + 1
+
+
+def test_retry_and_relogin(client):
+    _MockBmc.state["failures"][SEL_URL] = 2
+    assert "Members" in client.get(SEL_URL)
+    assert _MockBmc.state["requests"].count(("GET", SEL_URL)) == 3
+
+    # BMC reboot drops the sessions
+    del _MockBmc.state["tokens"][:]
+    assert "Members" in client.get(SEL_URL)
+    assert len(_MockBmc.state["tokens"]) == 1
+
+
+def test_curl_compatible_requests(client):
+    response = client.curl_request("POST", "/redfish/v1/Systems/system/Actions/ComputerSystem.Reset",
+                                   r"{\"ResetType\": \"ForceOff\"}")
+    assert b"Successfully Completed Request" in response
+    response = client.curl_request("PATCH", "/redfish/v1/Systems/system", r"{\"Boot\": {}}", include_headers=True)
+    assert b"204 No Content" in response
+
+
+def test_basic_authentication_by_default(bmc):
+    client = RedfishClient(logging.getLogger(__name__), bmc, _MockBmc.USER[0], _MockBmc.USER[1])
+    assert client.get(SEL_URL + "/1")["Severity"] == "OK"
+    assert ("POST", RedfishClient.SESSIONS_URL) not in _MockBmc.state["requests"]
+    assert not _MockBmc.state["tokens"]
+    client.close()
+
+
+def test_basic_authentication_fallback(bmc):
+    _MockBmc.state["sessions"] = False
+    client = RedfishClient(logging.getLogger(__name__), bmc, _MockBmc.USER[0], _MockBmc.USER[1], use_session=True)
+    assert client.get(SEL_URL + "/1")["Severity"] == "OK"
+    assert client.get(SEL_URL + "/2", select=["Severity"])["Severity"] == "OK"
+    assert not _MockBmc.state["tokens"]
+    client.close()
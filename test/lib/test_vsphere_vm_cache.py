@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import sys
+import types
+
+import pytest
+
+from src.lib.vsphere_vm_cache import VsphereVmCache
+
+
+class Spec(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeVm(object):
+    def __init__(self, moid):
+        self._moId = moid
+
+
+class FakeServer(object):
+    """
+    pyVmomi compatible stub of a server, every change is recorded with its data version and WaitForUpdatesEx
+    returns the changes after the requested version.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.changes = []
+        self.vms = {}
+        self.wait_calls = 0
+        self.destroyed = []
+
+    def add_vm(self, moid, **props):
+        self.vms[moid] = FakeVm(moid)
+        self._record("enter", moid, [Spec(name=name, op="assign", val=val) for name, val in props.items()])
+
+    def modify_vm(self, moid, **props):
+        self._record("modify", moid, [Spec(name=name, op="assign", val=val) for name, val in props.items()])
+
+    def remove_vm(self, moid):
+        self._record("leave", moid, [])
+
+    def _record(self, kind, moid, change_set):
+        self.version += 1
+        self.changes.append((self.version, Spec(kind=kind, obj=self.vms[moid], changeSet=change_set)))
+
+    # pyVmomi API used by the cache
+    def RetrieveContent(self):
+        return Spec(rootFolder="root", viewManager=Spec(CreateContainerView=self.CreateContainerView),
+                    propertyCollector=Spec(CreatePropertyCollector=lambda: self))
+
+    def CreateContainerView(self, folder, types_, recursive):
+        return Spec(Destroy=lambda: self.destroyed.append("view"))
+
+    def CreateFilter(self, spec, partial_updates):
+        assert spec.propSet[0].pathSet == VsphereVmCache.PROPERTIES
+        return Spec(Destroy=lambda: self.destroyed.append("filter"))
+
+    def Destroy(self):
+        self.destroyed.append("collector")
+
+    def WaitForUpdatesEx(self, version, options):
+        assert options.maxWaitSeconds == 0
+        self.wait_calls += 1
+        since = int(version or 0)
+        object_set = [update for update_version, update in self.changes if update_version > since]
+        if not object_set:
+            return None
+        return Spec(version=str(self.version), truncated=False, filterSet=[Spec(objectSet=object_set)])
+
+
+@pytest.fixture
+def server(monkeypatch):
+    vim = types.SimpleNamespace(VirtualMachine=FakeVm, view=types.SimpleNamespace(ContainerView=object))
+    query = types.SimpleNamespace(PropertyCollector=types.SimpleNamespace(
+        ObjectSpec=Spec, TraversalSpec=Spec, PropertySpec=Spec, FilterSpec=Spec, WaitOptions=Spec))
+    monkeypatch.setitem(sys.modules, "pyVmomi", types.SimpleNamespace(vim=vim, vmodl=types.SimpleNamespace(
+        query=query)))
+    server = FakeServer()
+    for index in range(100):
+        server.add_vm(f"vm-{index}", name=f"rhel{index}", **{"runtime.powerState": "poweredOff"})
+    return server
+
+
+def test_cache_is_updated_incrementally(server):
+    cache = VsphereVmCache(server)
+
+    assert len(cache.get_vm_names()) == 100
+    assert cache.get_vm("rhel5")._moId == "vm-5"
+    assert cache.get_property("rhel5", "runtime.powerState") == "poweredOff"
+
+    server.modify_vm("vm-5", **{"runtime.powerState": "poweredOn", "guest.ipAddress": "10.0.0.5"})
+    server.modify_vm("vm-6", name="centos6")
+    server.remove_vm("vm-7")
+    assert cache.refresh() == 3
+    assert cache.get_property("rhel5", "runtime.powerState") == "poweredOn"
+    assert cache.get_property("rhel5", "guest.ipAddress") == "10.0.0.5"
+    assert cache.get_vm("rhel6") is None
+    assert cache.get_vm("centos6")._moId == "vm-6"
+    assert cache.get_vm("rhel7") is None
+    with pytest.raises(RuntimeError):
+        cache.get_property("rhel7", "name")
+
+    # nothing changed, one cheap call per query
+    server.wait_calls = 0
+    assert cache.refresh() == 0
+    assert server.wait_calls == 1
+
+    cache.close()
+    assert sorted(server.destroyed) == ["collector", "filter", "view"]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import json
+
+from src.network.lib.iperf import Iperf3Engine, IperfResult
+
+# trimmed iperf3 --json client reports
+TCP_REPORT = {
+    "start": {"connected": [{"socket": 5, "local_port": 40000, "remote_port": 5201}],
+              "test_start": {"protocol": "TCP", "num_streams": 2, "duration": 10}},
+    "intervals": [{"sum": {"start": 0, "end": 1.0, "bytes": 1175000000, "bits_per_second": 9.4e9}}],
+    "end": {
+        "streams": [{"sender": {"bytes": 5875000000}}, {"sender": {"bytes": 5875000000}}],
+        "sum_sent": {"start": 0, "end": 10.0, "seconds": 10.0, "bytes": 11750000000,
+                     "bits_per_second": 9.4e9, "retransmits": 12},
+        "sum_received": {"start": 0, "end": 10.04, "seconds": 10.04, "bytes": 11700000000,
+                         "bits_per_second": 9.32e9},
+        "cpu_utilization_percent": {"host_total": 35.5, "remote_total": 41.25}}}
+ERROR_REPORT = {"start": {"connected": []}, "intervals": [], "end": {},
+                "error": "unable to connect to server: Connection refused"}
+
+
+def _output(*reports):
+    return "".join("{}{}\n{}\n".format(Iperf3Engine.REPORT_MARKER, port, report) for port, report in reports)
+
+
+def test_parse_reports():
+    streams = Iperf3Engine.parse_reports(_output((5201, json.dumps(TCP_REPORT, indent=4)),
+                                                 (5202, json.dumps(TCP_REPORT))))
+    result = IperfResult(streams, 10.5)
+
+    assert [stream.port for stream in streams] == [5201, 5202]
+    assert streams[0].received_bps == 9.32e9 and streams[0].sent_bps == 9.4e9
+    assert streams[0].retransmits == 12 and streams[0].parallel == 2 and streams[0].seconds == 10.04
+    assert streams[0].host_cpu == 35.5 and streams[0].remote_cpu == 41.25
+    assert result.received_bps == 2 * 9.32e9 and abs(result.received_gbps - 18.64) < 1e-9
+    assert result.retransmits == 24 and not result.errors
+
+
+def test_parse_failed_reports():
+    streams = Iperf3Engine.parse_reports("iperf3: some shell noise\n" + _output(
+        (5201, json.dumps(TCP_REPORT)), (5202, json.dumps(ERROR_REPORT)), (5203, "iperf3: error - unable to")))
+    result = IperfResult(streams, 10.5)
+
+    assert len(streams) == 3
+    assert streams[1].received_bps == 0.0 and streams[1].error == ERROR_REPORT["error"]
+    assert streams[2].received_bps == 0.0 and "invalid iperf3 json report" in streams[2].error
+    assert result.received_bps == 9.32e9
+    assert result.errors == ["port 5202: unable to connect to server: Connection refused",
+                             "port 5203: invalid iperf3 json report: iperf3: error - unable to"]
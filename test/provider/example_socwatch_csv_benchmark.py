@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import os
+import sys
+import tempfile
+import timeit
+
+from dtaf_core.lib.base_test_case import BaseTestCase
+from dtaf_core.lib.dtaf_constants import Framework
+
+from src.provider.socwatch_provider import SocWatchCSVReader, CoreCStates, PackageCStates
+
+
+class ExampleSocwatchCsvBenchmark(BaseTestCase):
+    """
+    Benchmark of the socwatch CSV residency lookups on a recorded socwatch output, or on a synthetic output of a
+    many core system.
+    """
+    NUMBER_OF_RUNS = 10
+    SYNTHETIC_CORES = 448
+    SYNTHETIC_SAMPLES = 20000
+    PACKAGE_C_STATE_TABLE = "Package C-State Summary: Residency (Percentage and Time)"
+    CORE_C_STATE_TABLE = "Core C-State Summary: Residency (Percentage and Time)"
+    CORE_P_STATE_TABLE = "Core P-State/Frequency Summary: Residency (Percentage)"
+
+    def __init__(self, test_log, arguments, cfg_opts):
+        super(ExampleSocwatchCsvBenchmark, self).__init__(test_log, arguments, cfg_opts)
+        self._csv_file = arguments.socwatch_csv
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super(ExampleSocwatchCsvBenchmark, cls).add_arguments(parser)
+        parser.add_argument("--socwatch-csv", action="store", default=None, dest="socwatch_csv",
+                            help="Recorded socwatch CSV output, a synthetic output is generated when not given")
+
+    def _write_synthetic_csv(self, csv_file):
+        """
+        Write a socwatch like CSV output with the summary tables and a large per sample trace table.
+        """
+        cores = ["Core_{}".format(core) for core in range(self.SYNTHETIC_CORES)]
+        csv_file.write("Intel(R) SoC Watch for Linux* OS\n\n")
+        csv_file.write(self.PACKAGE_C_STATE_TABLE + "\nC-State,Residency (%),Residency (msec)\n-------,----,----\n")
+        csv_file.write("PC0,12.50,1250.00\nPC2,0.50,50.00\nPC6,87.00,8700.00\n\n")
+        csv_file.write(self.CORE_C_STATE_TABLE + "\nC-State," + ",".join(
+            "{0} Residency (%),{0} Residency (msec)".format(core) for core in cores) + "\n---\n")
+        for c_state, residency in (("CC0", 10.0), ("CC1", 5.0), ("CC6", 85.0)):
+            csv_file.write(c_state + "".join(",{:.2f},{:.2f}".format(residency, residency * 100)
+                                             for _ in cores) + "\n")
+        csv_file.write("\n" + self.CORE_P_STATE_TABLE + "\nP-State," + ",".join(
+            "{} Residency (%)".format(core) for core in cores) + "\n---\n")
+        for p_state in ("P0", "P1", "CPU Idle"):
+            csv_file.write(p_state + ",33.33" * len(cores) + "\n")
+        csv_file.write("\nCore C-State Trace\nTimestamp," + ",".join(cores) + "\n---\n")
+        for sample in range(self.SYNTHETIC_SAMPLES):
+            csv_file.write("{}".format(sample) + ",CC6" * len(cores) + "\n")
+
+    def _verify_residencies(self, csv_reader):
+        csv_reader.verify_pacakge_c_state_residency(PackageCStates.PACKAGE_C_STATE_PC6, "PC6 > 1")
+        csv_reader.verify_core_c_state_residency(CoreCStates.CORE_C_STATE_CC6, "CC6 > 1")
+        csv_reader.get_package_p_state_residency_time_summary()
+
+    def execute(self):
+        csv_file_path = self._csv_file
+        if csv_file_path is None:
+            with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+                self._write_synthetic_csv(csv_file)
+            csv_file_path = csv_file.name
+
+        try:
+            start = timeit.default_timer()
+            for _ in range(self.NUMBER_OF_RUNS):
+                # new reader per run, every run parses the file once for all the lookups
+                self._verify_residencies(SocWatchCSVReader(self._log, csv_file_path))
+            verify_time = (timeit.default_timer() - start) * 1000 / self.NUMBER_OF_RUNS
+            self._log.info("{}: {} bytes, {} tables, {:.2f} ms per residency verification".format(
+                csv_file_path, os.path.getsize(csv_file_path),
+                len(SocWatchCSVReader(self._log, csv_file_path).csv_index.titles), verify_time))
+        finally:
+            if self._csv_file is None:
+                os.remove(csv_file_path)
+        return True
+
+
+if __name__ == "__main__":
+    sys.exit(Framework.TEST_RESULT_PASS if ExampleSocwatchCsvBenchmark.main() else Framework.TEST_RESULT_FAIL)
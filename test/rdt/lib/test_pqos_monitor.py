@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+#################################################################################
+# INTEL CONFIDENTIAL
+# Copyright Intel Corporation All Rights Reserved.
+#
+# The source code contained or described herein and all documents related to
+# the source code ("Material") are owned by Intel Corporation or its suppliers
+# or licensors. Title to the Material remains with Intel Corporation or its
+# suppliers and licensors. The Material may contain trade secrets and proprietary
+# and confidential information of Intel Corporation and its suppliers and
+# licensors, and is protected by worldwide copyright and trade secret laws and
+# treaty provisions. No part of the Material may be used, copied, reproduced,
+# modified, published, uploaded, posted, transmitted, distributed, or disclosed
+# in any way without Intel's prior express written permission.
+#
+# No license under any patent, copyright, trade secret or other intellectual
+# property right is granted to or conferred upon you by disclosure or delivery
+# of the Materials, either expressly, by implication, inducement, estoppel or
+# otherwise. Any license under such intellectual property rights must be express
+# and approved by Intel in writing.
+#################################################################################
+import pytest
+
+from src.rdt.lib.pqos_monitor import PqosMonitorIngester
+
+# captured with "pqos -m all:0,1 -u csv -o pqos_mon.csv"
+PQOS_MONITOR_CSV = """Time,Core,IPC,LLC Misses,LLC[KB],MBL[MB/s],MBR[MB/s]
+2021-03-18 05:24:52,"0",0.51,228k,2160.0,2.5,0.0
+2021-03-18 05:24:52,"1",1.20,12k,720.0,10.0,1.0
+2021-03-18 05:24:53,"0",0.61,230k,2200.0,4.5,0.0
+2021-03-18 05:24:53,"1",1.00,10k,360.0,14.0,3.0
+2021-03-18 05:24:54,"0",0.56,232k,2240.0,3.5,0.0
+2021-03-18 05:24:54,"1",0.80,8k,1080.0,12.0,2.0
+"""
+
+
+def test_pqos_monitor_csv_statistics(tmp_path):
+    pqos_csv = tmp_path / "pqos_mon.csv"
+    pqos_csv.write_text(PQOS_MONITOR_CSV)
+    ingester = PqosMonitorIngester().feed_file(str(pqos_csv))
+
+    assert ingester.intervals == 3
+    assert ingester.event_columns == ["IPC", "LLC Misses", "LLC[KB]", "MBL[MB/s]", "MBR[MB/s]"]
+    core0_mbl = ingester.get_stat(0, "MBL[MB/s]")
+    assert (core0_mbl.min, core0_mbl.max, core0_mbl.mean) == (2.5, 4.5, pytest.approx(3.5))
+    core1_llc = ingester.get_stat("1", "LLC[KB]")
+    assert (core1_llc.min, core1_llc.max, core1_llc.mean) == (360.0, 1080.0, pytest.approx(720.0))
+    core1_misses = ingester.get_stat("1", "LLC Misses")
+    assert (core1_misses.min, core1_misses.max, core1_misses.mean) == (8, 12, pytest.approx(10))
+    assert ingester.to_records("max") == [
+        {"Core": 0, "IPC": 0.61, "LLC Misses": 232, "LLC[KB]": 2240.0, "MBL[MB/s]": 4.5, "MBR[MB/s]": 0.0},
+        {"Core": 1, "IPC": 1.2, "LLC Misses": 12, "LLC[KB]": 1080.0, "MBL[MB/s]": 14.0, "MBR[MB/s]": 3.0}]